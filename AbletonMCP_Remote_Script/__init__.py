@@ -2,11 +2,21 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 from _Framework.ControlSurface import ControlSurface  # type: ignore
+import base64
+import bisect
+import collections
+import hashlib
+import heapq
+import itertools
+import math
+import os
 import socket
 import json
+import struct
 import threading
 import time
 import traceback
+import zlib
 
 # Change queue import for Python 2
 try:
@@ -14,9 +24,479 @@ try:
 except ImportError:
     import queue  # Python 3
 
-# Constants for socket communication
-DEFAULT_PORT = 9877
-HOST = "localhost"
+# Constants for socket communication (overridable from the environment)
+DEFAULT_PORT = int(os.environ.get("ABLETON_MCP_PORT", 9877))
+HOST = os.environ.get("ABLETON_MCP_HOST", "localhost")
+
+
+def _default_socket_path():
+    """Per-user Unix socket path; must match MCP_Server.connection"""
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"):
+        return None
+    return os.path.join("/tmp", "ableton-mcp-{0}.sock".format(os.getuid()))
+
+
+# Same-host clients prefer this socket; empty ABLETON_MCP_SOCKET disables it
+SOCKET_PATH = os.environ.get("ABLETON_MCP_SOCKET", _default_socket_path()) or None
+
+# Per-command log lines go to Live's Log.txt from the I/O and main threads;
+# they are only written when ABLETON_MCP_DEBUG is set. Errors are always logged.
+DEBUG_LOGGING = os.environ.get("ABLETON_MCP_DEBUG", "").lower() in (
+    "1",
+    "true",
+    "yes",
+    "on",
+)
+
+try:
+    import msgpack  # type: ignore # Optional, rarely available inside Live
+except ImportError:
+    msgpack = None
+
+# Framed protocol negotiated through the "hello" command; must match
+# MCP_Server.protocol
+PROTOCOL_VERSION = 2
+FRAME_HEADER = struct.Struct("!IB")
+FLAG_MSGPACK = 0x01
+FLAG_ZLIB = 0x02
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+NOTE_STRUCT = struct.Struct("<BddBB")  # pitch, start_time, duration, velocity, mute
+# Time span (in beats) that covers every note of a clip, including past its end
+ALL_NOTES_SPAN = 1 << 16
+
+# Commands that modify Live's state, scheduled on its main thread
+MAIN_THREAD_COMMANDS = frozenset(
+    [
+        "create_midi_track",
+        "set_track_name",
+        "create_clip",
+        "add_notes_to_clip",
+        "set_clip_name",
+        "set_tempo",
+        "fire_clip",
+        "stop_clip",
+        "start_playback",
+        "stop_playback",
+        "load_browser_item",
+        "load_device_chain",
+        "apply_operations",
+        "delete_track",
+        "delete_clip",
+        "fire_scene",
+        "stop_scene",
+        "create_scene",
+        "duplicate_scene",
+        "capture_scene",
+        "edit_clip_grid",
+        "set_mixer_state",
+        "write_automation",
+    ]
+)
+# Reads that walk large parts of the LOM and run on the main thread too, so
+# they never see it mid-change; not idempotency-cached
+MAIN_THREAD_READS = frozenset(["get_clip_notes", "get_session_snapshot"])
+# Responses to modifying commands kept for clients retrying with the same key
+IDEMPOTENCY_CACHE_SIZE = 256
+# How long to wait for main-thread work when a command carries no deadline
+DEFAULT_COMMAND_TIMEOUT = 10.0
+# Modifying commands answered on the I/O thread, also run once per key
+IDEMPOTENT_COMMANDS = MAIN_THREAD_COMMANDS | frozenset(
+    ["schedule_launch", "cancel_launches"]
+)
+
+# Actions the launch scheduler can run at a song position; Live itself
+# quantizes the clip ones to Song.clip_trigger_quantization
+LAUNCH_ACTIONS = frozenset(
+    [
+        "fire_clip",
+        "stop_clip",
+        "fire_scene",
+        "stop_scene",
+        "stop_all_clips",
+        "start_playback",
+        "stop_playback",
+    ]
+)
+QUANTIZED_LAUNCH_ACTIONS = frozenset(
+    ["fire_clip", "stop_clip", "fire_scene", "stop_scene", "stop_all_clips"]
+)
+# Song time stands still while the transport is stopped, so these can only be
+# scheduled for the next tick then, not for a later beat
+TRANSPORT_LAUNCH_ACTIONS = LAUNCH_ACTIONS - QUANTIZED_LAUNCH_ACTIONS
+# Song.clip_trigger_quantization values (q_8_bars .. q_thirtysecond) as bars
+# or as beats; 0 is q_no_q
+LAUNCH_QUANTIZATION_BARS = {1: 8, 2: 4, 3: 2, 4: 1}
+LAUNCH_QUANTIZATION_BEATS = {
+    5: 2.0,
+    6: 4.0 / 3,
+    7: 1.0,
+    8: 2.0 / 3,
+    9: 0.5,
+    10: 1.0 / 3,
+    11: 0.25,
+    12: 1.0 / 6,
+    13: 0.125,
+}
+# Mixer columns of get_mixer_state/set_mixer_state besides index, name and
+# sends; DeviceParameters are written through .value, the rest directly
+MIXER_PARAMETERS = ("volume", "panning")
+MIXER_SWITCHES = ("mute", "solo", "arm")
+# Completed launches reported by get_scheduled_launches
+LAUNCH_HISTORY_SIZE = 16
+# Length of the step written for each automation breakpoint. Live ignores
+# zero-length steps and ramps from the end of one step to the next, so a
+# step delays the line after it: it is kept under half the gap to the next
+# breakpoint and short enough that the line moves at most
+# AUTOMATION_STEP_ERROR of the parameter's range
+AUTOMATION_STEP_BEATS = 1.0 / 128
+AUTOMATION_STEP_ERROR = 1e-4
+
+_json_decoder = json.JSONDecoder()
+
+# Converts perf_counter() readings to wall-clock microseconds for trace spans
+_EPOCH_OFFSET = time.time() - time.perf_counter()
+
+
+def _encode_frame(message, encoding, compress_threshold):
+    """Serialize a message into one length-prefixed frame"""
+    flags = 0
+    if encoding == "msgpack":
+        payload = msgpack.packb(message, use_bin_type=True)
+        flags |= FLAG_MSGPACK
+    else:
+        payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    if compress_threshold and len(payload) >= compress_threshold:
+        compressed = zlib.compress(payload, 1)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= FLAG_ZLIB
+    return FRAME_HEADER.pack(len(payload), flags) + payload
+
+
+def _decode_payload(payload, flags):
+    """Decode a frame payload according to its header flags"""
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    if flags & FLAG_MSGPACK:
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload.decode("utf-8"))
+
+
+def _unpack_notes(data):
+    """Decode packed notes (raw bytes or base64 text) into Live note tuples"""
+    if not isinstance(data, bytes):
+        data = base64.b64decode(data)
+    return [
+        (pitch, start, duration, velocity, bool(mute))
+        for pitch, start, duration, velocity, mute in NOTE_STRUCT.iter_unpack(data)
+    ]
+
+
+def _notes_digest(notes):
+    """Order-independent fingerprint of notes; matches protocol.notes_digest"""
+    rows = sorted(
+        (
+            int(pitch),
+            round(float(start), 6),
+            round(float(duration), 6),
+            int(round(float(velocity))),
+            bool(mute),
+        )
+        for pitch, start, duration, velocity, mute in notes
+    )
+    packed = b"".join(NOTE_STRUCT.pack(*row) for row in rows)
+    return hashlib.sha1(packed).hexdigest()[:16]
+
+
+class _LatencyHistogram(object):
+    """Log-bucketed latency histogram (8 buckets per doubling from 1 us)"""
+
+    MIN_SECONDS = 1e-6
+    BUCKETS_PER_OCTAVE = 8
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        if seconds <= self.MIN_SECONDS:
+            index = 0
+        else:
+            index = 1 + int(
+                math.log(seconds / self.MIN_SECONDS, 2) * self.BUCKETS_PER_OCTAVE
+            )
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                upper = self.MIN_SECONDS * 2 ** (float(index) / self.BUCKETS_PER_OCTAVE)
+                return min(upper, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class _IdempotencyCache(object):
+    """
+    Bounded LRU of responses to modifying commands, by idempotency key.
+
+    A client that timed out resends the command with the same key. If the
+    original already ran, its response is returned again; if it is still
+    running, the retry waits for it instead of running the command twice.
+    """
+
+    def __init__(self, size=IDEMPOTENCY_CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._size = size
+        self.replays = 0
+
+    def begin(self, key):
+        """Return (entry, True) for a new key, or the existing (entry, False)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.replays += 1
+                return entry, False
+            entry = {"done": threading.Event(), "response": None}
+            self._entries[key] = entry
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+            return entry, True
+
+    def finish(self, entry, response):
+        entry["response"] = response
+        entry["done"].set()
+
+    def discard(self, key):
+        """Forget a key whose command never ran, so a retry runs it"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class _LaunchScheduler(object):
+    """
+    Actions waiting for a song position, in a heap ordered by release beat.
+
+    I/O threads add launches; Live's main thread pops the due ones on each
+    display tick, so every action of a launch runs in the same tick. A launch
+    mixing clip and transport actions is stored as one part per release beat.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._sequence = itertools.count()
+        self.history = collections.deque(maxlen=LAUNCH_HISTORY_SIZE)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add(self, beat, parts):
+        """Queue (release_beat, actions) parts of one launch at beat"""
+        with self._lock:
+            launch = {
+                "id": next(self._ids),
+                "beat": beat,
+                "actions": [action for _, actions in parts for action in actions],
+            }
+            for release, actions in parts:
+                heapq.heappush(
+                    self._heap, (release, next(self._sequence), launch, actions)
+                )
+            return launch
+
+    def due(self, now):
+        """Pop the (launch, actions) parts released at or before song time now"""
+        with self._lock:
+            parts = []
+            while self._heap and self._heap[0][0] <= now:
+                _, _, launch, actions = heapq.heappop(self._heap)
+                parts.append((launch, actions))
+            return parts
+
+    def pending(self):
+        with self._lock:
+            launches = []
+            for _, _, launch, _ in sorted(self._heap, key=lambda item: item[:2]):
+                if launch not in launches:
+                    launches.append(launch)
+            return launches
+
+    def cancel(self, launch_id=None):
+        """Drop one launch, or all of them; returns how many were dropped"""
+        with self._lock:
+            kept = [
+                item
+                for item in self._heap
+                if launch_id is not None and item[2]["id"] != launch_id
+            ]
+            cancelled = len(
+                set(item[2]["id"] for item in self._heap)
+                - set(item[2]["id"] for item in kept)
+            )
+            heapq.heapify(kept)
+            self._heap = kept
+            return cancelled
+
+
+class _ArrangementIndex(object):
+    """
+    Arrangement clips of every track, for time-range queries.
+
+    Each track's clips are kept sorted by start time together with a running
+    maximum of their end times, so the clips overlapping a range are found
+    by bisection instead of a scan of the whole track. Listeners on the track
+    list and on each track's arrangement_clips mark tracks stale (Live
+    replaces a clip when it is moved or resized), and a stale track is
+    re-read on its next query.
+    """
+
+    def __init__(self, song):
+        self._song = song
+        self._lock = threading.Lock()
+        self._tracks = []
+        # Bumped when a track goes stale, so a read racing a change is dropped
+        self._versions = []
+        self._listeners = []
+        self.rebuilds = 0
+
+    def attach(self):
+        """Start listening; call on Live's main thread"""
+        self._song.add_tracks_listener(self._on_tracks_changed)
+        self._on_tracks_changed()
+
+    def detach(self):
+        try:
+            self._song.remove_tracks_listener(self._on_tracks_changed)
+        except Exception:
+            pass
+        self._remove_track_listeners()
+
+    def _remove_track_listeners(self):
+        for track, callback in self._listeners:
+            try:
+                track.remove_arrangement_clips_listener(callback)
+            except Exception:
+                pass  # The track was deleted
+        self._listeners = []
+
+    def _on_tracks_changed(self):
+        self._remove_track_listeners()
+        tracks = list(self._song.tracks)
+        for index, track in enumerate(tracks):
+            callback = self._stale_callback(index)
+            try:
+                track.add_arrangement_clips_listener(callback)
+            except (AttributeError, RuntimeError):
+                continue  # Group and return tracks have no arrangement clips
+            self._listeners.append((track, callback))
+        with self._lock:
+            self._tracks = [None] * len(tracks)
+            self._versions = [version + 1 for version in self._versions] + [0] * (
+                len(tracks) - len(self._versions)
+            )
+
+    def _stale_callback(self, index):
+        def mark_stale():
+            with self._lock:
+                if index < len(self._tracks):
+                    self._tracks[index] = None
+                    self._versions[index] += 1
+
+        return mark_stale
+
+    def _entry(self, track_index):
+        with self._lock:
+            if track_index < len(self._tracks):
+                entry = self._tracks[track_index]
+                if entry is not None:
+                    return entry
+                version = self._versions[track_index]
+            else:
+                version = None
+        try:
+            clips = list(self._song.tracks[track_index].arrangement_clips)
+        except (AttributeError, RuntimeError):
+            clips = []
+        clips.sort(key=lambda clip: clip.start_time)
+        starts = [clip.start_time for clip in clips]
+        max_ends = []
+        latest = float("-inf")
+        for clip in clips:
+            latest = max(latest, clip.end_time)
+            max_ends.append(latest)
+        entry = (starts, max_ends, clips)
+        with self._lock:
+            if version is not None and self._versions[track_index] == version:
+                self._tracks[track_index] = entry
+            self.rebuilds += 1
+        return entry
+
+    def overlapping(self, track_index, start, end):
+        """Clips on a track that overlap [start, end), in start order"""
+        starts, max_ends, clips = self._entry(track_index)
+        # Clips from first on are the only ones that may end after start
+        first = bisect.bisect_right(max_ends, start)
+        last = bisect.bisect_left(starts, end)
+        return [clip for clip in clips[first:last] if clip.end_time > start]
+
+    def at(self, track_index, start_time):
+        """The clip starting at start_time on a track, or None"""
+        starts, _, clips = self._entry(track_index)
+        position = bisect.bisect_left(starts, start_time - 1e-6)
+        if position < len(clips) and abs(starts[position] - start_time) < 1e-6:
+            return clips[position]
+        return None
+
+
+class _BridgeStats(object):
+    """Histograms keyed by command type and phase; mirrors MCP_Server.stats"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def record(self, command, phase, seconds):
+        with self._lock:
+            phases = self._histograms.setdefault(command, {})
+            histogram = phases.get(phase)
+            if histogram is None:
+                histogram = phases[phase] = _LatencyHistogram()
+            histogram.record(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(
+                (command, dict((p, h.summary()) for p, h in phases.items()))
+                for command, phases in sorted(self._histograms.items())
+            )
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
 
 
 def create_instance(c_instance):
@@ -32,15 +512,39 @@ class AbletonMCP(ControlSurface):
         ControlSurface.__init__(self, c_instance)
         self.log_message("AbletonMCP Remote Script initializing...")
 
-        # Socket server for communication
+        # Socket servers for communication (TCP, plus a Unix socket on POSIX)
         self.server = None
+        self.unix_server = None
         self.client_threads = []
         self.server_thread = None
+        self.unix_server_thread = None
         self.running = False
 
         # Cache the song reference for easier access
         self._song = self.song()
 
+        # Per-command latency histograms, reported through get_bridge_stats
+        self._stats = _BridgeStats()
+        self._started_at = time.time()
+
+        # Responses to recent modifying commands, for retried requests
+        self._idempotency = _IdempotencyCache()
+        # Commands dropped because their deadline passed first
+        self._expired_count = 0
+
+        # Actions waiting for a song position, run from update_display()
+        self._launches = _LaunchScheduler()
+
+        # Arrangement clips by time, kept current by listeners
+        self._arrangement = _ArrangementIndex(self._song)
+        self._arrangement.attach()
+
+        # Browser items by URI and by lowercase path, filled in by lookups;
+        # used from both the socket and main threads
+        self._browser_uris = {}
+        self._browser_paths = {}
+        self._browser_lock = threading.Lock()
+
         # Start the socket server
         self.start_server()
 
@@ -55,17 +559,22 @@ class AbletonMCP(ControlSurface):
         """Called when Ableton closes or the control surface is removed"""
         self.log_message("AbletonMCP disconnecting...")
         self.running = False
+        self._arrangement.detach()
 
-        # Stop the server
-        if self.server:
-            try:
-                self.server.close()
-            except:
-                pass
+        # Stop the servers
+        for server in (self.server, self.unix_server):
+            if server:
+                try:
+                    server.close()
+                except:
+                    pass
+        if self.unix_server:
+            self._remove_socket_file()
 
-        # Wait for the server thread to exit
-        if self.server_thread and self.server_thread.is_alive():
-            self.server_thread.join(1.0)
+        # Wait for the server threads to exit
+        for thread in (self.server_thread, self.unix_server_thread):
+            if thread and thread.is_alive():
+                thread.join(1.0)
 
         # Clean up any client threads
         for client_thread in self.client_threads[:]:
@@ -76,8 +585,14 @@ class AbletonMCP(ControlSurface):
         ControlSurface.disconnect(self)
         self.log_message("AbletonMCP disconnected")
 
+    def update_display(self):
+        """Called by Live on its main thread about ten times a second"""
+        ControlSurface.update_display(self)
+        if self._launches:
+            self._run_due_launches()
+
     def start_server(self):
-        """Start the socket server in a separate thread"""
+        """Start the socket servers in separate threads"""
         try:
             self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -85,7 +600,9 @@ class AbletonMCP(ControlSurface):
             self.server.listen(5)  # Allow up to 5 pending connections
 
             self.running = True
-            self.server_thread = threading.Thread(target=self._server_thread)
+            self.server_thread = threading.Thread(
+                target=self._server_thread, args=(self.server,)
+            )
             self.server_thread.daemon = True
             self.server_thread.start()
 
@@ -94,19 +611,53 @@ class AbletonMCP(ControlSurface):
             self.log_message("Error starting server: " + str(e))
             self.show_message("AbletonMCP: Error starting server - " + str(e))
 
-    def _server_thread(self):
+        self._start_unix_server()
+
+    def _start_unix_server(self):
+        """Listen on a Unix domain socket as well, for same-host clients"""
+        if not SOCKET_PATH or not hasattr(socket, "AF_UNIX"):
+            return
+        try:
+            # A previous Live session may have left a stale socket file behind
+            self._remove_socket_file()
+            self.unix_server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.unix_server.bind(SOCKET_PATH)
+            os.chmod(SOCKET_PATH, 0o600)
+            self.unix_server.listen(5)
+
+            self.running = True
+            self.unix_server_thread = threading.Thread(
+                target=self._server_thread, args=(self.unix_server,)
+            )
+            self.unix_server_thread.daemon = True
+            self.unix_server_thread.start()
+
+            self.log_message("Server started on unix socket " + SOCKET_PATH)
+        except Exception as e:
+            self.log_message("Error starting unix socket server: " + str(e))
+            self.unix_server = None
+
+    def _remove_socket_file(self):
+        """Remove the Unix socket file if it exists"""
+        try:
+            if SOCKET_PATH and os.path.exists(SOCKET_PATH):
+                os.unlink(SOCKET_PATH)
+        except Exception as e:
+            self.log_message("Error removing socket file: " + str(e))
+
+    def _server_thread(self, server):
         """Server thread implementation - handles client connections"""
-        if not self.server:
+        if not server:
             raise Exception("Server not initialized")
         try:
             self.log_message("Server thread started")
             # Set a timeout to allow regular checking of running flag
-            self.server.settimeout(1.0)
+            server.settimeout(1.0)
 
             while self.running:
                 try:
                     # Accept connections with timeout
-                    client, address = self.server.accept()
+                    client, address = server.accept()
                     self.log_message("Connection accepted from " + str(address))
                     self.show_message("AbletonMCP: Client connected")
 
@@ -141,49 +692,73 @@ class AbletonMCP(ControlSurface):
         """Handle communication with a connected client"""
         self.log_message("Client handler started")
         client.settimeout(None)  # No timeout for client socket
-        buffer = ""  # Changed from b'' to '' for Python 2
+        buffer = b""
+        # Connections start on the legacy bare-JSON protocol; a successful
+        # "hello" switches them to length-prefixed frames
+        session = {"framed": False, "encoding": "json", "compress_threshold": 0}
 
         try:
             while self.running:
                 try:
                     # Receive data
-                    data = client.recv(8192)
+                    data = client.recv(65536)
 
                     if not data:
                         # Client disconnected
                         self.log_message("Client disconnected")
                         break
 
-                    # Accumulate data in buffer with explicit encoding/decoding
-                    try:
-                        # Python 3: data is bytes, decode to string
-                        buffer += data.decode("utf-8")
-                    except AttributeError:
-                        # Python 2: data is already string
-                        buffer += data
+                    buffer += data
 
-                    try:
-                        # Try to parse command from buffer
-                        command = json.loads(buffer)  # Removed decode('utf-8')
-                        buffer = ""  # Clear buffer after successful parse
+                    while buffer:
+                        decode_started = time.perf_counter()
+                        if session["framed"]:
+                            command, buffer = self._read_frame(buffer)
+                        else:
+                            command, buffer = self._read_legacy(buffer)
+                        if command is None:
+                            # Incomplete data, wait for more
+                            break
+                        decoded = time.perf_counter()
 
-                        self.log_message(
-                            "Received command: " + str(command.get("type", "unknown"))
-                        )
+                        if DEBUG_LOGGING:
+                            self.log_message(
+                                "Received command: "
+                                + str(command.get("type", "unknown"))
+                                + (
+                                    " [trace " + command["trace_id"] + "]"
+                                    if "trace_id" in command
+                                    else ""
+                                )
+                            )
 
                         # Process the command and get response
-                        response = self._process_command(command)
-
-                        # Send the response with explicit encoding
-                        try:
-                            # Python 3: encode string to bytes
-                            client.sendall(json.dumps(response).encode("utf-8"))
-                        except AttributeError:
-                            # Python 2: string is already bytes
-                            client.sendall(json.dumps(response))
-                    except ValueError:
-                        # Incomplete data, wait for more
-                        continue
+                        was_framed = session["framed"]
+                        if command.get("type") == "hello":
+                            response = self._negotiate(command.get("params", {}), session)
+                        else:
+                            response = self._process_command(command)
+
+                        # The hello reply itself still uses the legacy format
+                        serialize_started = time.perf_counter()
+                        if was_framed:
+                            data = _encode_frame(
+                                response,
+                                session["encoding"],
+                                session["compress_threshold"],
+                            )
+                        else:
+                            data = json.dumps(response).encode("utf-8")
+                        command_type = str(command.get("type", "unknown"))
+                        self._stats.record(
+                            command_type, "decode", decoded - decode_started
+                        )
+                        self._stats.record(
+                            command_type,
+                            "serialize",
+                            time.perf_counter() - serialize_started,
+                        )
+                        client.sendall(data)
 
                 except Exception as e:
                     self.log_message("Error handling client data: " + str(e))
@@ -192,11 +767,10 @@ class AbletonMCP(ControlSurface):
                     # Send error response if possible
                     error_response = {"status": "error", "message": str(e)}
                     try:
-                        # Python 3: encode string to bytes
-                        client.sendall(json.dumps(error_response).encode("utf-8"))
-                    except AttributeError:
-                        # Python 2: string is already bytes
-                        client.sendall(json.dumps(error_response))
+                        if session["framed"]:
+                            client.sendall(_encode_frame(error_response, "json", 0))
+                        else:
+                            client.sendall(json.dumps(error_response).encode("utf-8"))
                     except:
                         # If we can't send the error, the connection is probably dead
                         break
@@ -204,6 +778,7 @@ class AbletonMCP(ControlSurface):
                     # For serious errors, break the loop
                     if not isinstance(e, ValueError):
                         break
+                    buffer = b""
         except Exception as e:
             self.log_message("Error in client handler: " + str(e))
         finally:
@@ -213,47 +788,262 @@ class AbletonMCP(ControlSurface):
                 pass
             self.log_message("Client handler stopped")
 
+    def _read_legacy(self, buffer):
+        """Parse one bare JSON command; returns (command or None, remaining buffer)"""
+        try:
+            text = buffer.decode("utf-8")
+            command, end = _json_decoder.raw_decode(text)
+        except ValueError:
+            # Incomplete JSON (or a multi-byte character split across reads)
+            return None, buffer
+        return command, text[end:].lstrip().encode("utf-8")
+
+    def _read_frame(self, buffer):
+        """Parse one frame; returns (command or None, remaining buffer)"""
+        if len(buffer) < FRAME_HEADER.size:
+            return None, buffer
+        length, flags = FRAME_HEADER.unpack_from(buffer)
+        if length > MAX_FRAME_SIZE:
+            raise IOError("Frame of {0} bytes exceeds the size limit".format(length))
+        end = FRAME_HEADER.size + length
+        if len(buffer) < end:
+            return None, buffer
+        return _decode_payload(buffer[FRAME_HEADER.size : end], flags), buffer[end:]
+
+    def _negotiate(self, params, session):
+        """Answer a hello: pick an encoding and switch the connection to frames"""
+        offered = params.get("encodings", ["json"])
+        encoding = "json"
+        if "msgpack" in offered and msgpack is not None:
+            encoding = "msgpack"
+        compression = "zlib" if "zlib" in params.get("compression", []) else None
+
+        session["framed"] = True
+        session["encoding"] = encoding
+        session["compress_threshold"] = (
+            int(params.get("compress_threshold", 0)) if compression else 0
+        )
+        self.log_message(
+            "Negotiated protocol {0}: {1}, compression {2}".format(
+                PROTOCOL_VERSION, encoding, compression
+            )
+        )
+        return {
+            "status": "success",
+            "result": {
+                "protocol": PROTOCOL_VERSION,
+                "encoding": encoding,
+                "compression": compression,
+                "compress_threshold": session["compress_threshold"],
+                "features": [
+                    "packed_notes",
+                    "device_chain",
+                    "session_spec",
+                    "launch_scheduler",
+                    "scenes",
+                    "mixer_state",
+                    "arrangement",
+                    "automation",
+                    "clip_notes",
+                ],
+                # Lets the client pick timeouts and retries without its own list
+                "modifying_commands": sorted(IDEMPOTENT_COMMANDS),
+            },
+        }
+
     def _process_command(self, command):
         """Process a command from the client and return a response"""
+        started = time.perf_counter()
+        timings = {}
+        # The client's time budget; relative, so clocks needn't agree
+        deadline = None
+        if command.get("deadline_ms"):
+            deadline = started + command["deadline_ms"] / 1000.0
+        key = command.get("idempotency_key")
+        if key and command.get("type") in IDEMPOTENT_COMMANDS:
+            response = self._dispatch_once(key, command, timings, deadline)
+        else:
+            response = self._dispatch_command(command, timings, deadline)
+        if "execute" not in timings:
+            timings["execute"] = time.perf_counter() - started
+
+        command_type = command.get("type", "")
+        for phase, seconds in timings.items():
+            self._stats.record(command_type, phase, seconds)
+        if command.get("timing"):
+            # Lets the client split its wait into queue, execution and transport
+            response["timings"] = timings
+        if command.get("trace"):
+            response["spans"] = self._trace_spans(
+                command, started, time.perf_counter(), timings
+            )
+        return response
+
+    def _dispatch_once(self, key, command, timings, deadline=None):
+        """Run a modifying command at most once per idempotency key"""
+        entry, first = self._idempotency.begin(key)
+        if first:
+            response = self._dispatch_command(command, timings, deadline)
+            # A copy, since timings and spans are added to the live response
+            self._idempotency.finish(entry, dict(response))
+            if response.get("expired"):
+                self._idempotency.discard(key)
+            return response
+        wait = 15.0 if deadline is None else max(0.0, deadline - time.perf_counter())
+        if not entry["done"].wait(wait):
+            # The original is still queued or running; the client may ask again
+            return self._expired_response(
+                "Deadline expired while the original request was still running"
+            )
+        if DEBUG_LOGGING:
+            self.log_message(
+                "Replaying response for retried {0} (key {1})".format(
+                    command.get("type"), key
+                )
+            )
+        response = dict(entry["response"])
+        response["replayed"] = True
+        return response
+
+    def _trace_spans(self, command, started, finished, timings):
+        """
+        Chrome trace events for one command, parented to the client's span.
+
+        The main-thread task is placed at the end of the dispatch span, which
+        is where the I/O thread stopped waiting for it.
+        """
+        command_type = command.get("type", "")
+        pid = os.getpid()
+        args = {
+            "trace_id": command.get("trace_id"),
+            "parent_id": command.get("span_id"),
+        }
+
+        def span(name, begin, end, tid):
+            return {
+                "name": name,
+                "cat": "remote_script",
+                "ph": "X",
+                "ts": (begin + _EPOCH_OFFSET) * 1e6,
+                "dur": max(0.0, end - begin) * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            }
+
+        spans = [
+            span(
+                "dispatch:" + command_type,
+                started,
+                finished,
+                threading.current_thread().ident,
+            )
+        ]
+        if "queue_wait" in timings:
+            # tid 0 stands for Live's main thread
+            task_started = finished - timings["execute"]
+            spans.append(
+                span(
+                    "queue_wait:" + command_type,
+                    task_started - timings["queue_wait"],
+                    task_started,
+                    0,
+                )
+            )
+            spans.append(span("main_thread:" + command_type, task_started, finished, 0))
+        return spans
+
+    def _expired_response(
+        self, message="Deadline expired before Live ran the command"
+    ):
+        """Error for work dropped at its deadline; nothing ran, so it may be resent"""
+        self._expired_count += 1
+        return {"status": "error", "message": message, "expired": True}
+
+    def _dispatch_command(self, command, timings, deadline=None):
+        """
+        Route a command to its handler; fills timings for main-thread work.
+
+        Work still queued for the main thread at the deadline is dropped.
+        """
         command_type = command.get("type", "")
         params = command.get("params", {})
-        self.log_message(f"--->>> _process_command START for: {command_type}")
+        if DEBUG_LOGGING:
+            self.log_message(f"--->>> _process_command START for: {command_type}")
+        if deadline is not None and time.perf_counter() > deadline:
+            return self._expired_response()
 
         # Initialize response
         response = {"status": "success", "result": {}}
 
         try:
             # Route the command to the appropriate handler
-            if command_type == "get_session_info":
+            if command_type == "ping":
+                # Heartbeat from the MCP server; answered without touching Live
+                response["result"] = {"pong": True}
+            elif command_type == "get_bridge_stats":
+                response["result"] = self._get_bridge_stats(params.get("reset", False))
+            elif command_type == "get_session_info":
                 response["result"] = self._get_session_info()
             elif command_type == "get_track_info":
                 track_index = params.get("track_index", 0)
                 response["result"] = self._get_track_info(track_index)
-            # Commands that modify Live's state should be scheduled on the main thread
-            elif command_type in [
-                "create_midi_track",
-                "set_track_name",
-                "create_clip",
-                "add_notes_to_clip",
-                "set_clip_name",
-                "set_tempo",
-                "fire_clip",
-                "stop_clip",
-                "start_playback",
-                "stop_playback",
-                "load_browser_item",
-                "delete_track",
-                "delete_clip",
-            ]:
-                self.log_message(f"--->>> Scheduling modifying command: {command_type}")
+            elif command_type == "schedule_launch":
+                response["result"] = self._schedule_launch(
+                    params.get("actions", []), params.get("beat"), params.get("bar")
+                )
+            elif command_type == "query_arrangement":
+                response["result"] = self._query_arrangement(
+                    params.get("track_indices"),
+                    params.get("start_beat"),
+                    params.get("end_beat"),
+                    params.get("start_bar"),
+                    params.get("end_bar"),
+                )
+            elif command_type == "get_arrangement_clips":
+                response["result"] = self._get_arrangement_clips(
+                    params.get("clips", []), params.get("notes", True)
+                )
+            elif command_type == "get_mixer_state":
+                response["result"] = self._get_mixer_state(
+                    params.get("track_indices"),
+                    params.get("returns", True),
+                    params.get("master", True),
+                )
+            elif command_type == "get_scenes":
+                response["result"] = self._get_scenes()
+            elif command_type == "get_scheduled_launches":
+                response["result"] = self._get_scheduled_launches()
+            elif command_type == "cancel_launches":
+                response["result"] = {
+                    "cancelled": self._launches.cancel(params.get("launch_id"))
+                }
+            # Commands that modify Live's state (and heavy reads) should be
+            # scheduled on the main thread
+            elif (
+                command_type in MAIN_THREAD_COMMANDS
+                or command_type in MAIN_THREAD_READS
+            ):
+                if DEBUG_LOGGING:
+                    self.log_message(
+                        f"--->>> Scheduling main-thread command: {command_type}"
+                    )
                 # Use a thread-safe approach with a response queue
                 response_queue = queue.Queue()
+                task_clock = {"scheduled": time.perf_counter()}
+                # Guards the hand-off between starting and dropping the task
+                task_lock = threading.Lock()
 
                 # Define a function to execute on the main thread
                 def main_thread_task():
-                    self.log_message(
-                        f"--->>> main_thread_task START for: {command_type}"
-                    )
+                    with task_lock:
+                        if task_clock.get("dropped"):
+                            return
+                        task_clock["started"] = time.perf_counter()
+                    if DEBUG_LOGGING:
+                        self.log_message(
+                            f"--->>> main_thread_task START for: {command_type}"
+                        )
                     try:
                         result = None
                         if command_type == "create_midi_track":
@@ -272,6 +1062,8 @@ class AbletonMCP(ControlSurface):
                             track_index = params.get("track_index", 0)
                             clip_index = params.get("clip_index", 0)
                             notes = params.get("notes", [])
+                            if "notes_packed" in params:
+                                notes = _unpack_notes(params["notes_packed"])
                             result = self._add_notes_to_clip(
                                 track_index, clip_index, notes
                             )
@@ -295,14 +1087,63 @@ class AbletonMCP(ControlSurface):
                             result = self._start_playback()
                         elif command_type == "stop_playback":
                             result = self._stop_playback()
-                        elif command_type == "load_instrument_or_effect":
-                            track_index = params.get("track_index", 0)
-                            uri = params.get("uri", "")
-                            result = self._load_instrument_or_effect(track_index, uri)
+                        elif command_type == "fire_scene":
+                            result = self._fire_scene(params.get("scene_index", 0))
+                        elif command_type == "stop_scene":
+                            result = self._stop_scene(params.get("scene_index", 0))
+                        elif command_type == "create_scene":
+                            result = self._create_scene(
+                                params.get("index", -1), params.get("name")
+                            )
+                        elif command_type == "duplicate_scene":
+                            result = self._duplicate_scene(
+                                params.get("scene_index", 0)
+                            )
+                        elif command_type == "capture_scene":
+                            result = self._capture_scene()
+                        elif command_type == "edit_clip_grid":
+                            result = self._edit_clip_grid(
+                                params.get("action", "create"),
+                                params.get("tracks", [0, 0]),
+                                params.get("slots", [0, 0]),
+                                params.get("length", 4.0),
+                                params.get("name"),
+                            )
+                        elif command_type == "set_mixer_state":
+                            result = self._set_mixer_state(params.get("state", {}))
+                        elif command_type == "get_clip_notes":
+                            result = self._get_clip_notes(
+                                params.get("track_index", 0),
+                                params.get("clip_index", 0),
+                                params.get("start", 0.0),
+                                params.get("limit"),
+                                params.get("span"),
+                                params.get("packed"),
+                            )
+                        elif command_type == "get_session_snapshot":
+                            result = self._get_session_snapshot(
+                                params.get("resolve", [])
+                            )
+                        elif command_type == "write_automation":
+                            result = self._write_automation(
+                                params.get("track_index", 0),
+                                params.get("clip", {}),
+                                params.get("parameter", {}),
+                                params.get("breakpoints", []),
+                                params.get("clear", True),
+                            )
                         elif command_type == "load_browser_item":
                             track_index = params.get("track_index", 0)
                             item_uri = params.get("item_uri", "")
                             result = self._load_browser_item(track_index, item_uri)
+                        elif command_type == "load_device_chain":
+                            track_index = params.get("track_index", 0)
+                            items = params.get("items", [])
+                            result = self._load_device_chain(track_index, items)
+                        elif command_type == "apply_operations":
+                            result = self._apply_operations(
+                                params.get("operations", [])
+                            )
                         elif command_type == "delete_track":
                             track_index = params.get("track_index", 0)
                             try:
@@ -349,9 +1190,33 @@ class AbletonMCP(ControlSurface):
                     # If we're already on the main thread, execute directly
                     main_thread_task()
 
-                # Wait for the response with a timeout
+                # Wait for the response until the deadline
                 try:
-                    task_response = response_queue.get(timeout=10.0)
+                    if deadline is None:
+                        task_response = response_queue.get(
+                            timeout=DEFAULT_COMMAND_TIMEOUT
+                        )
+                    else:
+                        try:
+                            task_response = response_queue.get(
+                                timeout=max(0.0, deadline - time.perf_counter())
+                            )
+                        except queue.Empty:
+                            with task_lock:
+                                started = "started" in task_clock
+                                if not started:
+                                    task_clock["dropped"] = True
+                            if not started:
+                                return self._expired_response()
+                            # Already running; its result is what happened
+                            task_response = response_queue.get(
+                                timeout=DEFAULT_COMMAND_TIMEOUT
+                            )
+                    if "started" in task_clock:
+                        timings["queue_wait"] = (
+                            task_clock["started"] - task_clock["scheduled"]
+                        )
+                        timings["execute"] = time.perf_counter() - task_clock["started"]
                     if task_response.get("status") == "error":
                         response["status"] = "error"
                         response["message"] = task_response.get(
@@ -394,6 +1259,20 @@ class AbletonMCP(ControlSurface):
 
     # Command implementations
 
+    def _get_bridge_stats(self, reset=False):
+        """Latency histograms and connection counts for this Remote Script"""
+        result = {
+            "uptime_seconds": round(time.time() - self._started_at, 1),
+            "client_threads": len([t for t in self.client_threads if t.is_alive()]),
+            "idempotent_replays": self._idempotency.replays,
+            "expired_commands": self._expired_count,
+            "arrangement_rebuilds": self._arrangement.rebuilds,
+            "commands": self._stats.snapshot(),
+        }
+        if reset:
+            self._stats.reset()
+        return result
+
     def _get_session_info(self):
         """Get information about the current session"""
         try:
@@ -402,6 +1281,7 @@ class AbletonMCP(ControlSurface):
                 "signature_numerator": self._song.signature_numerator,
                 "signature_denominator": self._song.signature_denominator,
                 "track_count": len(self._song.tracks),
+                "scene_count": len(self._song.scenes),
                 "return_track_count": len(self._song.return_tracks),
                 "master_track": {
                     "name": "Master",
@@ -439,17 +1319,7 @@ class AbletonMCP(ControlSurface):
                     {"index": slot_index, "has_clip": slot.has_clip, "clip": clip_info}
                 )
 
-            # Get devices
-            devices = []
-            for device_index, device in enumerate(track.devices):
-                devices.append(
-                    {
-                        "index": device_index,
-                        "name": device.name,
-                        "class_name": device.class_name,
-                        "type": self._get_device_type(device),
-                    }
-                )
+            devices = self._track_devices(track)
 
             result = {
                 "index": track_index,
@@ -469,6 +1339,183 @@ class AbletonMCP(ControlSurface):
             self.log_message("Error getting track info: " + str(e))
             raise
 
+    def _get_session_snapshot(self, resolve=()):
+        """
+        Tracks, devices and clips in one read, for diffing against a spec.
+
+        Clip notes are summarized by a digest instead of being sent. resolve
+        lists browser URIs or paths to report the device names of, so the
+        caller can tell which devices are already loaded.
+        """
+        try:
+            tracks = []
+            for track_index, track in enumerate(self._song.tracks):
+                clips = []
+                for slot_index, slot in enumerate(track.clip_slots):
+                    if not slot.has_clip:
+                        continue
+                    clip = slot.clip
+                    info = {
+                        "slot": slot_index,
+                        "name": clip.name,
+                        "length": clip.length,
+                    }
+                    if clip.is_midi_clip:
+                        notes = clip.get_notes(0.0, 0, ALL_NOTES_SPAN, 128)
+                        info["note_count"] = len(notes)
+                        info["notes_digest"] = _notes_digest(notes)
+                    clips.append(info)
+                tracks.append(
+                    {
+                        "index": track_index,
+                        "name": track.name,
+                        "is_midi_track": track.has_midi_input,
+                        "slot_count": len(track.clip_slots),
+                        "devices": [device.name for device in track.devices],
+                        "clips": clips,
+                    }
+                )
+            resolved = {}
+            if resolve:
+                browser = self.application().browser
+                for item in resolve:
+                    spec = {"uri": item} if ":" in item else {"path": item}
+                    try:
+                        loadable = self._resolve_loadable_item(browser, spec)
+                        resolved[item] = os.path.splitext(loadable.name)[0]
+                    except Exception:
+                        resolved[item] = None  # Reported when it is loaded
+            return {
+                "tempo": self._song.tempo,
+                "tracks": tracks,
+                "resolved": resolved,
+            }
+        except Exception as e:
+            self.log_message("Error getting session snapshot: " + str(e))
+            raise
+
+    def _apply_operations(self, operations):
+        """
+        Run a batch of edits in order, all within one main-thread task.
+
+        Stops at the first failing operation; the ones before it stay applied.
+        """
+        results = []
+        for position, operation in enumerate(operations):
+            op = operation.get("op")
+            try:
+                if op == "set_tempo":
+                    result = self._set_tempo(operation["tempo"])
+                elif op == "create_midi_track":
+                    result = self._create_midi_track(operation.get("index", -1))
+                elif op == "set_track_name":
+                    result = self._set_track_name(
+                        operation["track_index"], operation["name"]
+                    )
+                elif op == "ensure_devices":
+                    result = self._ensure_devices(
+                        operation["track_index"], operation["items"]
+                    )
+                elif op == "create_clip":
+                    result = self._create_clip(
+                        operation["track_index"],
+                        operation["clip_index"],
+                        operation["length"],
+                    )
+                elif op == "delete_clip":
+                    result = self._delete_clip(
+                        operation["track_index"], operation["clip_index"]
+                    )
+                elif op == "resize_clip":
+                    result = self._resize_clip(
+                        operation["track_index"],
+                        operation["clip_index"],
+                        operation["length"],
+                    )
+                elif op == "set_clip_name":
+                    result = self._set_clip_name(
+                        operation["track_index"],
+                        operation["clip_index"],
+                        operation["name"],
+                    )
+                elif op == "replace_notes":
+                    notes = operation.get("notes", [])
+                    if "notes_packed" in operation:
+                        notes = _unpack_notes(operation["notes_packed"])
+                    result = self._replace_notes(
+                        operation["track_index"], operation["clip_index"], notes
+                    )
+                else:
+                    raise ValueError("Unknown operation: {0}".format(op))
+            except Exception as e:
+                raise RuntimeError(
+                    "Operation {0} ({1}) failed: {2}".format(position, op, str(e))
+                )
+            results.append(result)
+        return {"applied": len(results), "results": results}
+
+    def _ensure_devices(self, track_index, items):
+        """Load the browser items whose device is not on the track yet"""
+        if track_index < 0 or track_index >= len(self._song.tracks):
+            raise IndexError("Track index out of range")
+        track = self._song.tracks[track_index]
+        browser = self.application().browser
+        present = set(device.name for device in track.devices)
+        missing = [
+            item
+            for item in (self._resolve_loadable_item(browser, spec) for spec in items)
+            if os.path.splitext(item.name)[0] not in present
+        ]
+        if missing:
+            self._song.view.selected_track = track
+            for item in missing:
+                browser.load_item(item)
+        return {"loaded": [item.name for item in missing]}
+
+    def _replace_notes(self, track_index, clip_index, notes):
+        """Replace all notes of a MIDI clip"""
+        if track_index < 0 or track_index >= len(self._song.tracks):
+            raise IndexError("Track index out of range")
+        track = self._song.tracks[track_index]
+        if clip_index < 0 or clip_index >= len(track.clip_slots):
+            raise IndexError("Clip index out of range")
+        clip_slot = track.clip_slots[clip_index]
+        if not clip_slot.has_clip:
+            raise Exception("No clip in slot")
+        clip = clip_slot.clip
+        clip.remove_notes(0.0, 0, ALL_NOTES_SPAN, 128)
+        return self._add_notes_to_clip(track_index, clip_index, notes)
+
+    def _resize_clip(self, track_index, clip_index, length):
+        """
+        Set a session clip's length in place, keeping its notes and name.
+
+        The loop and the end marker both move, so the clip plays the new
+        length whether or not it loops.
+        """
+        if track_index < 0 or track_index >= len(self._song.tracks):
+            raise IndexError("Track index out of range")
+        track = self._song.tracks[track_index]
+        if clip_index < 0 or clip_index >= len(track.clip_slots):
+            raise IndexError("Clip index out of range")
+        clip_slot = track.clip_slots[clip_index]
+        if not clip_slot.has_clip:
+            raise Exception("No clip in slot")
+        if length <= 0:
+            raise ValueError("Clip length must be positive")
+        clip = clip_slot.clip
+        loop_end = clip.loop_start + length
+        end_marker = clip.start_marker + length
+        # Live rejects an end before its start, so move toward the new length
+        # in the order that keeps both pairs valid
+        if loop_end > clip.loop_end:
+            clip.end_marker = end_marker
+            clip.loop_end = loop_end
+        else:
+            clip.loop_end = loop_end
+            clip.end_marker = end_marker
+        return {"name": clip.name, "length": clip.length}
+
     def _create_midi_track(self, index):
         """Create a new MIDI track in the session"""
         try:
@@ -545,9 +1592,12 @@ class AbletonMCP(ControlSurface):
 
             clip = clip_slot.clip
 
-            # Convert note data to Live's format
+            # Convert note data to Live's format (packed notes already are)
             live_notes = []
             for note in notes:
+                if not isinstance(note, dict):
+                    live_notes.append(tuple(note))
+                    continue
                 pitch = note.get("pitch", 60)
                 start_time = note.get("start_time", 0.0)
                 duration = note.get("duration", 0.25)
@@ -668,6 +1718,664 @@ class AbletonMCP(ControlSurface):
             self.log_message("Error stopping playback: " + str(e))
             raise
 
+    def _query_arrangement(
+        self,
+        track_indices=None,
+        start_beat=None,
+        end_beat=None,
+        start_bar=None,
+        end_bar=None,
+    ):
+        """
+        Arrangement clips overlapping a time range on the given tracks.
+
+        The range is [start_beat, end_beat) in beats, or bars start_bar to
+        end_bar inclusive, counted from 1 as Live shows them; either end may
+        be left open. Clips are listed as columns.
+        """
+        song = self._song
+        bar_length = song.signature_numerator * 4.0 / song.signature_denominator
+        if start_bar is not None:
+            start_beat = (float(start_bar) - 1) * bar_length
+        if end_bar is not None:
+            end_beat = float(end_bar) * bar_length
+        start = float("-inf") if start_beat is None else float(start_beat)
+        end = float("inf") if end_beat is None else float(end_beat)
+        if track_indices is None:
+            track_indices = range(len(song.tracks))
+
+        columns = {
+            "track_index": [],
+            "name": [],
+            "start_time": [],
+            "end_time": [],
+            "is_midi": [],
+            "muted": [],
+        }
+        for track_index in track_indices:
+            if track_index < 0 or track_index >= len(song.tracks):
+                raise IndexError("Track index {0} out of range".format(track_index))
+            for clip in self._arrangement.overlapping(track_index, start, end):
+                columns["track_index"].append(track_index)
+                columns["name"].append(clip.name)
+                columns["start_time"].append(clip.start_time)
+                columns["end_time"].append(clip.end_time)
+                columns["is_midi"].append(clip.is_midi_clip)
+                columns["muted"].append(getattr(clip, "muted", False))
+        return {
+            "start_beat": None if start_beat is None else start,
+            "end_beat": None if end_beat is None else end,
+            "count": len(columns["name"]),
+            "clips": columns,
+        }
+
+    def _get_arrangement_clips(self, clips, notes=True):
+        """
+        Details (and notes) of arrangement clips named by track and start time.
+
+        A track never holds two arrangement clips at the same position, so
+        (track_index, start_time) identifies a clip across edits elsewhere.
+        Notes are [pitch, start, duration, velocity, mute] lists.
+        """
+        results = []
+        for spec in clips:
+            track_index = spec.get("track_index", 0)
+            start_time = spec.get("start_time", 0.0)
+            if track_index < 0 or track_index >= len(self._song.tracks):
+                raise IndexError("Track index {0} out of range".format(track_index))
+            clip = self._arrangement.at(track_index, float(start_time))
+            if clip is None:
+                results.append(
+                    {"track_index": track_index, "start_time": start_time, "found": False}
+                )
+                continue
+            info = {
+                "track_index": track_index,
+                "start_time": clip.start_time,
+                "found": True,
+                "name": clip.name,
+                "end_time": clip.end_time,
+                "length": clip.length,
+                "is_midi": clip.is_midi_clip,
+                "looping": clip.looping,
+            }
+            if notes and clip.is_midi_clip:
+                info["notes"] = [
+                    list(note) for note in clip.get_notes(0.0, 0, ALL_NOTES_SPAN, 128)
+                ]
+            results.append(info)
+        return {"clips": results}
+
+    def _get_clip_notes(
+        self, track_index, clip_index, start=0.0, limit=None, span=None, packed=None
+    ):
+        """
+        A page of a session clip's notes from beat start on, sorted by start
+        time then pitch.
+
+        Pages are time windows, so each one asks Live only for its own notes
+        and sorts only those: the window (span beats, by default the clip's
+        length) doubles until it holds limit notes or reaches the end, and
+        is then cut at a start time so that at most limit notes are returned
+        (more only when that many start together). "next" is where the
+        following page starts, or None after the last; "span" is a window
+        size to pass back with it. packed="bytes" returns NOTE_STRUCT rows
+        (for msgpack links), packed="base64" the same as text; otherwise
+        notes are [pitch, start, duration, velocity, mute] lists.
+        """
+        if track_index < 0 or track_index >= len(self._song.tracks):
+            raise IndexError("Track index out of range")
+        track = self._song.tracks[track_index]
+        if clip_index < 0 or clip_index >= len(track.clip_slots):
+            raise IndexError("Clip index out of range")
+        clip_slot = track.clip_slots[clip_index]
+        if not clip_slot.has_clip:
+            raise Exception("No clip in slot")
+        clip = clip_slot.clip
+        if not clip.is_midi_clip:
+            raise Exception("Clip is not a MIDI clip")
+
+        start = float(start)
+        remaining = ALL_NOTES_SPAN - start
+        if limit is None:
+            span = remaining
+        else:
+            limit = max(1, int(limit))
+            span = min(float(span or max(1.0, clip.length)), remaining)
+        notes = clip.get_notes(start, 0, span, 128)
+        while limit is not None and len(notes) < limit and span < remaining:
+            span = min(span * 2, remaining)
+            notes = clip.get_notes(start, 0, span, 128)
+        notes = sorted(notes, key=lambda n: (n[1], n[0]))
+
+        next_start = start + span if span < remaining else None
+        if limit is not None and len(notes) > limit:
+            starts = [note[1] for note in notes]
+            cut = bisect.bisect_left(starts, starts[limit])
+            if cut == 0:
+                # More than limit notes start together; keep them together
+                cut = bisect.bisect_right(starts, starts[0])
+            if cut < len(notes):
+                notes = notes[:cut]
+                next_start = starts[cut]
+        result = {
+            "name": clip.name,
+            "length": clip.length,
+            "start": start,
+            "count": len(notes),
+            "next": next_start,
+            # The window this page needed, as a guess for the next one
+            "span": (next_start if next_start is not None else start + span) - start,
+        }
+        if packed in ("bytes", "base64"):
+            data = b"".join(
+                NOTE_STRUCT.pack(
+                    int(pitch),
+                    float(time_),
+                    float(duration),
+                    int(round(float(velocity))),
+                    bool(mute),
+                )
+                for pitch, time_, duration, velocity, mute in notes
+            )
+            if packed == "base64":
+                data = base64.b64encode(data).decode("ascii")
+            result["notes_packed"] = data
+        else:
+            result["notes"] = [list(note) for note in notes]
+        return result
+
+    def _automation_clip(self, track_index, spec):
+        """A session clip by {"slot": i} or an arrangement clip by {"start_time": t}"""
+        track = self._song.tracks[track_index]
+        if "slot" in spec:
+            slot_index = spec["slot"]
+            if slot_index < 0 or slot_index >= len(track.clip_slots):
+                raise IndexError("Clip index out of range")
+            clip = track.clip_slots[slot_index].clip
+        else:
+            start_time = float(spec.get("start_time", 0.0))
+            clip = self._arrangement.at(track_index, start_time)
+        if clip is None:
+            raise Exception("No clip at {0}".format(spec))
+        return clip
+
+    def _automation_parameter(self, track, spec):
+        """
+        A device parameter by {"device_index", "parameter_index" or "name"},
+        or a mixer one by {"mixer": "volume" | "panning" | "send_a" ...}
+        """
+        mixer = spec.get("mixer")
+        if mixer is not None:
+            if mixer in MIXER_PARAMETERS:
+                return getattr(track.mixer_device, mixer)
+            sends = track.mixer_device.sends
+            if mixer.startswith("send_") and len(mixer) == 6:
+                send_index = ord(mixer[5].lower()) - ord("a")
+                if 0 <= send_index < len(sends):
+                    return sends[send_index]
+            raise ValueError("Unknown mixer parameter: {0}".format(mixer))
+        devices = track.devices
+        device_index = spec.get("device_index", 0)
+        if device_index < 0 or device_index >= len(devices):
+            raise IndexError("Device index out of range")
+        parameters = devices[device_index].parameters
+        if "name" in spec:
+            for parameter in parameters:
+                if parameter.name == spec["name"]:
+                    return parameter
+            raise ValueError("No parameter named {0}".format(spec["name"]))
+        parameter_index = spec.get("parameter_index", 0)
+        if parameter_index < 0 or parameter_index >= len(parameters):
+            raise IndexError("Parameter index out of range")
+        return parameters[parameter_index]
+
+    def _write_automation(
+        self, track_index, clip_spec, parameter_spec, breakpoints, clear=True
+    ):
+        """
+        Write [time, value] breakpoints into a clip's envelope for a parameter.
+
+        Times are in beats from the clip start; Live draws straight lines
+        between breakpoints. With clear, the envelope is replaced; otherwise
+        the breakpoints are added to it. The envelope is read back at every
+        breakpoint afterwards: "landed" counts those it holds, and
+        "max_deviation" is the largest difference found.
+        """
+        if track_index < 0 or track_index >= len(self._song.tracks):
+            raise IndexError("Track index out of range")
+        track = self._song.tracks[track_index]
+        clip = self._automation_clip(track_index, clip_spec)
+        parameter = self._automation_parameter(track, parameter_spec)
+        for time_, value in breakpoints:
+            if not parameter.min <= value <= parameter.max:
+                raise ValueError(
+                    "Value {0} outside {1}..{2} for {3}".format(
+                        value, parameter.min, parameter.max, parameter.name
+                    )
+                )
+        envelope = clip.automation_envelope(parameter)
+        if envelope is not None and clear:
+            clip.clear_envelope(parameter)
+            envelope = None
+        if envelope is None:
+            envelope = clip.create_automation_envelope(parameter)
+        breakpoints = sorted((float(t), float(v)) for t, v in breakpoints)
+        value_range = parameter.max - parameter.min
+        for index, (time_, value) in enumerate(breakpoints):
+            step = AUTOMATION_STEP_BEATS
+            if index + 1 < len(breakpoints):
+                next_time, next_value = breakpoints[index + 1]
+                gap = next_time - time_
+                step = min(step, gap / 2)
+                rise = abs(next_value - value)
+                if rise:
+                    step = min(step, AUTOMATION_STEP_ERROR * value_range * gap / rise)
+            envelope.insert_step(time_, step, value)
+
+        # Precision Live may lose storing a value, relative to the range
+        slack = value_range * 1e-6
+        landed = 0
+        deviation = 0.0
+        for time_, value in breakpoints:
+            error = abs(envelope.value_at_time(time_) - value)
+            deviation = max(deviation, error)
+            if error <= slack:
+                landed += 1
+        return {
+            "parameter": parameter.name,
+            "clip": clip.name,
+            "breakpoints": len(breakpoints),
+            "landed": landed,
+            "max_deviation": deviation,
+        }
+
+    def _mixer_columns(self, tracks, indices, arm):
+        """Mixer values of tracks as one list per column, sends as one per send"""
+        columns = {
+            "index": list(indices),
+            "name": [],
+            "volume": [],
+            "panning": [],
+            "mute": [],
+            "solo": [],
+        }
+        if arm:
+            columns["arm"] = []
+        sends = [[] for _ in self._song.return_tracks]
+        for track in tracks:
+            mixer = track.mixer_device
+            columns["name"].append(track.name)
+            columns["volume"].append(mixer.volume.value)
+            columns["panning"].append(mixer.panning.value)
+            columns["mute"].append(track.mute)
+            columns["solo"].append(track.solo)
+            if arm:
+                columns["arm"].append(track.arm if track.can_be_armed else None)
+            values = [send.value for send in mixer.sends]
+            for send_index, column in enumerate(sends):
+                column.append(values[send_index] if send_index < len(values) else None)
+        columns["sends"] = sends
+        return columns
+
+    def _get_mixer_state(self, track_indices=None, returns=True, master=True):
+        """Volume, pan, switches and sends of many tracks in columnar form"""
+        tracks = self._song.tracks
+        if track_indices is None:
+            track_indices = range(len(tracks))
+        for index in track_indices:
+            if index < 0 or index >= len(tracks):
+                raise IndexError("Track index {0} out of range".format(index))
+        result = {
+            "tracks": self._mixer_columns(
+                [tracks[index] for index in track_indices], track_indices, True
+            )
+        }
+        if returns:
+            return_tracks = self._song.return_tracks
+            result["returns"] = self._mixer_columns(
+                return_tracks, range(len(return_tracks)), False
+            )
+        if master:
+            mixer = self._song.master_track.mixer_device
+            result["master"] = {
+                "volume": mixer.volume.value,
+                "panning": mixer.panning.value,
+            }
+        return result
+
+    def _set_mixer_state(self, state):
+        """
+        Write the mixer columns given in the get_mixer_state format.
+
+        Every value is checked before any is written, so a bad column leaves
+        the mix untouched. None skips a cell; index and name are ignored.
+        """
+        writes = []
+
+        def parameter(target, value, label):
+            if value is None:
+                return
+            if not target.min <= value <= target.max:
+                raise ValueError(
+                    "{0} value {1} outside {2}..{3}".format(
+                        label, value, target.min, target.max
+                    )
+                )
+            writes.append((target, "value", value))
+
+        for section in ("tracks", "returns"):
+            columns = state.get(section)
+            if not columns:
+                continue
+            pool = self._song.tracks if section == "tracks" else self._song.return_tracks
+            indices = columns.get("index")
+            if indices is None:
+                raise ValueError("{0} needs an index column".format(section))
+            for index in indices:
+                if index < 0 or index >= len(pool):
+                    raise IndexError("{0} index {1} out of range".format(section, index))
+            tracks = [pool[index] for index in indices]
+
+            for column, values in columns.items():
+                if column in ("index", "name"):
+                    continue
+                if column == "sends":
+                    for send_index, send_values in enumerate(values):
+                        if len(send_values) != len(tracks):
+                            raise ValueError("Send column length must match index")
+                        for track, value in zip(tracks, send_values):
+                            if value is None:
+                                continue
+                            if send_index >= len(track.mixer_device.sends):
+                                raise IndexError(
+                                    "No send {0} on {1}".format(send_index, track.name)
+                                )
+                            parameter(
+                                track.mixer_device.sends[send_index], value, "Send"
+                            )
+                    continue
+                if len(values) != len(tracks):
+                    raise ValueError(
+                        "Column {0} length must match index".format(column)
+                    )
+                for track, value in zip(tracks, values):
+                    if column in MIXER_PARAMETERS:
+                        parameter(
+                            getattr(track.mixer_device, column), value, column
+                        )
+                    elif column in MIXER_SWITCHES:
+                        if value is None:
+                            continue
+                        if column == "arm" and not track.can_be_armed:
+                            raise ValueError("{0} can't be armed".format(track.name))
+                        writes.append((track, column, bool(value)))
+                    else:
+                        raise ValueError("Unknown mixer column: {0}".format(column))
+
+        master = state.get("master") or {}
+        mixer = self._song.master_track.mixer_device
+        for column, value in master.items():
+            if column not in MIXER_PARAMETERS:
+                raise ValueError("Unknown master column: {0}".format(column))
+            parameter(getattr(mixer, column), value, column)
+
+        changed = 0
+        for target, attribute, value in writes:
+            if getattr(target, attribute) != value:
+                setattr(target, attribute, value)
+                changed += 1
+        return {"written": len(writes), "changed": changed}
+
+    def _scene(self, scene_index):
+        if scene_index < 0 or scene_index >= len(self._song.scenes):
+            raise IndexError("Scene index out of range")
+        return self._song.scenes[scene_index]
+
+    def _scene_info(self, scene_index):
+        scene = self._song.scenes[scene_index]
+        clips = 0
+        for track in self._song.tracks:
+            if scene_index < len(track.clip_slots):
+                clips += track.clip_slots[scene_index].has_clip
+        return {"index": scene_index, "name": scene.name, "clip_count": clips}
+
+    def _get_scenes(self):
+        """Name and number of clips of every scene"""
+        return {
+            "scenes": [
+                self._scene_info(index) for index in range(len(self._song.scenes))
+            ]
+        }
+
+    def _fire_scene(self, scene_index):
+        """Launch every clip in a scene row, as the scene launch button does"""
+        self._scene(scene_index).fire()
+        return {"fired": True, "scene_index": scene_index}
+
+    def _stop_scene(self, scene_index):
+        """Stop the clips of one scene row, leaving other rows playing"""
+        self._scene(scene_index)
+        stopped = 0
+        for track in self._song.tracks:
+            if scene_index >= len(track.clip_slots):
+                continue
+            slot = track.clip_slots[scene_index]
+            # Stopping an idle slot would stop whatever its track is playing
+            if slot.has_clip and (slot.is_playing or slot.is_triggered):
+                slot.stop()
+                stopped += 1
+        return {"stopped": stopped, "scene_index": scene_index}
+
+    def _create_scene(self, index=-1, name=None):
+        """Insert an empty scene (at the end by default)"""
+        if index != -1 and not 0 <= index <= len(self._song.scenes):
+            raise IndexError("Scene index out of range")
+        self._song.create_scene(index)
+        if index == -1:
+            index = len(self._song.scenes) - 1
+        if name is not None:
+            self._song.scenes[index].name = name
+        return self._scene_info(index)
+
+    def _duplicate_scene(self, scene_index):
+        """Copy a scene and its clips into a new scene right after it"""
+        self._scene(scene_index)
+        self._song.duplicate_scene(scene_index)
+        return self._scene_info(scene_index + 1)
+
+    def _capture_scene(self):
+        """Insert a scene holding the clips playing now, after the selected scene"""
+        # Found before capturing, since Live may select the new scene
+        index = list(self._song.scenes).index(self._song.view.selected_scene) + 1
+        self._song.capture_and_insert_scene()
+        return self._scene_info(index)
+
+    def _edit_clip_grid(self, action, tracks, slots, length=4.0, name=None):
+        """
+        Create, name or delete the clips in a rectangle of tracks x slots in
+        one pass. tracks and slots are inclusive [first, last] pairs; name may
+        use {track}, {slot}, {track_name} and {scene_name}.
+
+        create skips slots that already hold a clip (naming them if a name is
+        given); name only touches existing clips.
+        """
+        if action not in ("create", "name", "clear"):
+            raise ValueError("Unknown grid action: {0}".format(action))
+        first_track, last_track = tracks
+        first_slot, last_slot = slots
+        if not 0 <= first_track <= last_track < len(self._song.tracks):
+            raise IndexError("Track range out of range")
+        if not 0 <= first_slot <= last_slot < len(self._song.scenes):
+            raise IndexError("Slot range out of range")
+
+        if name is not None:
+            # Fail before touching any cell rather than halfway through
+            try:
+                name.format(track=0, slot=0, track_name="", scene_name="")
+            except (KeyError, IndexError, ValueError) as e:
+                raise ValueError("Invalid clip name template: {0}".format(e))
+
+        counts = {"created": 0, "named": 0, "deleted": 0, "skipped": 0}
+        scenes = self._song.scenes
+        for track_index in range(first_track, last_track + 1):
+            track = self._song.tracks[track_index]
+            for slot_index in range(first_slot, last_slot + 1):
+                slot = track.clip_slots[slot_index]
+                if action == "clear":
+                    if slot.has_clip:
+                        slot.delete_clip()
+                        counts["deleted"] += 1
+                    continue
+                if action == "create":
+                    if slot.has_clip:
+                        counts["skipped"] += 1
+                    else:
+                        slot.create_clip(length)
+                        counts["created"] += 1
+                if name is not None and slot.has_clip:
+                    slot.clip.name = name.format(
+                        track=track_index,
+                        slot=slot_index,
+                        track_name=track.name,
+                        scene_name=scenes[slot_index].name,
+                    )
+                    counts["named"] += 1
+        counts["cells"] = (last_track - first_track + 1) * (last_slot - first_slot + 1)
+        return counts
+
+    def _launch_quantum(self):
+        """Beats per step of the song's launch quantization, or 0 for none"""
+        song = self._song
+        value = int(song.clip_trigger_quantization)
+        if value in LAUNCH_QUANTIZATION_BARS:
+            bar = song.signature_numerator * 4.0 / song.signature_denominator
+            return LAUNCH_QUANTIZATION_BARS[value] * bar
+        return LAUNCH_QUANTIZATION_BEATS.get(value, 0.0)
+
+    def _schedule_launch(self, actions, beat=None, bar=None):
+        """
+        Queue actions to run together at a song beat, at the start of a bar
+        (counted from 1, as Live shows them), or by default at the next
+        launch quantization boundary.
+
+        Live starts a fired clip at the next quantization boundary on its
+        audio thread, so clip actions aimed at a boundary are released one
+        step early and land on it exactly; transport actions run on the first
+        display tick at or after their beat. Song time doesn't move while the
+        transport is stopped: transport actions given no beat or bar then run
+        on the next tick, a later beat for them is refused as it would never
+        come, and clip actions wait for playback ("waiting_for_transport").
+        """
+        if not actions:
+            raise ValueError("No actions to schedule")
+        for action in actions:
+            if action.get("action") not in LAUNCH_ACTIONS:
+                raise ValueError(
+                    "Unknown launch action: {0}".format(action.get("action"))
+                )
+        song = self._song
+        now = song.current_song_time
+        positioned = beat is not None or bar is not None
+        bar_length = song.signature_numerator * 4.0 / song.signature_denominator
+        quantum = self._launch_quantum()
+        if bar is not None:
+            beat = (float(bar) - 1) * bar_length
+        elif beat is None:
+            step = quantum or bar_length
+            beat = (math.floor(now / step + 1e-9) + 1) * step
+        beat = float(beat)
+
+        quantized = [a for a in actions if a["action"] in QUANTIZED_LAUNCH_ACTIONS]
+        transport = [a for a in actions if a["action"] in TRANSPORT_LAUNCH_ACTIONS]
+        transport_release = beat
+        if transport and not song.is_playing:
+            if positioned and beat > now + 1e-9:
+                raise ValueError(
+                    "The transport is stopped, so song time won't reach beat "
+                    "{0:g} to run {1}; leave out beat and bar to run it on the "
+                    "next tick".format(
+                        beat, ", ".join(a["action"] for a in transport)
+                    )
+                )
+            transport_release = now
+            if not quantized:
+                beat = now
+        parts = []
+        if quantized:
+            release = beat
+            if quantum and abs(beat / quantum - round(beat / quantum)) < 1e-6:
+                # Firing anywhere in the step before the boundary lands on it
+                release = beat - quantum + 1e-3
+            parts.append((release, quantized))
+        if transport:
+            parts.append((transport_release, transport))
+        launch = self._launches.add(beat, parts)
+        starts = any(a["action"] == "start_playback" for a in transport)
+        return {
+            "id": launch["id"],
+            "beat": beat,
+            "current_beat": now,
+            "quantization_beats": quantum,
+            "pending": len(self._launches.pending()),
+            "waiting_for_transport": not song.is_playing and not starts,
+        }
+
+    def _get_scheduled_launches(self):
+        stopped = not self._song.is_playing
+        pending = []
+        for launch in self._launches.pending():
+            # Song time stands still while stopped, so everything still
+            # queued waits for playback to reach its beat
+            pending.append(dict(launch, waiting_for_transport=stopped))
+        return {
+            "current_beat": self._song.current_song_time,
+            "is_playing": self._song.is_playing,
+            "quantization_beats": self._launch_quantum(),
+            "pending": pending,
+            "recent": list(self._launches.history),
+        }
+
+    def _run_due_launches(self):
+        """Run the scheduled actions whose release beat the song has reached"""
+        now = self._song.current_song_time
+        for launch, actions in self._launches.due(now):
+            errors = []
+            for action in actions:
+                try:
+                    self._run_launch_action(action)
+                except Exception as e:
+                    errors.append("{0}: {1}".format(action["action"], str(e)))
+            # Clip actions released early are placed exactly by Live
+            late = max(0.0, now - launch["beat"]) * 60.0 / self._song.tempo
+            self._stats.record("scheduled_launch", "late", late)
+            self._launches.history.append(
+                {
+                    "id": launch["id"],
+                    "beat": launch["beat"],
+                    "ran_at_beat": now,
+                    "actions": actions,
+                    "errors": errors,
+                }
+            )
+
+    def _run_launch_action(self, action):
+        kind = action["action"]
+        if kind == "fire_clip":
+            self._fire_clip(action.get("track_index", 0), action.get("clip_index", 0))
+        elif kind == "stop_clip":
+            self._stop_clip(action.get("track_index", 0), action.get("clip_index", 0))
+        elif kind == "fire_scene":
+            self._fire_scene(action.get("scene_index", 0))
+        elif kind == "stop_scene":
+            self._stop_scene(action.get("scene_index", 0))
+        elif kind == "stop_all_clips":
+            self._song.stop_all_clips()
+        elif kind == "start_playback":
+            self._start_playback()
+        elif kind == "stop_playback":
+            self._stop_playback()
+
     def _get_browser_item(self, uri, path):
         """Get a browser item by URI or path"""
         try:
@@ -785,55 +2493,157 @@ class AbletonMCP(ControlSurface):
             self.log_message(traceback.format_exc())
             raise
 
-    def _find_browser_item_by_uri(
-        self, browser_or_item, uri, max_depth=10, current_depth=0
-    ):
-        """Find a browser item by its URI"""
-        try:
-            # Check if this is the item we're looking for
-            if hasattr(browser_or_item, "uri") and browser_or_item.uri == uri:
-                return browser_or_item
-
-            # Stop recursion if we've reached max depth
-            if current_depth >= max_depth:
-                return None
-
-            # Check if this is a browser with root categories
-            if hasattr(browser_or_item, "instruments"):
-                # Check all main categories
-                categories = [
-                    browser_or_item.instruments,
-                    browser_or_item.sounds,
-                    browser_or_item.drums,
-                    browser_or_item.audio_effects,
-                    browser_or_item.midi_effects,
-                ]
-
-                for category in categories:
-                    item = self._find_browser_item_by_uri(
-                        category, uri, max_depth, current_depth + 1
-                    )
-                    if item:
-                        return item
-
-                return None
+    def _find_browser_item_by_uri(self, browser, uri, max_depth=10):
+        """
+        Find a browser item by its URI.
 
-            # Check if this item has children
-            if hasattr(browser_or_item, "children") and browser_or_item.children:
-                for child in browser_or_item.children:
-                    item = self._find_browser_item_by_uri(
-                        child, uri, max_depth, current_depth + 1
-                    )
-                    if item:
-                        return item
+        Every item walked past is indexed by URI, so repeated lookups (and
+        lookups of items seen on the way to earlier ones) skip the walk.
+        """
+        with self._browser_lock:
+            item = self._browser_uris.get(uri)
+        if item is not None:
+            try:
+                if item.uri == uri:
+                    return item
+            except Exception:
+                pass  # The browser was refreshed since the item was indexed
+            with self._browser_lock:
+                self._browser_uris.pop(uri, None)
 
+        try:
+            stack = [
+                (category, 1)
+                for category in reversed(
+                    [
+                        browser.instruments,
+                        browser.sounds,
+                        browser.drums,
+                        browser.audio_effects,
+                        browser.midi_effects,
+                    ]
+                )
+            ]
+            while stack:
+                node, depth = stack.pop()
+                node_uri = getattr(node, "uri", None)
+                if node_uri:
+                    with self._browser_lock:
+                        self._browser_uris[node_uri] = node
+                    if node_uri == uri:
+                        return node
+                if depth < max_depth and getattr(node, "children", None):
+                    stack.extend((child, depth + 1) for child in reversed(node.children))
             return None
         except Exception as e:
             self.log_message("Error finding browser item by URI: {0}".format(str(e)))
             return None
 
+    def _find_browser_item_by_path(self, browser, path):
+        """
+        Find a browser item by a "category/folder/.../name" path, ignoring case.
+
+        Resolved paths are cached the same way URIs are.
+        """
+        key = path.strip("/").lower()
+        with self._browser_lock:
+            item = self._browser_paths.get(key)
+        if item is not None:
+            try:
+                if item.name is not None:
+                    return item
+            except Exception:
+                pass
+            with self._browser_lock:
+                self._browser_paths.pop(key, None)
+
+        parts = [part for part in key.split("/") if part]
+        if not parts:
+            raise ValueError("Invalid path")
+        # Any browser attribute is a category (user_library, packs, ...),
+        # as in get_browser_items_at_path
+        item = None
+        for attr in dir(browser):
+            if not attr.startswith("_") and attr.lower() == parts[0]:
+                item = getattr(browser, attr, None)
+                break
+        if item is None:
+            raise ValueError("Unknown browser category: {0}".format(parts[0]))
+        for part in parts[1:]:
+            for child in item.children:
+                if child.name.lower() == part:
+                    item = child
+                    break
+            else:
+                raise ValueError("Path part '{0}' not found in '{1}'".format(part, path))
+        with self._browser_lock:
+            self._browser_paths[key] = item
+        return item
+
+    def _resolve_loadable_item(self, browser, spec):
+        """
+        The browser item to load for {"uri": ...} or {"path": ...}.
+
+        A folder resolves to its first loadable item, e.g. the first kit in a
+        drum kit folder.
+        """
+        if spec.get("uri"):
+            item = self._find_browser_item_by_uri(browser, spec["uri"])
+            if not item:
+                raise ValueError(
+                    "Browser item with URI '{0}' not found".format(spec["uri"])
+                )
+        elif spec.get("path"):
+            item = self._find_browser_item_by_path(browser, spec["path"])
+        else:
+            raise ValueError("Each item needs a 'uri' or a 'path'")
+        if not item.is_loadable:
+            loadable = [child for child in item.children if child.is_loadable]
+            if not loadable:
+                raise ValueError("No loadable items in '{0}'".format(item.name))
+            item = loadable[0]
+        return item
+
+    def _load_device_chain(self, track_index, items):
+        """
+        Load several browser items onto a track in one main-thread task.
+
+        Everything is resolved before anything is loaded, so a bad URI or path
+        leaves the track untouched.
+        """
+        if track_index < 0 or track_index >= len(self._song.tracks):
+            raise IndexError("Track index out of range")
+        if not items:
+            raise ValueError("No items to load")
+
+        track = self._song.tracks[track_index]
+        browser = self.application().browser
+        resolved = [self._resolve_loadable_item(browser, spec) for spec in items]
+
+        self._song.view.selected_track = track
+        for item in resolved:
+            browser.load_item(item)
+
+        return {
+            "loaded": [{"name": item.name, "uri": item.uri} for item in resolved],
+            "track_name": track.name,
+            "devices": self._track_devices(track),
+        }
+
     # Helper methods
 
+    def _track_devices(self, track):
+        """Index, name, class and type of each device on a track"""
+        return [
+            {
+                "index": device_index,
+                "name": device.name,
+                "class_name": device.class_name,
+                "type": self._get_device_type(device),
+            }
+            for device_index, device in enumerate(track.devices)
+        ]
+
     def _get_device_type(self, device):
         """Get the type of a device"""
         try:
@@ -877,7 +2687,10 @@ class AbletonMCP(ControlSurface):
             browser_attrs = [
                 attr for attr in dir(app.browser) if not attr.startswith("_")
             ]
-            self.log_message("Available browser attributes: {0}".format(browser_attrs))
+            if DEBUG_LOGGING:
+                self.log_message(
+                    "Available browser attributes: {0}".format(browser_attrs)
+                )
 
             result = {
                 "type": category_type,
@@ -984,11 +2797,12 @@ class AbletonMCP(ControlSurface):
                             "Error processing {0}: {1}".format(attr, str(e))
                         )
 
-            self.log_message(
-                "Browser tree generated for {0} with {1} root categories".format(
-                    category_type, len(result["categories"])
+            if DEBUG_LOGGING:
+                self.log_message(
+                    "Browser tree generated for {0} with {1} root categories".format(
+                        category_type, len(result["categories"])
+                    )
                 )
-            )
             return result
 
         except Exception as e:
@@ -1022,7 +2836,10 @@ class AbletonMCP(ControlSurface):
             browser_attrs = [
                 attr for attr in dir(app.browser) if not attr.startswith("_")
             ]
-            self.log_message("Available browser attributes: {0}".format(browser_attrs))
+            if DEBUG_LOGGING:
+                self.log_message(
+                    "Available browser attributes: {0}".format(browser_attrs)
+                )
 
             # Parse the path
             path_parts = path.split("/")
@@ -1142,9 +2959,10 @@ class AbletonMCP(ControlSurface):
                 "items": items,
             }
 
-            self.log_message(
-                "Retrieved {0} items at path: {1}".format(len(items), path)
-            )
+            if DEBUG_LOGGING:
+                self.log_message(
+                    "Retrieved {0} items at path: {1}".format(len(items), path)
+                )
             return result
 
         except Exception as e:
@@ -1154,8 +2972,8 @@ class AbletonMCP(ControlSurface):
 
     def _delete_track(self, track_index):
         """Delete a track at the specified index."""
-        self.log_message(f"---> Entering _delete_track for index: {track_index}")
-        self.log_message(f"Attempting to delete track at index: {track_index}")
+        if DEBUG_LOGGING:
+            self.log_message(f"Attempting to delete track at index: {track_index}")
         try:
             num_tracks = len(self._song.tracks)
             if track_index < 0 or track_index >= num_tracks:
@@ -1166,7 +2984,8 @@ class AbletonMCP(ControlSurface):
             # Check if the track exists before trying to delete
             if self._song.tracks[track_index]:
                 self._song.delete_track(track_index)
-                self.log_message(f"Successfully deleted track at index {track_index}")
+                if DEBUG_LOGGING:
+                    self.log_message(f"Successfully deleted track at index {track_index}")
                 return {"message": f"Track {track_index} deleted successfully."}
             else:
                 # This case might not be strictly necessary if index check is robust
@@ -1185,12 +3004,10 @@ class AbletonMCP(ControlSurface):
 
     def _delete_clip(self, track_index, clip_index):
         """Delete a clip at the specified track and clip slot index."""
-        self.log_message(
-            f"---> Entering _delete_clip for track {track_index}, clip {clip_index}"
-        )
-        self.log_message(
-            f"Attempting to delete clip at track {track_index}, slot {clip_index}"
-        )
+        if DEBUG_LOGGING:
+            self.log_message(
+                f"Attempting to delete clip at track {track_index}, slot {clip_index}"
+            )
         try:
             num_tracks = len(self._song.tracks)
             if track_index < 0 or track_index >= num_tracks:
@@ -1217,9 +3034,10 @@ class AbletonMCP(ControlSurface):
 
             clip_slot.delete_clip()
 
-            self.log_message(
-                f"Successfully deleted clip at track {track_index}, slot {clip_index}"
-            )
+            if DEBUG_LOGGING:
+                self.log_message(
+                    f"Successfully deleted clip at track {track_index}, slot {clip_index}"
+                )
             return {
                 "message": f"Clip {clip_index} on track {track_index} deleted successfully."
             }
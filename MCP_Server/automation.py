@@ -0,0 +1,90 @@
+"""
+Dense automation curves reduced to breakpoints before they are written.
+
+Live draws straight lines between the breakpoints of an envelope, so a
+curve sampled every sixteenth note can usually be written with a small
+fraction of its samples. decimate() keeps the fewest points the
+Ramer-Douglas-Peucker method finds such that the lines between them stay
+within tolerance of every sample. Deviation is measured vertically, in
+parameter units, because that is what is heard; time and value have
+different units, so perpendicular distance would mean nothing.
+"""
+
+from typing import Sequence
+
+Point = tuple[float, float]
+
+# Default tolerance, as a fraction of the curve's value range
+DEFAULT_RELATIVE_TOLERANCE = 0.001
+
+
+def sample_points(values: Sequence[float], start: float, step: float) -> list[Point]:
+    """Points for values sampled every step beats from start"""
+    if step <= 0:
+        raise ValueError("Sample step must be positive")
+    return [(start + index * step, float(value)) for index, value in enumerate(values)]
+
+
+def check_points(points: Sequence[Sequence[float]]) -> list[Point]:
+    """Points as (time, value) tuples, with strictly increasing times"""
+    checked = [(float(time), float(value)) for time, value in points]
+    for before, after in zip(checked, checked[1:]):
+        if after[0] <= before[0]:
+            raise ValueError(
+                f"Automation times must increase (got {after[0]} after {before[0]})"
+            )
+    return checked
+
+
+def default_tolerance(points: Sequence[Point]) -> float:
+    """DEFAULT_RELATIVE_TOLERANCE of the value range (0 for a flat curve)"""
+    values = [value for _, value in points]
+    return (max(values) - min(values)) * DEFAULT_RELATIVE_TOLERANCE if values else 0.0
+
+
+def decimate(points: Sequence[Point], tolerance: float) -> list[Point]:
+    """
+    The breakpoints whose straight lines stay within tolerance of every point.
+
+    Iterative, so long curves don't hit the recursion limit. The first and
+    last points are always kept.
+    """
+    count = len(points)
+    if count <= 2:
+        return list(points)
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        t0, v0 = points[first]
+        t1, v1 = points[last]
+        slope = (v1 - v0) / (t1 - t0)
+        worst, worst_index = -1.0, first
+        for index in range(first + 1, last):
+            time, value = points[index]
+            error = abs(value - (v0 + slope * (time - t0)))
+            if error > worst:
+                worst, worst_index = error, index
+        if worst > tolerance:
+            keep[worst_index] = True
+            stack.append((first, worst_index))
+            stack.append((worst_index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def max_error(points: Sequence[Point], breakpoints: Sequence[Point]) -> float:
+    """Largest vertical distance between points and the breakpoints' lines"""
+    if len(breakpoints) < 2:
+        return 0.0
+    worst = 0.0
+    segment = 0
+    for time, value in points:
+        while segment < len(breakpoints) - 2 and breakpoints[segment + 1][0] < time:
+            segment += 1
+        (t0, v0), (t1, v1) = breakpoints[segment], breakpoints[segment + 1]
+        line = v0 + (v1 - v0) * (time - t0) / (t1 - t0)
+        worst = max(worst, abs(value - line))
+    return worst
@@ -0,0 +1,289 @@
+"""
+Shared bridge daemon: one Ableton connection for many MCP server processes.
+
+Every MCP client starts its own ``ableton-mcp`` process, and without the
+bridge each of them opens its own socket (and handler thread) inside Live.
+``ableton-mcp-bridge`` owns a single persistent connection, with its
+heartbeats, circuit breaker and response cache, and serves the Remote
+Script's own protocol on a local Unix socket::
+
+    ableton-mcp-bridge &
+    ableton-mcp          # attaches to the bridge when its socket exists
+
+MCP servers attach automatically when the bridge socket exists
+(``ABLETON_MCP_BRIDGE``, default ``/tmp/ableton-mcp-bridge-<uid>.sock``)
+and fall back to reaching Live directly when it doesn't answer. Set
+``ABLETON_MCP_BRIDGE`` to an empty string to never attach.
+"""
+
+import argparse
+import base64
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+from typing import Any
+
+from .connection import (
+    AbletonConnection,
+    AbletonUnavailableError,
+    CommandExpiredError,
+    ConnectionManager,
+    Endpoint,
+    default_bridge_path,
+)
+from .logs import configure_logging
+from .protocol import (
+    FRAME_HEADER,
+    MAX_FRAME_SIZE,
+    PROTOCOL_VERSION,
+    available_encodings,
+    decode_payload,
+    encode_frame,
+)
+from .tracing import tracer
+
+logger = logging.getLogger("AbletonMCPBridge")
+
+_json_decoder = json.JSONDecoder()
+
+
+class BridgeHandler(socketserver.BaseRequestHandler):
+    """Serves one attached MCP server, forwarding its commands upstream"""
+
+    server: "BridgeServer"
+
+    def setup(self):
+        self.framed = False
+        self.encoding = "json"
+        self.compress_threshold = 0
+        self.buffer = b""
+
+    def handle(self):
+        logger.info("MCP server attached")
+        try:
+            while True:
+                data = self.request.recv(65536)
+                if not data:
+                    break
+                self.buffer += data
+                while self.buffer:
+                    if self.framed:
+                        command = self._read_frame()
+                    else:
+                        command = self._read_legacy()
+                    if command is None:
+                        break
+                    was_framed = self.framed
+                    response = self.dispatch(command)
+                    # The hello reply itself still uses the legacy format
+                    if was_framed:
+                        payload = encode_frame(
+                            response, self.encoding, self.compress_threshold
+                        )
+                    else:
+                        payload = json.dumps(response).encode("utf-8")
+                    self.request.sendall(payload)
+        except (ConnectionError, OSError) as e:
+            logger.info(f"MCP server connection closed: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error serving MCP server: {str(e)}")
+        logger.info("MCP server detached")
+
+    def _read_legacy(self) -> dict[str, Any] | None:
+        try:
+            text = self.buffer.decode("utf-8")
+            command, end = _json_decoder.raw_decode(text)
+        except ValueError:
+            return None
+        self.buffer = text[end:].lstrip().encode("utf-8")
+        return command
+
+    def _read_frame(self) -> dict[str, Any] | None:
+        if len(self.buffer) < FRAME_HEADER.size:
+            return None
+        length, flags = FRAME_HEADER.unpack_from(self.buffer)
+        if length > MAX_FRAME_SIZE:
+            raise ValueError(f"Frame of {length} bytes exceeds the size limit")
+        end = FRAME_HEADER.size + length
+        if len(self.buffer) < end:
+            return None
+        payload = self.buffer[FRAME_HEADER.size : end]
+        self.buffer = self.buffer[end:]
+        return decode_payload(payload, flags)
+
+    def dispatch(self, command: dict[str, Any]) -> dict[str, Any]:
+        command_type = command.get("type", "")
+        params = command.get("params") or {}
+        if command_type == "hello":
+            return self.negotiate(params)
+
+        manager = self.server.manager
+        if command_type == "ping":
+            # Attached servers' heartbeats measure the bridge and report
+            # whether Live is reachable, without adding traffic inside Live
+            if manager.is_connected():
+                return {"status": "success", "result": {"pong": True}}
+            return {"status": "error", "message": manager._unavailable_message()}
+
+        deadline_ms = command.get("deadline_ms")
+        try:
+            upstream = manager.get_connection(self.server.connect_timeout)
+            with tracer.join(command.get("trace_id"), command.get("span_id")):
+                # Keeping the client's key lets its retries reach Live as
+                # retries, and its deadline keeps them inside its own timeout
+                result = upstream.send_command(
+                    command_type,
+                    _params_for(upstream, params),
+                    command.get("idempotency_key"),
+                    None if deadline_ms is None else deadline_ms / 1000,
+                )
+            return {"status": "success", "result": result}
+        except CommandExpiredError as e:
+            return {"status": "error", "message": str(e), "expired": True}
+        except AbletonUnavailableError as e:
+            return {"status": "error", "message": str(e)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    def negotiate(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Same handshake as the Remote Script, advertising Live's features"""
+        offered = params.get("encodings", ["json"])
+        encoding = "json"
+        if "msgpack" in offered and "msgpack" in available_encodings():
+            encoding = "msgpack"
+        compression = "zlib" if "zlib" in params.get("compression", []) else None
+        self.framed = True
+        self.encoding = encoding
+        self.compress_threshold = (
+            int(params.get("compress_threshold", 0)) if compression else 0
+        )
+        live = True
+        modifying = []
+        try:
+            upstream = self.server.manager.get_connection(0.5)
+            features = sorted(upstream.features)
+            modifying = sorted(upstream.modifying_commands)
+        except AbletonUnavailableError:
+            # Plain commands work with any Remote Script; "live": False has
+            # the client say hello again once pings show Live is back
+            features = []
+            live = False
+        return {
+            "status": "success",
+            "result": {
+                "protocol": PROTOCOL_VERSION,
+                "encoding": encoding,
+                "compression": compression,
+                "compress_threshold": self.compress_threshold,
+                "features": features,
+                "modifying_commands": modifying,
+                "bridge": True,
+                "live": live,
+            },
+        }
+
+
+def _params_for(upstream: AbletonConnection, params: dict[str, Any]) -> dict[str, Any]:
+    """Re-encode binary parameters (packed notes) when Live's link is JSON"""
+    if upstream.encoding == "msgpack":
+        return params
+    params = _base64_bytes(params)
+    if params.get("packed") == "bytes":
+        # Bytes can't cross a JSON link; unpack_notes reads either form
+        params = dict(params, packed="base64")
+    return params
+
+
+def _base64_bytes(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, dict):
+        return {key: _base64_bytes(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_base64_bytes(item) for item in value]
+    return value
+
+
+class BridgeServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server sharing one ConnectionManager between attached servers"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str,
+        manager: ConnectionManager,
+        connect_timeout: float = 5.0,
+    ):
+        self.manager = manager
+        self.connect_timeout = connect_timeout
+        self.socket_path = socket_path
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, BridgeHandler)
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def _remove_stale_socket(path: str):
+    """Remove a socket file left by a bridge that is no longer running"""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"Another bridge is already listening on {path}")
+
+
+def main():
+    endpoint = Endpoint.from_env(use_bridge=False)
+    parser = argparse.ArgumentParser(
+        description="Share one Ableton connection between MCP server processes"
+    )
+    parser.add_argument(
+        "--socket",
+        default=default_bridge_path(),
+        help="Unix socket for MCP servers to attach to (env ABLETON_MCP_BRIDGE)",
+    )
+    parser.add_argument("--ableton-host", default=endpoint.host)
+    parser.add_argument("--ableton-port", type=int, default=endpoint.port)
+    parser.add_argument("--ableton-socket", default=endpoint.socket_path or "")
+    args = parser.parse_args()
+
+    if not args.socket:
+        print("No bridge socket path (Unix sockets unavailable?)", file=sys.stderr)
+        sys.exit(1)
+
+    configure_logging()
+    manager = ConnectionManager(
+        Endpoint(
+            host=args.ableton_host,
+            port=args.ableton_port,
+            socket_path=args.ableton_socket or None,
+        )
+    )
+    manager.start()
+    server = BridgeServer(args.socket, manager)
+    logger.info(f"Bridge listening on {args.socket}, forwarding to {manager.endpoint}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        manager.stop()
+
+
+if __name__ == "__main__":
+    main()
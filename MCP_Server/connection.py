@@ -0,0 +1,1051 @@
+"""Socket connection to the Ableton Remote Script and its background manager."""
+
+import copy
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from .journal import journal
+from .logs import command_sampler, truncate
+from .protocol import (
+    DEFAULT_COMPRESS_THRESHOLD,
+    FRAME_HEADER,
+    MAX_FRAME_SIZE,
+    PROTOCOL_VERSION,
+    available_encodings,
+    decode_payload,
+    encode_frame,
+)
+from .stats import REMOTE_PHASES, BridgeStats, bridge_stats
+from .tracing import Span, new_id, tracer
+
+logger = logging.getLogger("AbletonMCPServer")
+
+# Commands that change Live's state, as in the Remote Script's
+# IDEMPOTENT_COMMANDS; Remote Scripts that send "modifying_commands" in their
+# hello reply override this per connection
+MODIFYING_COMMANDS = frozenset(
+    [
+        "create_midi_track",
+        "set_track_name",
+        "create_clip",
+        "add_notes_to_clip",
+        "set_clip_name",
+        "set_tempo",
+        "fire_clip",
+        "stop_clip",
+        "start_playback",
+        "stop_playback",
+        "load_browser_item",
+        "load_device_chain",
+        "apply_operations",
+        "delete_track",
+        "delete_clip",
+        "schedule_launch",
+        "cancel_launches",
+        "fire_scene",
+        "stop_scene",
+        "create_scene",
+        "duplicate_scene",
+        "capture_scene",
+        "edit_clip_grid",
+        "set_mixer_state",
+        "write_automation",
+    ]
+)
+
+# All attempts of a read share this many seconds (modifying commands share
+# AbletonConnection.command_timeout), split evenly between them until the
+# command has ADAPTIVE_MIN_SAMPLES round trips on this connection. After that
+# each attempt's timeout follows its observed latency within these bounds,
+# reads included: get_clip_notes waits on the main thread like any edit.
+READ_TIMEOUT = 10.0
+MIN_ATTEMPT_TIMEOUT = 1.0
+MAX_TIMEOUT = 60.0
+ADAPTIVE_MIN_SAMPLES = 20
+ADAPTIVE_P99_FACTOR = 4.0
+ADAPTIVE_MAX_FACTOR = 1.5
+# Extra wait past the deadline, so Live's "expired" answer arrives first
+DEADLINE_GRACE = 0.25
+
+# Read-only commands whose results ResponseCache may serve
+CACHEABLE_COMMANDS = frozenset(
+    [
+        "get_session_info",
+        "get_track_info",
+        "get_browser_tree",
+        "get_browser_items_at_path",
+        "get_browser_item",
+        "get_scenes",
+        "get_mixer_state",
+        "query_arrangement",
+        "get_arrangement_clips",
+        "get_clip_notes",
+    ]
+)
+
+# Commands that neither change the Live set nor need a cache entry
+_PASSIVE_COMMANDS = frozenset(["ping", "get_bridge_stats"])
+
+
+class ResponseCache:
+    """
+    Results of read-only commands, kept for ttl seconds.
+
+    Off unless ABLETON_MCP_CACHE_TTL (or ttl) is set. Any command that is
+    not known to be read-only clears the whole cache, so reads after a write
+    made through this server always hit Ableton. Each clear starts a new
+    generation, and a read that began before it can't store its (possibly
+    pre-write) result. Changes made in Live itself can be seen up to ttl
+    seconds late. Hits are copies, so callers can't change cached results.
+    """
+
+    def __init__(self, ttl: float | None = None):
+        if ttl is None:
+            ttl = float(os.environ.get("ABLETON_MCP_CACHE_TTL", 0.0))
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Take before sending a read; pass to put() with its result"""
+        return self._generation
+
+    @staticmethod
+    def _key(command_type: str, params: dict[str, Any] | None) -> str:
+        return command_type + json.dumps(params or {}, sort_keys=True)
+
+    def get(self, command_type: str, params: dict[str, Any] | None) -> Any | None:
+        if self.ttl <= 0:
+            return None
+        key = self._key(command_type, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        command_type: str,
+        params: dict[str, Any] | None,
+        result: Any,
+        generation: int | None = None,
+    ):
+        if self.ttl <= 0:
+            return
+        key = self._key(command_type, params)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return  # A write finished while this read was in flight
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(result))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "ttl_seconds": self.ttl,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 9877
+
+
+def default_socket_path() -> str | None:
+    """Per-user Unix socket path shared with the Remote Script (None off POSIX)"""
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"):
+        return None
+    return os.path.join("/tmp", f"ableton-mcp-{os.getuid()}.sock")
+
+
+def default_bridge_path() -> str | None:
+    """Unix socket of the shared bridge daemon (ABLETON_MCP_BRIDGE, "" to disable)"""
+    path = os.environ.get("ABLETON_MCP_BRIDGE")
+    if path is not None:
+        return path or None
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"):
+        return None
+    return os.path.join("/tmp", f"ableton-mcp-bridge-{os.getuid()}.sock")
+
+
+@dataclass
+class Endpoint:
+    """Where to reach a Remote Script: a Unix socket path, falling back to TCP"""
+
+    host: str = DEFAULT_HOST
+    port: int = DEFAULT_PORT
+    socket_path: str | None = None
+
+    @classmethod
+    def from_env(cls, use_bridge: bool = True) -> "Endpoint":
+        """
+        Read ABLETON_MCP_HOST, ABLETON_MCP_PORT and ABLETON_MCP_SOCKET.
+
+        ABLETON_MCP_SOCKET defaults to the shared bridge's socket when a
+        bridge is running, else to the per-user path when the host is local;
+        set it to an empty string to always use TCP. TCP always reaches Live
+        directly, so a bridge that has gone away is not a single point of
+        failure.
+        """
+        host = os.environ.get("ABLETON_MCP_HOST", DEFAULT_HOST)
+        socket_path = os.environ.get("ABLETON_MCP_SOCKET")
+        if socket_path is None and use_bridge:
+            bridge_path = default_bridge_path()
+            if bridge_path and os.path.exists(bridge_path):
+                socket_path = bridge_path
+        if socket_path is None and host in ("localhost", "127.0.0.1", "::1"):
+            socket_path = default_socket_path()
+        return cls(
+            host=host,
+            port=int(os.environ.get("ABLETON_MCP_PORT", DEFAULT_PORT)),
+            socket_path=socket_path or None,
+        )
+
+    def __str__(self) -> str:
+        tcp = f"{self.host}:{self.port}"
+        return f"unix:{self.socket_path} or {tcp}" if self.socket_path else tcp
+
+
+class AbletonUnavailableError(ConnectionError):
+    """Raised without touching the network while Ableton is known to be down"""
+
+
+class CommandExpiredError(Exception):
+    """Live dropped the command unstarted at its deadline; resending is safe"""
+
+
+@dataclass
+class AbletonConnection:
+    host: str
+    port: int
+    sock: socket.socket | None = None
+    socket_path: str | None = None
+    connect_timeout: float = 2.0
+    last_activity: float = 0.0
+    # Pause after state-modifying commands to give Ableton time to settle
+    settle_delay: float = 0.1
+    # Seconds all attempts of a modifying command share. They carry an
+    # idempotency key, so a timed-out one can be resent without running
+    # twice, and a resend of one still running waits for it (a large
+    # add_notes_to_clip or preset load can take several seconds)
+    command_timeout: float = 15.0
+    max_attempts: int = 3
+    # "json" and "msgpack" negotiate framing via hello; "legacy" skips it
+    preferred_encoding: str = field(
+        default_factory=lambda: os.environ.get("ABLETON_MCP_ENCODING", "json")
+    )
+    compress_threshold: int = field(
+        default_factory=lambda: int(
+            os.environ.get(
+                "ABLETON_MCP_COMPRESS_THRESHOLD", DEFAULT_COMPRESS_THRESHOLD
+            )
+        )
+    )
+    transport: str | None = field(default=None, init=False)
+    framed: bool = field(default=False, init=False)
+    encoding: str = field(default="json", init=False)
+    features: frozenset[str] = field(default=frozenset(), init=False)
+    modifying_commands: frozenset[str] = field(
+        default=MODIFYING_COMMANDS, init=False
+    )
+    # Attached to the bridge daemon, which caches and settles for all clients
+    via_bridge: bool = field(default=False, init=False)
+    # The bridge answered hello while Live was down, so features are unknown
+    features_pending: bool = field(default=False, init=False)
+    bytes_sent: int = field(default=0, init=False)
+    bytes_received: int = field(default=0, init=False)
+    stats: BridgeStats = field(default_factory=lambda: bridge_stats, repr=False)
+    # This connection's own round trips, which its timeouts follow; stats is
+    # shared by every instance's connection, so a slow Live would slow them all
+    latency: BridgeStats = field(default_factory=BridgeStats, repr=False)
+    cache: ResponseCache | None = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _connect_unix(self) -> socket.socket | None:
+        """Try the Unix domain socket; None means fall back to TCP"""
+        if not self.socket_path or not hasattr(socket, "AF_UNIX"):
+            return None
+        if not os.path.exists(self.socket_path):
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.connect_timeout)
+            sock.connect(self.socket_path)
+            return sock
+        except OSError as e:
+            logger.warning(
+                f"Unix socket {self.socket_path} unavailable ({str(e)}), using TCP"
+            )
+            sock.close()
+            return None
+
+    def connect(self) -> bool:
+        """
+        Connect to the Ableton Remote Script socket server.
+
+        Holds the connection lock, like every round trip, so concurrent tool
+        calls never replace a socket another thread is using.
+        """
+        with self._lock:
+            if self.sock:
+                return True
+
+            try:
+                self.sock = self._connect_unix()
+                if self.sock:
+                    self.transport = "unix"
+                    logger.info(f"Connected to Ableton at unix:{self.socket_path}")
+                else:
+                    self.sock = socket.create_connection(
+                        (self.host, self.port), timeout=self.connect_timeout
+                    )
+                    # Commands are small request/response pairs; don't batch them
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    self.transport = "tcp"
+                    logger.info(f"Connected to Ableton at {self.host}:{self.port}")
+                self.last_activity = time.monotonic()
+                self._handshake()
+                return True
+            except Exception as e:
+                logger.error(f"Failed to connect to Ableton: {str(e)}")
+                self._close()
+                return False
+
+    def _handshake(self):
+        """
+        Negotiate framing, encoding and compression with the Remote Script.
+
+        Also run again over an established frame link to the bridge, to pick
+        up Live's features once it is reachable. The caller holds _lock.
+        """
+        if self.preferred_encoding == "legacy":
+            return
+
+        encodings = ["json"]
+        if self.preferred_encoding == "msgpack":
+            encodings = available_encodings()
+        offer = {
+            "protocol": PROTOCOL_VERSION,
+            "encodings": encodings,
+            "compression": ["zlib"] if self.compress_threshold else [],
+            "compress_threshold": self.compress_threshold,
+        }
+        response = self._exchange(
+            {"type": "hello", "params": offer}, self.connect_timeout
+        )
+        if response.get("status") != "success":
+            # Older Remote Scripts don't know hello; keep the legacy protocol
+            logger.info("Remote Script does not support framing, using plain JSON")
+            return
+
+        result = response.get("result", {})
+        self.framed = True
+        self.encoding = result.get("encoding", "json")
+        self.features = frozenset(result.get("features", []))
+        if result.get("modifying_commands"):
+            # Straight from the Remote Script's dispatch table
+            self.modifying_commands = frozenset(result["modifying_commands"])
+        self.via_bridge = bool(result.get("bridge"))
+        self.features_pending = self.via_bridge and not result.get("live", True)
+        logger.info(
+            f"Negotiated {self.encoding} frames "
+            f"(compression: {result.get('compression') or 'off'})"
+        )
+
+    def disconnect(self):
+        """Disconnect from the Ableton Remote Script"""
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        """Close the socket; the caller holds _lock"""
+        if self.sock:
+            try:
+                self.sock.close()
+            except Exception as e:
+                logger.error(f"Error disconnecting from Ableton: {str(e)}")
+            finally:
+                self.sock = None
+                self.framed = False
+                self.encoding = "json"
+                self.features = frozenset()
+                self.modifying_commands = MODIFYING_COMMANDS
+                self.via_bridge = False
+                self.features_pending = False
+
+    @property
+    def connected(self) -> bool:
+        return self.sock is not None
+
+    def receive_full_response(self, sock, buffer_size=8192, timeout=15.0):
+        """Receive the complete response, potentially in multiple chunks"""
+        chunks = []
+        sock.settimeout(timeout)
+
+        try:
+            while True:
+                try:
+                    chunk = sock.recv(buffer_size)
+                    if not chunk:
+                        if not chunks:
+                            raise ConnectionError(
+                                "Connection closed before receiving any data"
+                            )
+                        break
+
+                    chunks.append(chunk)
+
+                    # Check if we've received a complete JSON object
+                    try:
+                        data = b"".join(chunks)
+                        json.loads(data.decode("utf-8"))
+                        logger.debug(f"Received complete response ({len(data)} bytes)")
+                        return data
+                    except json.JSONDecodeError:
+                        # Incomplete JSON, continue receiving
+                        continue
+                except socket.timeout:
+                    logger.warning("Socket timeout during chunked receive")
+                    break
+                except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
+                    logger.error(f"Socket connection error during receive: {str(e)}")
+                    raise
+        except Exception as e:
+            logger.error(f"Error during receive: {str(e)}")
+            raise
+
+        # If we get here, we either timed out or broke out of the loop; a
+        # timeout is raised as one so that the command is retried
+        if chunks:
+            data = b"".join(chunks)
+            logger.debug(f"Returning data after receive completion ({len(data)} bytes)")
+            try:
+                json.loads(data.decode("utf-8"))
+                return data
+            except json.JSONDecodeError:
+                raise socket.timeout("Incomplete JSON response received")
+        else:
+            raise socket.timeout("No data received")
+
+    def _receive_frame(self) -> tuple[bytes, int, float]:
+        """
+        Receive one length-prefixed frame.
+
+        Returns the raw payload, the header flags and the perf_counter time at
+        which the first bytes arrived.
+        """
+        sock = self.sock
+        if sock is None:
+            raise ConnectionError("Not connected to Ableton")
+        # Small replies usually arrive whole in the first read
+        data = sock.recv(65536)
+        first_byte = time.perf_counter()
+        while len(data) < FRAME_HEADER.size:
+            chunk = sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("Connection closed mid-frame")
+            data += chunk
+        length, flags = FRAME_HEADER.unpack_from(data)
+        if length > MAX_FRAME_SIZE:
+            raise ConnectionError(f"Frame of {length} bytes exceeds the size limit")
+
+        end = FRAME_HEADER.size + length
+        if len(data) < end:
+            buffer = bytearray(end)
+            buffer[: len(data)] = data
+            view = memoryview(buffer)
+            received = len(data)
+            while received < end:
+                count = sock.recv_into(view[received:])
+                if not count:
+                    raise ConnectionError("Connection closed mid-frame")
+                received += count
+            data = bytes(buffer)
+        self.bytes_received += end
+        # Replies are strictly one per request, so nothing follows the frame
+        return data[FRAME_HEADER.size : end], flags, first_byte
+
+    def _roundtrip(
+        self,
+        command: dict[str, Any],
+        timeout: float,
+        timings: dict[str, float] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Send one command envelope and return the parsed response envelope.
+
+        When a timings dict is passed, the duration of each client-side phase
+        (encode, send, wait, receive, decode) is stored in it. A failed round
+        trip closes the socket before the lock is released, so no other thread
+        can read the late reply meant for this one.
+        """
+        with self._lock:
+            try:
+                return self._exchange(command, timeout, timings)
+            except Exception:
+                self._close()
+                raise
+
+    def _exchange(
+        self,
+        command: dict[str, Any],
+        timeout: float,
+        timings: dict[str, float] | None = None,
+    ) -> dict[str, Any]:
+        """One request and reply on the current socket; the caller holds _lock"""
+        if not self.sock:
+            raise Exception("Not connected to Ableton")
+        self.sock.settimeout(timeout)
+        start = time.perf_counter()
+        if self.framed:
+            data = encode_frame(command, self.encoding, self.compress_threshold)
+            encoded = time.perf_counter()
+            self.sock.sendall(data)
+            sent = time.perf_counter()
+            self.bytes_sent += len(data)
+            payload, flags, first_byte = self._receive_frame()
+            received = time.perf_counter()
+            response = decode_payload(payload, flags)
+        else:
+            data = json.dumps(command).encode("utf-8")
+            encoded = time.perf_counter()
+            self.sock.sendall(data)
+            sent = time.perf_counter()
+            self.bytes_sent += len(data)
+            response_data = self.receive_full_response(self.sock, timeout=timeout)
+            # The legacy reader parses as it goes, so waiting and
+            # receiving can't be told apart
+            first_byte = received = time.perf_counter()
+            self.bytes_received += len(response_data)
+            response = json.loads(response_data.decode("utf-8"))
+        decoded = time.perf_counter()
+        self.last_activity = time.monotonic()
+        if timings is not None:
+            timings["encode"] = encoded - start
+            timings["send"] = sent - encoded
+            timings["wait"] = first_byte - sent
+            timings["receive"] = received - first_byte
+            timings["decode"] = decoded - received
+        return response
+
+    def ping(self, timeout: float = 2.0) -> float:
+        """Send a lightweight ping frame and return the round-trip time in seconds"""
+        start = time.perf_counter()
+        try:
+            response = self._roundtrip({"type": "ping", "params": {}}, timeout)
+            # Unframed (older) Remote Scripts may not know ping, and any reply
+            # proves them alive; framed peers answer it, and the bridge
+            # answers with an error while Live is unreachable
+            if self.framed and response.get("status") != "success":
+                raise ConnectionError(response.get("message", "Ping failed"))
+            rtt = time.perf_counter() - start
+            if self.features_pending:
+                with self._lock:
+                    self._handshake()
+        except Exception:
+            self.disconnect()
+            raise
+        return rtt
+
+    def send_command(
+        self,
+        command_type: str,
+        params: dict[str, Any] | None = None,
+        idempotency_key: str | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, Any]:
+        """
+        Send a command to Ableton and return the response.
+
+        idempotency_key defaults to a fresh key per call; pass one to make a
+        call count as a retry of an earlier one (the bridge forwards its
+        clients' keys this way). deadline caps the seconds spent on all
+        attempts; when it passes first, CommandExpiredError is raised.
+        """
+        # Behind the bridge, a client cache would hide other clients' writes
+        cache = None if self.via_bridge else self.cache
+        if cache is None or command_type in _PASSIVE_COMMANDS:
+            return self._traced_command(command_type, params, idempotency_key, deadline)
+
+        if command_type in CACHEABLE_COMMANDS:
+            result = cache.get(command_type, params)
+            if result is None:
+                generation = cache.generation
+                result = self._traced_command(
+                    command_type, params, idempotency_key, deadline
+                )
+                cache.put(command_type, params, result, generation)
+            return result
+
+        # Anything else may change the set, even when it fails part-way
+        try:
+            return self._traced_command(command_type, params, idempotency_key, deadline)
+        finally:
+            cache.clear()
+
+    def _traced_command(
+        self,
+        command_type: str,
+        params: dict[str, Any] | None,
+        idempotency_key: str | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, Any]:
+        with tracer.span(f"send_command:{command_type}", cat="bridge") as span:
+            if not journal.enabled:
+                return self._send_command(
+                    command_type, params, span, idempotency_key, deadline
+                )
+
+            started = time.time()
+            try:
+                result = self._send_command(
+                    command_type, params, span, idempotency_key, deadline
+                )
+            except Exception as e:
+                journal.record(
+                    command_type,
+                    params,
+                    {"status": "error", "message": str(e)},
+                    started,
+                    span.trace_id,
+                )
+                raise
+            journal.record(
+                command_type,
+                params,
+                {"status": "success", "result": result},
+                started,
+                span.trace_id,
+            )
+            return result
+
+    def _send_command(
+        self,
+        command_type: str,
+        params: dict[str, Any] | None,
+        span: Span,
+        idempotency_key: str | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, Any]:
+        # "timing" asks the Remote Script to report its queue and execution
+        # times; the trace IDs tie its log lines and spans to this call
+        command = {
+            "type": command_type,
+            "params": params or {},
+            "timing": True,
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+        }
+        if tracer.enabled:
+            command["trace"] = True
+
+        # Check if this is a state-modifying command
+        is_modifying_command = command_type in self.modifying_commands
+        if command_type not in _PASSIVE_COMMANDS:
+            # The Remote Script runs a modifying command at most once per key
+            command["idempotency_key"] = idempotency_key or new_id()
+
+        # Per-command logging is sampled and never serializes the full payload
+        log_this = logger.isEnabledFor(logging.DEBUG) and command_sampler(command_type)
+        if log_this:
+            logger.debug(
+                f"Sending command: {command_type}",
+                extra={
+                    "fields": {
+                        "trace": span.trace_id,
+                        "params": truncate(params),
+                    }
+                },
+            )
+
+        attempt_timeout = self.timeout_for(command_type)
+        total = self.command_timeout if is_modifying_command else READ_TIMEOUT
+        # Attempts share one deadline, so a stuck main thread fails the call
+        # in about as long as a single wait would, however often it retries
+        give_up = time.perf_counter() + max(total, attempt_timeout)
+        cutoff = None if deadline is None else time.perf_counter() + deadline
+        for attempt in range(1, self.max_attempts + 1):
+            # The Remote Script drops the command if it is still queued when
+            # the attempt's deadline passes
+            now = time.perf_counter()
+            if cutoff is not None and cutoff <= now:
+                raise CommandExpiredError(
+                    f"{command_type} expired before Ableton answered"
+                )
+            if give_up <= now:
+                logger.error(f"Giving up on {command_type}: out of time")
+                raise Exception("Timeout waiting for Ableton response")
+            budget = min(attempt_timeout, give_up - now)
+            if cutoff is not None:
+                # A caller's deadline (a bridge client's) bounds every attempt
+                budget = min(budget, cutoff - now)
+            command["deadline_ms"] = round(budget * 1000)
+            try:
+                response = self._attempt(
+                    command, budget + DEADLINE_GRACE, span, log_this
+                )
+            except (socket.timeout, ConnectionError) as e:
+                # Timeouts and dropped connections: reconnect and resend
+                self.disconnect()
+                if attempt == self.max_attempts:
+                    logger.error(f"Giving up on {command_type}: {str(e)}")
+                    if isinstance(e, socket.timeout):
+                        raise Exception("Timeout waiting for Ableton response")
+                    raise Exception(f"Connection to Ableton lost: {str(e)}")
+                logger.warning(
+                    f"Retrying {command_type} (attempt {attempt + 1} of "
+                    f"{self.max_attempts}) after: {str(e) or type(e).__name__}"
+                )
+                time.sleep(0.05 * 2**attempt)
+                continue
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON response from Ableton: {str(e)}")
+                self.disconnect()
+                raise Exception(f"Invalid response from Ableton: {str(e)}")
+            except Exception as e:
+                logger.error(f"Error communicating with Ableton: {str(e)}")
+                self.disconnect()
+                raise Exception(f"Communication error with Ableton: {str(e)}")
+
+            if response.get("expired") and attempt < self.max_attempts:
+                # Live dropped it unstarted, so resending is safe
+                logger.warning(
+                    f"Retrying {command_type} (attempt {attempt + 1} of "
+                    f"{self.max_attempts}) after: {response.get('message')}"
+                )
+                continue
+            break
+
+        if response.get("expired"):
+            raise CommandExpiredError(response.get("message", "Command expired"))
+        # An error reported by the Remote Script leaves the socket usable
+        if response.get("status") == "error":
+            logger.error(
+                f"Ableton error: {response.get('message')} [trace {span.trace_id}]"
+            )
+            raise Exception(response.get("message", "Unknown error from Ableton"))
+
+        # For state-modifying commands, add a small delay to give Ableton time
+        # to settle (the bridge already waits it out on its own link)
+        if is_modifying_command and self.settle_delay and not self.via_bridge:
+            time.sleep(self.settle_delay)
+
+        return response.get("result", {})
+
+    def timeout_for(self, command_type: str) -> float:
+        """
+        Per-attempt timeout for a command, from its observed latency.
+
+        Until enough samples exist, each attempt gets an equal share of the
+        command's total (command_timeout, or READ_TIMEOUT for reads). After
+        that the timeout is a multiple of the p99 (or of the slowest call
+        seen) on this connection, so a stuck fire_clip or get_clip_notes
+        fails in a few seconds while a heavy preset load still gets the time
+        it needs.
+        """
+        summary = self.latency.summary(command_type, "total")
+        if summary is None or summary["count"] < ADAPTIVE_MIN_SAMPLES:
+            if command_type in self.modifying_commands:
+                return self.command_timeout / self.max_attempts
+            return READ_TIMEOUT / self.max_attempts
+        observed = max(
+            summary["p99_ms"] / 1000 * ADAPTIVE_P99_FACTOR,
+            summary["max_ms"] / 1000 * ADAPTIVE_MAX_FACTOR,
+        )
+        return min(max(observed, MIN_ATTEMPT_TIMEOUT), MAX_TIMEOUT)
+
+    def _attempt(
+        self, command: dict[str, Any], timeout: float, span: Span, log_this: bool
+    ) -> dict[str, Any]:
+        """One round trip, reconnecting first if the socket was dropped"""
+        if not self.sock and not self.connect():
+            raise ConnectionError("Not connected to Ableton")
+        command_type = command["type"]
+        start = time.perf_counter()
+        timings: dict[str, float] = {}
+        response = self._roundtrip(command, timeout, timings)
+        timings["total"] = time.perf_counter() - start
+        self._record_timings(command_type, timings, response.get("timings"))
+        if "spans" in response:
+            tracer.emit_remote(response["spans"], "Ableton Remote Script")
+        if log_this:
+            logger.debug(
+                f"Response for {command_type}",
+                extra={
+                    "fields": {
+                        "trace": span.trace_id,
+                        "status": response.get("status", "unknown"),
+                        "ms": round(timings["total"] * 1000, 3),
+                        "replayed": response.get("replayed", False),
+                    }
+                },
+            )
+        return response
+
+    def _record_timings(
+        self,
+        command_type: str,
+        timings: dict[str, float],
+        remote: dict[str, float] | None,
+    ):
+        """Feed one command's phase timings into the latency histograms"""
+        self.latency.record(command_type, "total", timings["total"])
+        for phase, seconds in timings.items():
+            self.stats.record(command_type, phase, seconds)
+        if remote:
+            remote_total = 0.0
+            for phase in REMOTE_PHASES:
+                if phase in remote:
+                    self.stats.record(command_type, phase, remote[phase])
+                    remote_total += remote[phase]
+            # Whatever part of the wait the script didn't account for was
+            # spent in the socket layers and the script's I/O thread
+            self.stats.record(
+                command_type, "transport", max(0.0, timings["wait"] - remote_total)
+            )
+
+
+class ConnectionManager:
+    """
+    Keeps one AbletonConnection warm from a background thread.
+
+    The thread pings the Remote Script while the link is idle, reconnects with
+    exponential backoff when it drops, and opens a circuit breaker after
+    repeated failures. While the breaker is open get_connection() raises
+    AbletonUnavailableError straight away instead of retrying inline.
+    """
+
+    def __init__(
+        self,
+        endpoint: Endpoint | None = None,
+        heartbeat_interval: float = 5.0,
+        ping_timeout: float = 2.0,
+        failure_threshold: int = 3,
+        backoff_initial: float = 0.1,
+        backoff_max: float = 10.0,
+        cache_ttl: float | None = None,
+    ):
+        self.endpoint = endpoint or Endpoint.from_env()
+        self.heartbeat_interval = heartbeat_interval
+        self.ping_timeout = ping_timeout
+        self.failure_threshold = failure_threshold
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        # Outlives individual connections; reads stay cached across reconnects
+        self.cache = ResponseCache(cache_ttl)
+
+        self._conn: AbletonConnection | None = None
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._running = False
+        self._failures = 0
+        self._next_attempt = 0.0
+        self._last_error: str | None = None
+        self._last_rtt: float | None = None
+        self._connected_since: float | None = None
+
+    # Public API
+
+    def start(self):
+        """Start the background thread (idempotent)"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._run, name="ableton-connection", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and close the connection"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(2.0)
+        self._thread = None
+        if self._conn:
+            logger.info("Disconnecting from Ableton on shutdown")
+            self._conn.disconnect()
+            self._conn = None
+
+    @property
+    def circuit_open(self) -> bool:
+        return self._failures >= self.failure_threshold
+
+    def is_connected(self) -> bool:
+        return self._conn is not None and self._conn.connected
+
+    def get_connection(self, timeout: float = 2.0) -> AbletonConnection:
+        """
+        Return the live connection, waiting up to timeout for a reconnect.
+
+        Fails immediately while the circuit breaker is open.
+        """
+        self.start()
+        if self.is_connected():
+            return self._conn  # type: ignore[return-value]
+
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            # A connection that just dropped should be retried right away
+            if not self.circuit_open:
+                self._next_attempt = 0.0
+                self._cond.notify_all()
+            while not self.is_connected():
+                if self.circuit_open:
+                    raise AbletonUnavailableError(self._unavailable_message())
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise AbletonUnavailableError(self._unavailable_message())
+                self._cond.wait(remaining)
+        return self._conn  # type: ignore[return-value]
+
+    def status(self) -> dict[str, Any]:
+        """Describe the connection state for diagnostics"""
+        now = time.monotonic()
+        if self.is_connected():
+            state = "connected"
+        elif self.circuit_open:
+            state = "circuit_open"
+        else:
+            state = "connecting"
+        return {
+            "state": state,
+            "endpoint": str(self.endpoint),
+            "transport": self._conn.transport if self._conn else None,
+            "consecutive_failures": self._failures,
+            "last_error": self._last_error,
+            "retry_in_seconds": round(max(0.0, self._next_attempt - now), 3),
+            "last_ping_ms": (
+                round(self._last_rtt * 1000, 3) if self._last_rtt is not None else None
+            ),
+            "connected_for_seconds": (
+                round(now - self._connected_since, 1)
+                if self._connected_since is not None and state == "connected"
+                else None
+            ),
+            "cache": self.cache.stats(),
+        }
+
+    # Background thread
+
+    def _unavailable_message(self) -> str:
+        status = self.status()
+        return (
+            f"Ableton is unreachable at {status['endpoint']} "
+            f"({status['state']}, {status['consecutive_failures']} failed attempts, "
+            f"last error: {status['last_error']}, "
+            f"next retry in {status['retry_in_seconds']}s). "
+            "Make sure the Remote Script is running."
+        )
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                if self.is_connected():
+                    wait = self.heartbeat_interval
+                else:
+                    wait = self._next_attempt - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    if not self._running:
+                        return
+                    if not self.is_connected() and time.monotonic() < self._next_attempt:
+                        continue
+
+            if self.is_connected():
+                self._heartbeat()
+            else:
+                self._attempt_connect()
+
+    def _heartbeat(self):
+        conn = self._conn
+        if conn is None:
+            return
+        # Traffic from tool calls already proves the link is alive
+        if (
+            conn._lock.locked()
+            or time.monotonic() - conn.last_activity < self.heartbeat_interval
+        ):
+            return
+        try:
+            self._last_rtt = conn.ping(self.ping_timeout)
+        except Exception as e:
+            logger.warning(f"Heartbeat to Ableton failed: {str(e)}")
+            with self._cond:
+                self._last_error = str(e)
+                self._connected_since = None
+                self._next_attempt = 0.0
+                self._cond.notify_all()
+
+    def _attempt_connect(self):
+        # Reconnect the one connection in place: tool calls may still hold it
+        # (and reconnect it inline), and a second object would mean a second
+        # socket and heartbeat
+        conn = self._conn
+        if conn is None:
+            conn = AbletonConnection(
+                host=self.endpoint.host,
+                port=self.endpoint.port,
+                socket_path=self.endpoint.socket_path,
+                cache=self.cache,
+            )
+        error = None
+        if conn.connect():
+            try:
+                self._last_rtt = conn.ping(self.ping_timeout)
+            except Exception as e:
+                error = f"Connection validation failed: {str(e)}"
+        else:
+            error = "Connection refused or timed out"
+
+        with self._cond:
+            if error is None:
+                logger.info("Persistent connection to Ableton established")
+                # Live may have changed while we were away
+                self.cache.clear()
+                self._conn = conn
+                self._failures = 0
+                self._last_error = None
+                self._connected_since = time.monotonic()
+            else:
+                conn.disconnect()
+                self._failures += 1
+                self._last_error = error
+                backoff = min(
+                    self.backoff_max,
+                    self.backoff_initial * (2 ** (self._failures - 1)),
+                )
+                # Jitter keeps several servers from retrying in lockstep
+                backoff *= random.uniform(0.8, 1.2)
+                self._next_attempt = time.monotonic() + backoff
+                if self._failures == self.failure_threshold:
+                    logger.error(
+                        "Failed to connect to Ableton after multiple attempts; "
+                        "failing fast until it comes back"
+                    )
+            self._cond.notify_all()
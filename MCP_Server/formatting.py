@@ -0,0 +1,227 @@
+"""Output formatting for the read tools.
+
+Every formatter writes into a ``TextWriter`` which collects fragments in a
+list and joins them once, so building a response is linear in its size.
+"""
+
+import json
+from typing import Any
+
+# Supported values for the ``output_format`` tool parameter
+OUTPUT_FORMATS = ("json", "pretty", "table", "summary")
+
+DEFAULT_SUMMARY_CHARS = 4000
+
+
+class TextWriter:
+    """Append-only text buffer with an optional size budget"""
+
+    def __init__(self, budget: int | None = None):
+        self._parts: list[str] = []
+        self._size = 0
+        self.budget = budget
+        self.truncated = False
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def write(self, text: str) -> bool:
+        """Append text; returns False once the budget would be exceeded"""
+        if self.truncated:
+            return False
+        if self.budget is not None and self._size + len(text) > self.budget:
+            self.truncated = True
+            return False
+        self._parts.append(text)
+        self._size += len(text)
+        return True
+
+    def force(self, text: str):
+        """Append text regardless of the budget (used for truncation markers)"""
+        self._parts.append(text)
+        self._size += len(text)
+
+    def getvalue(self) -> str:
+        return "".join(self._parts)
+
+
+def dumps_compact(result: Any) -> str:
+    """Serialize a result as JSON without insignificant whitespace"""
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+
+
+def _cell(value: Any) -> str:
+    """Render a scalar (or small nested value) as a single table cell"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return value.replace("\t", " ").replace("\n", " ")
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return dumps_compact(value)
+
+
+def _flatten(row: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flatten nested dicts into dotted column names"""
+    flat: dict[str, Any] = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def _is_table(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and bool(value)
+        and all(isinstance(item, dict) for item in value)
+    )
+
+
+def _column_rows(value: Any) -> list[dict[str, Any]] | None:
+    """
+    Rows of a columnar result such as {"name": [...], "volume": [...]}.
+
+    A column holding lists (one per send, say) becomes one column per list.
+    Returns None when value isn't a dict of equally long lists.
+    """
+    if not isinstance(value, dict) or not value:
+        return None
+    columns: dict[str, list[Any]] = {}
+    for key, items in value.items():
+        if not isinstance(items, list) or _is_table(items):
+            return None
+        if items and all(isinstance(item, list) for item in items):
+            for position, inner in enumerate(items):
+                columns[f"{key}.{position}"] = inner
+        elif items:
+            columns[key] = items
+    lengths = {len(items) for items in columns.values()}
+    if len(lengths) > 1:
+        return None
+    count = lengths.pop() if lengths else 0
+    return [{key: items[row] for key, items in columns.items()} for row in range(count)]
+
+
+def write_table(writer: TextWriter, name: str, rows: list[dict[str, Any]]) -> bool:
+    """Write a list of dicts as a header line plus one tab-separated line per row"""
+    flat_rows = [_flatten(row) for row in rows]
+    columns: dict[str, None] = {}
+    for row in flat_rows:
+        for key in row:
+            columns.setdefault(key, None)
+    # A nested dict that is None in some rows would otherwise get its own column
+    for key in [key for key in columns if "." in key]:
+        columns.pop(key.rsplit(".", 1)[0], None)
+
+    if not writer.write(f"[{name}] {len(rows)} rows\n"):
+        return False
+    if not writer.write("\t".join(columns) + "\n"):
+        return False
+    for written, row in enumerate(flat_rows):
+        line = "\t".join(_cell(row.get(column)) for column in columns) + "\n"
+        if not writer.write(line):
+            writer.force(f"... [{len(rows) - written} more rows truncated]\n")
+            return False
+    return True
+
+
+def write_tabular(writer: TextWriter, result: Any) -> None:
+    """
+    Write a result as ``key<TAB>value`` lines followed by one table per list
+    of dicts or per dict of columns
+    """
+    if _is_table(result):
+        write_table(writer, "items", result)
+        return
+    rows = _column_rows(result)
+    if rows is not None:
+        write_table(writer, "items", rows)
+        return
+    if not isinstance(result, dict):
+        writer.write(_cell(result) + "\n")
+        return
+
+    tables = {}
+    for key, value in result.items():
+        rows = value if _is_table(value) else _column_rows(value)
+        if rows is not None:
+            tables[key] = rows
+    scalars = {k: v for k, v in result.items() if k not in tables}
+    for key, value in _flatten(scalars).items():
+        if not writer.write(f"{key}\t{_cell(value)}\n"):
+            return
+    for key, rows in tables.items():
+        if not write_table(writer, key, rows):
+            return
+
+
+def format_result(
+    result: Any,
+    output_format: str = "json",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
+    """Format a command result for returning from a tool"""
+    if output_format == "json":
+        return dumps_compact(result)
+    if output_format == "pretty":
+        return json.dumps(result, indent=2)
+    if output_format in ("table", "summary"):
+        writer = TextWriter(max_chars if output_format == "summary" else None)
+        write_tabular(writer, result)
+        if writer.truncated:
+            writer.force(f"[output truncated to {max_chars} chars]\n")
+        return writer.getvalue()
+    raise ValueError(
+        f"Unknown output format '{output_format}'. "
+        f"Expected one of: {', '.join(OUTPUT_FORMATS)}"
+    )
+
+
+def format_browser_tree(
+    result: dict[str, Any],
+    category_type: str,
+    output_format: str = "tree",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
+    """
+    Format a browser tree as an indented outline.
+
+    ``tree`` writes the full outline, ``summary`` the same outline cut off at
+    ``max_chars``; any other format is handed to format_result.
+    """
+    if output_format not in ("tree", "summary"):
+        return format_result(result, output_format, max_chars)
+
+    writer = TextWriter(max_chars if output_format == "summary" else None)
+    total_folders = result.get("total_folders", 0)
+    writer.write(
+        f"Browser tree for '{category_type}' (showing {total_folders} folders):\n\n"
+    )
+
+    # Walk the tree with an explicit stack instead of concatenating recursively
+    for category in result.get("categories", []):
+        stack = [(category, 0)]
+        while stack:
+            item, indent = stack.pop()
+            if not item:
+                continue
+            line = f"{'  ' * indent}• {item.get('name', 'Unknown')}"
+            path = item.get("path", "")
+            if path:
+                line += f" (path: {path})"
+            if item.get("has_more", False):
+                line += " [...]"
+            if not writer.write(line + "\n"):
+                writer.force(f"... [output truncated to {max_chars} chars]\n")
+                return writer.getvalue()
+            children = item.get("children", [])
+            stack.extend((child, indent + 1) for child in reversed(children))
+        writer.write("\n")
+
+    return writer.getvalue()
@@ -0,0 +1,149 @@
+"""
+Named Ableton instances behind one MCP server.
+
+ABLETON_MCP_INSTANCES (or ``--instances``) lists the rig as comma-separated
+``name=host:port`` pairs; the port defaults to 9877::
+
+    ABLETON_MCP_INSTANCES="main=studio-a.local:9877,booth=10.0.0.7"
+
+Named instances are reached over TCP. Without the variable there is a single
+instance called "default", configured by ABLETON_MCP_HOST, ABLETON_MCP_PORT
+and ABLETON_MCP_SOCKET. Each instance has its own ConnectionManager, and with
+it its own connection, health state and response cache.
+"""
+
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from .connection import (
+    DEFAULT_PORT,
+    AbletonConnection,
+    ConnectionManager,
+    Endpoint,
+)
+
+DEFAULT_INSTANCE = "default"
+
+# Instance selected by the tool call being served (None: the default)
+current_instance: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "ableton_instance", default=None
+)
+
+
+def parse_instances(spec: str) -> dict[str, Endpoint]:
+    """Parse "name=host:port,..." into endpoints, keeping order"""
+    endpoints: dict[str, Endpoint] = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, address = entry.partition("=")
+        name, address = name.strip(), address.strip()
+        if not sep or not name or not address:
+            raise ValueError(f"Invalid instance '{entry}', expected name=address")
+        if name in endpoints:
+            raise ValueError(f"Duplicate instance name '{name}'")
+        host, _, port = address.partition(":")
+        endpoints[name] = Endpoint(host=host, port=int(port) if port else DEFAULT_PORT)
+    if not endpoints:
+        raise ValueError("No instances configured")
+    return endpoints
+
+
+class InstanceRegistry:
+    """ConnectionManagers by instance name; the first one is the default"""
+
+    def __init__(self, endpoints: dict[str, Endpoint] | None = None):
+        self.managers: dict[str, ConnectionManager] = {}
+        self._pool: ThreadPoolExecutor | None = None
+        self.configure(endpoints or self.endpoints_from_env())
+
+    @staticmethod
+    def endpoints_from_env() -> dict[str, Endpoint]:
+        spec = os.environ.get("ABLETON_MCP_INSTANCES")
+        if spec:
+            return parse_instances(spec)
+        return {DEFAULT_INSTANCE: Endpoint.from_env()}
+
+    def configure(self, endpoints: dict[str, Endpoint], cache_ttl: float | None = None):
+        """Replace the rig, closing the connections of the previous one"""
+        self.stop()
+        self.managers = {
+            name: ConnectionManager(endpoint, cache_ttl=cache_ttl)
+            for name, endpoint in endpoints.items()
+        }
+
+    @property
+    def default(self) -> str:
+        return next(iter(self.managers))
+
+    def names(self) -> list[str]:
+        return list(self.managers)
+
+    def manager(self, name: str | None = None) -> ConnectionManager:
+        """The manager for an instance; None (or "") selects the current or default one"""
+        name = name or current_instance.get() or self.default
+        try:
+            return self.managers[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown Ableton instance '{name}'. "
+                f"Configured instances: {', '.join(self.managers)}"
+            ) from None
+
+    def get_connection(
+        self, name: str | None = None, timeout: float = 5.0
+    ) -> AbletonConnection:
+        return self.manager(name).get_connection(timeout)
+
+    def start(self):
+        for manager in self.managers.values():
+            manager.start()
+
+    def stop(self):
+        for manager in self.managers.values():
+            manager.stop()
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        return {name: manager.status() for name, manager in self.managers.items()}
+
+    def fan_out(
+        self,
+        command_type: str,
+        params: dict[str, Any] | None = None,
+        names: list[str] | None = None,
+        timeout: float = 5.0,
+    ) -> dict[str, Any]:
+        """
+        Send one command to several instances in parallel.
+
+        Returns each instance's result, or {"error": message} for instances
+        that are unreachable or fail; one slow machine never fails the rest.
+        """
+        names = names or self.names()
+        for name in names:
+            self.manager(name)  # Unknown names fail before anything is sent
+
+        def send(name: str) -> Any:
+            try:
+                connection = self.get_connection(name, timeout)
+                return connection.send_command(command_type, params)
+            except Exception as e:
+                return {"error": str(e)}
+
+        if len(names) == 1:
+            return {names[0]: send(names[0])}
+        if self._pool is None:
+            # Kept across calls; starting threads per call costs more than
+            # a local round trip
+            self._pool = ThreadPoolExecutor(
+                max_workers=16, thread_name_prefix="ableton-fan-out"
+            )
+        # Each worker runs in a copy of this context so spans join the trace
+        futures = {
+            name: self._pool.submit(contextvars.copy_context().run, send, name)
+            for name in names
+        }
+        return {name: future.result() for name, future in futures.items()}
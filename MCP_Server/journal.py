@@ -0,0 +1,261 @@
+"""
+Command journal and replay.
+
+With ``ABLETON_MCP_JOURNAL`` (or ``--journal``) set, every command sent
+through AbletonConnection.send_command is appended to that file as one
+compact JSON line: start time, duration, command, params, status and result
+(or error message), plus the trace ID. Recorded sessions can then be replayed
+against a Remote Script, real or fake, as a repeatable performance test::
+
+    ableton-mcp-replay session.jsonl                  # as fast as possible
+    ableton-mcp-replay session.jsonl --pace recorded  # with the recorded gaps
+    ableton-mcp-replay session.jsonl --output replay.json
+
+Replay reports latency per command next to the recorded latency, and counts
+commands whose status or result differ from the recording.
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Iterable, Iterator
+
+from .stats import LatencyHistogram
+
+
+def _encode_default(value: Any) -> Any:
+    # Packed notes are sent as raw bytes over msgpack; the Remote Script
+    # accepts the same data as base64 text
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Journal:
+    """Append-only JSONL record of commands, responses and timings"""
+
+    def __init__(self, path: str | None = None):
+        self._lock = threading.Lock()
+        self._file = None
+        self.path = None
+        if path:
+            self.configure(path)
+
+    @property
+    def enabled(self) -> bool:
+        return self._file is not None
+
+    def configure(self, path: str | None):
+        """Start (or stop, with None) journaling to path"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.path = path
+            if path:
+                self._file = open(path, "a", buffering=1 << 16)
+
+    def close(self):
+        self.configure(None)
+
+    def record(
+        self,
+        command_type: str,
+        params: dict[str, Any] | None,
+        response: dict[str, Any],
+        started: float,
+        trace_id: str | None = None,
+    ):
+        """Append one command; started is the wall-clock send time"""
+        entry = {
+            "ts": round(started, 6),
+            "ms": round((time.time() - started) * 1000, 3),
+            "type": command_type,
+            "params": params or {},
+            **response,
+        }
+        if trace_id:
+            entry["trace"] = trace_id
+        line = json.dumps(entry, separators=(",", ":"), default=_encode_default)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            # One flush per command keeps the journal usable after a crash
+            self._file.flush()
+
+
+journal = Journal(os.environ.get("ABLETON_MCP_JOURNAL") or None)
+
+
+def load_journal(path: str) -> Iterator[dict[str, Any]]:
+    """Yield the records of a journal file in order"""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def replay(
+    records: Iterable[dict[str, Any]],
+    connection,
+    pace: str = "fast",
+    speed: float = 1.0,
+    max_mismatch_samples: int = 5,
+) -> dict[str, Any]:
+    """
+    Re-issue journaled commands on connection, in order.
+
+    pace="fast" sends each command as soon as the previous one returns;
+    pace="recorded" keeps the recorded gaps between send times, divided by
+    speed. Commands that fail are counted and replay continues.
+    """
+    recorded: dict[str, LatencyHistogram] = {}
+    replayed: dict[str, LatencyHistogram] = {}
+    errors = 0
+    status_mismatches = 0
+    result_mismatches = 0
+    samples: list[dict[str, Any]] = []
+    count = 0
+    first_ts = last_end = None
+    start = time.perf_counter()
+
+    for record in records:
+        command_type = record["type"]
+        if first_ts is None:
+            first_ts = record["ts"]
+        last_end = record["ts"] + record.get("ms", 0.0) / 1000
+        if pace == "recorded":
+            delay = (record["ts"] - first_ts) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+        sent = time.perf_counter()
+        try:
+            response = {
+                "status": "success",
+                "result": connection.send_command(command_type, record["params"]),
+            }
+        except Exception as e:
+            errors += 1
+            response = {"status": "error", "message": str(e)}
+        elapsed = time.perf_counter() - sent
+        count += 1
+
+        replayed.setdefault(command_type, LatencyHistogram()).record(elapsed)
+        if "ms" in record:
+            recorded.setdefault(command_type, LatencyHistogram()).record(
+                record["ms"] / 1000
+            )
+
+        mismatch = None
+        if response["status"] != record.get("status"):
+            status_mismatches += 1
+            mismatch = "status"
+        elif response["status"] == "success" and response["result"] != record.get(
+            "result"
+        ):
+            result_mismatches += 1
+            mismatch = "result"
+        if mismatch and len(samples) < max_mismatch_samples:
+            samples.append(
+                {
+                    "index": count - 1,
+                    "type": command_type,
+                    "mismatch": mismatch,
+                    "recorded": record.get("result", record.get("message")),
+                    "replayed": response.get("result", response.get("message")),
+                }
+            )
+
+    replay_seconds = time.perf_counter() - start
+    recorded_seconds = (last_end - first_ts) if first_ts is not None else 0.0
+    return {
+        "commands": count,
+        "errors": errors,
+        "status_mismatches": status_mismatches,
+        "result_mismatches": result_mismatches,
+        "mismatch_samples": samples,
+        "pace": pace,
+        "recorded_seconds": round(recorded_seconds, 3),
+        "replay_seconds": round(replay_seconds, 3),
+        "speedup": round(recorded_seconds / replay_seconds, 2)
+        if replay_seconds
+        else None,
+        "per_command": {
+            command_type: {
+                "recorded": recorded[command_type].summary()
+                if command_type in recorded
+                else None,
+                "replayed": histogram.summary(),
+            }
+            for command_type, histogram in sorted(replayed.items())
+        },
+    }
+
+
+def main():
+    from .connection import AbletonConnection, Endpoint
+
+    endpoint = Endpoint.from_env()
+    parser = argparse.ArgumentParser(
+        description="Replay an ableton-mcp command journal against a Remote Script"
+    )
+    parser.add_argument("journal")
+    parser.add_argument("--pace", choices=["fast", "recorded"], default="fast")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Divide recorded gaps by this factor (with --pace recorded)",
+    )
+    parser.add_argument(
+        "--settle-delay",
+        type=float,
+        help="Pause after modifying commands (default: none with --pace fast, "
+        "the usual 0.1s with --pace recorded)",
+    )
+    parser.add_argument("--ableton-host", default=endpoint.host)
+    parser.add_argument("--ableton-port", type=int, default=endpoint.port)
+    parser.add_argument("--ableton-socket", default=endpoint.socket_path or "")
+    parser.add_argument("--output", help="Write the JSON summary to this file")
+    args = parser.parse_args()
+
+    # Never journal the replay into the file being replayed
+    journal.close()
+
+    connection = AbletonConnection(
+        args.ableton_host,
+        args.ableton_port,
+        socket_path=args.ableton_socket or None,
+    )
+    if args.settle_delay is not None:
+        connection.settle_delay = args.settle_delay
+    elif args.pace == "fast":
+        connection.settle_delay = 0.0
+    if not connection.connect():
+        print("Could not connect to the Remote Script", file=sys.stderr)
+        sys.exit(1)
+    try:
+        summary = replay(
+            load_journal(args.journal), connection, args.pace, args.speed
+        )
+    finally:
+        connection.disconnect()
+
+    text = json.dumps(summary, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    if summary["status_mismatches"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
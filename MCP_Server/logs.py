@@ -0,0 +1,120 @@
+"""
+Logging for the MCP server that stays cheap at high command rates.
+
+Records are handed to a queue and written to stderr by a listener thread, so
+a slow terminal or log file never blocks a tool call. Per-command messages
+are logged at DEBUG, sampled per command type, and carry a bounded preview
+of their payload instead of whole note arrays.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: QueueListener | None = None
+
+
+def summarize(value: Any, max_items: int = 8, depth: int = 3) -> Any:
+    """Bounded copy of a payload: long lists and strings are cut, deep nesting elided"""
+    if isinstance(value, dict):
+        if depth <= 0:
+            return f"<dict of {len(value)}>"
+        items = list(value.items())
+        summary = {
+            str(key): summarize(item, max_items, depth - 1)
+            for key, item in items[:max_items]
+        }
+        if len(items) > max_items:
+            summary["..."] = f"+{len(items) - max_items} more keys"
+        return summary
+    if isinstance(value, (list, tuple)):
+        if depth <= 0:
+            return f"<list of {len(value)}>"
+        summary = [summarize(item, max_items, depth - 1) for item in value[:max_items]]
+        if len(value) > max_items:
+            summary.append(f"... +{len(value) - max_items} more")
+        return summary
+    if isinstance(value, (str, bytes)) and len(value) > 64:
+        return f"{value[:32]!r}... ({len(value)} {type(value).__name__})"
+    return value
+
+
+def truncate(value: Any, max_chars: int = 200) -> str:
+    """Compact one-line preview of a payload for log messages"""
+    text = json.dumps(summarize(value), separators=(",", ":"), default=repr)
+    if len(text) > max_chars:
+        return f"{text[:max_chars]}..."
+    return text
+
+
+class CommandSampler:
+    """
+    Decides which occurrences of a command get logged.
+
+    The first burst calls of each command type are logged, then one in every.
+    Counts are updated without a lock; an occasional miscount only shifts
+    which call is sampled.
+    """
+
+    def __init__(self, every: int = 100, burst: int = 5):
+        self.every = max(1, every)
+        self.burst = burst
+        self._counts: dict[str, int] = {}
+
+    def __call__(self, command_type: str) -> bool:
+        count = self._counts.get(command_type, 0) + 1
+        self._counts[command_type] = count
+        return count <= self.burst or count % self.every == 0
+
+
+class StructuredFormatter(logging.Formatter):
+    """Appends the key=value pairs passed as extra={"fields": {...}}"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return text
+
+
+def configure_logging(level: str | int | None = None):
+    """
+    Route all logging through a queue to a stderr handler.
+
+    The level defaults to ABLETON_MCP_LOG_LEVEL (INFO when unset). Calling
+    this again replaces the previous setup.
+    """
+    global _listener
+    if level is None:
+        level = os.environ.get("ABLETON_MCP_LOG_LEVEL", "INFO").upper()
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(StructuredFormatter(LOG_FORMAT))
+    records: queue.SimpleQueue = queue.SimpleQueue()
+
+    if _listener is not None:
+        _listener.stop()
+    _listener = QueueListener(records, handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(records)]
+    root.setLevel(level)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
+
+# One in ABLETON_MCP_LOG_SAMPLE calls of each command type is logged
+command_sampler = CommandSampler(int(os.environ.get("ABLETON_MCP_LOG_SAMPLE", 100)))
@@ -0,0 +1,298 @@
+"""
+Streaming Standard MIDI File (SMF) reading and writing.
+
+Reading maps the file instead of loading it, and parses one MTrk chunk at a
+time. scan_midi_file() makes a first pass that only counts each track's notes
+and finds where they end, so a clip of the right length can be created
+before any note is sent; iter_note_chunks() then makes a second pass that
+yields the notes already packed for the Remote Script (protocol.NOTE_STRUCT),
+a chunk at a time. Neither pass holds more than one chunk of notes.
+
+write_midi_file() takes notes sorted by start time, as get_clip_notes
+returns them, and writes a format 0 file as they arrive. Pending note-offs
+wait in a heap, so memory grows with polyphony rather than with the number
+of notes; the track chunk's length is patched in at the end.
+
+Times in Live are beats, so ticks are converted with the file's division
+(ticks per quarter note); tempo changes don't move notes. SMPTE time
+division is not supported.
+"""
+
+import heapq
+import mmap
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterable, Iterator
+
+from .protocol import NOTE_STRUCT
+
+HEADER = struct.Struct(">4sI")
+MTHD = struct.Struct(">HHH")
+DEFAULT_DIVISION = 480
+
+# Data bytes after each channel message status (by high nibble)
+_DATA_LENGTHS = {0x80: 2, 0x90: 2, 0xA0: 2, 0xB0: 2, 0xC0: 1, 0xD0: 1, 0xE0: 2}
+
+_META_END_OF_TRACK = 0x2F
+_META_TRACK_NAME = 0x03
+_META_TEMPO = 0x51
+
+
+class MidiFileError(ValueError):
+    """The file is not a Standard MIDI File this module can read"""
+
+
+@dataclass
+class MidiTrack:
+    """One MTrk chunk: where it is, and what the first pass found in it"""
+
+    index: int
+    offset: int
+    length: int
+    name: str = ""
+    note_count: int = 0
+    end_beat: float = 0.0
+
+
+@dataclass
+class MidiFile:
+    path: str
+    format: int
+    division: int
+    tempo: float | None = None
+    tracks: list[MidiTrack] = field(default_factory=list)
+
+    @property
+    def note_tracks(self) -> list[MidiTrack]:
+        return [track for track in self.tracks if track.note_count]
+
+
+def _map(path: str) -> tuple[BinaryIO, mmap.mmap]:
+    f = open(path, "rb")
+    try:
+        if os.fstat(f.fileno()).st_size < HEADER.size + MTHD.size:
+            raise MidiFileError(f"{path} is too short to be a MIDI file")
+        return f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except BaseException:
+        f.close()
+        raise
+
+
+def _read_varlen(data: mmap.mmap, position: int) -> tuple[int, int]:
+    value = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, position
+
+
+def _track_events(data: mmap.mmap, start: int, end: int) -> Iterator[tuple]:
+    """
+    Notes and metadata of one track chunk, in ticks.
+
+    Yields ("note", start_tick, pitch, duration_ticks, velocity) when a note
+    ends, ("name", text), ("tempo", bpm) and finally ("end", tick). Notes
+    still held at the end of the track end there.
+    """
+    position = start
+    tick = 0
+    status = 0
+    # (channel, pitch) -> start ticks and velocities of held notes, oldest first
+    held: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    try:
+        while position < end:
+            delta = data[position]
+            if delta & 0x80:
+                delta, position = _read_varlen(data, position)
+            else:
+                position += 1  # Most deltas fit in one byte
+            tick += delta
+            byte = data[position]
+            if byte & 0x80:
+                status = byte
+                position += 1
+            elif not status:
+                raise MidiFileError(f"Running status without a status byte at {position}")
+
+            if status == 0xFF:
+                kind = data[position]
+                length, position = _read_varlen(data, position + 1)
+                payload = data[position : position + length]
+                position += length
+                if kind == _META_END_OF_TRACK:
+                    break
+                if kind == _META_TRACK_NAME:
+                    yield ("name", payload.decode("latin-1"))
+                elif kind == _META_TEMPO and length == 3:
+                    yield ("tempo", 60_000_000 / int.from_bytes(payload, "big"))
+                status = 0
+                continue
+            if status in (0xF0, 0xF7):
+                length, position = _read_varlen(data, position)
+                position += length
+                status = 0
+                continue
+
+            message = status & 0xF0
+            if message not in _DATA_LENGTHS:
+                raise MidiFileError(f"Unknown MIDI status {status:#x} at {position}")
+            if message == 0x90 or message == 0x80:
+                pitch, velocity = data[position], data[position + 1]
+                key = (status & 0x0F, pitch)
+                if message == 0x90 and velocity:
+                    held.setdefault(key, []).append((tick, velocity))
+                elif held.get(key):
+                    started, on_velocity = held[key].pop(0)
+                    yield ("note", started, pitch, tick - started, on_velocity)
+            position += _DATA_LENGTHS[message]
+    except IndexError:
+        raise MidiFileError("Track ends in the middle of an event") from None
+
+    for (_, pitch), notes in held.items():
+        for started, velocity in notes:
+            yield ("note", started, pitch, tick - started, velocity)
+    yield ("end", tick)
+
+
+def scan_midi_file(path: str) -> MidiFile:
+    """Read the header and count each track's notes, without keeping them"""
+    f, data = _map(path)
+    try:
+        chunk, length = HEADER.unpack_from(data, 0)
+        if chunk != b"MThd" or length < MTHD.size:
+            raise MidiFileError(f"{path} is not a Standard MIDI File")
+        file_format, _, division = MTHD.unpack_from(data, HEADER.size)
+        if division & 0x8000:
+            raise MidiFileError("SMPTE time division is not supported")
+        midi = MidiFile(path=path, format=file_format, division=division)
+
+        position = HEADER.size + length
+        while position + HEADER.size <= len(data):
+            chunk, length = HEADER.unpack_from(data, position)
+            start = position + HEADER.size
+            position = start + length
+            if chunk != b"MTrk":
+                continue  # Unknown chunks are skipped, as the spec asks
+            track = MidiTrack(index=len(midi.tracks), offset=start, length=length)
+            end_tick = 0
+            for event in _track_events(data, start, min(position, len(data))):
+                if event[0] == "note":
+                    track.note_count += 1
+                    end_tick = max(end_tick, event[1] + event[3])
+                elif event[0] == "name" and not track.name:
+                    track.name = event[1]
+                elif event[0] == "tempo" and midi.tempo is None:
+                    midi.tempo = event[1]
+            track.end_beat = end_tick / division
+            midi.tracks.append(track)
+        return midi
+    finally:
+        data.close()
+        f.close()
+
+
+def iter_note_chunks(
+    midi: MidiFile, track: MidiTrack, chunk_size: int
+) -> Iterator[tuple[int, bytes]]:
+    """(note count, packed notes) for a track, chunk_size notes at a time"""
+    f, data = _map(midi.path)
+    try:
+        buffer = bytearray(NOTE_STRUCT.size * chunk_size)
+        count = 0
+        end = min(track.offset + track.length, len(data))
+        for event in _track_events(data, track.offset, end):
+            if event[0] != "note":
+                continue
+            _, started, pitch, duration, velocity = event
+            NOTE_STRUCT.pack_into(
+                buffer,
+                count * NOTE_STRUCT.size,
+                pitch,
+                started / midi.division,
+                duration / midi.division,
+                velocity,
+                False,
+            )
+            count += 1
+            if count == chunk_size:
+                yield count, bytes(buffer)
+                count = 0
+        if count:
+            yield count, bytes(buffer[: count * NOTE_STRUCT.size])
+    finally:
+        data.close()
+        f.close()
+
+
+def _varlen(value: int) -> bytes:
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(reversed(out))
+
+
+def write_midi_file(
+    path: str,
+    notes: Iterable[tuple],
+    tempo: float = 120.0,
+    signature: tuple[int, int] = (4, 4),
+    name: str = "",
+    division: int = DEFAULT_DIVISION,
+) -> int:
+    """
+    Write (pitch, start, duration, velocity, mute) notes, sorted by start
+    time in beats, as a format 0 file. Muted notes are left out. Returns the
+    number of notes written.
+    """
+    numerator, denominator = signature
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(b"MThd", MTHD.size) + MTHD.pack(0, 1, division))
+        f.write(HEADER.pack(b"MTrk", 0))
+        track_start = f.tell()
+
+        last_tick = 0
+
+        def event(tick: int, payload: bytes):
+            nonlocal last_tick
+            f.write(_varlen(tick - last_tick) + payload)
+            last_tick = tick
+
+        if name:
+            encoded = name.encode("latin-1", "replace")
+            event(0, bytes([0xFF, _META_TRACK_NAME]) + _varlen(len(encoded)) + encoded)
+        event(0, b"\xff\x51\x03" + round(60_000_000 / tempo).to_bytes(3, "big"))
+        event(
+            0,
+            b"\xff\x58\x04"
+            + bytes([numerator, max(0, denominator.bit_length() - 1), 24, 8]),
+        )
+
+        pending: list[tuple[int, int]] = []  # (off tick, pitch)
+        written = 0
+        for pitch, start, duration, velocity, mute in notes:
+            if mute:
+                continue
+            on_tick = max(last_tick, round(start * division))
+            # Note-offs first, so a repeated pitch is released before it restarts
+            while pending and pending[0][0] <= on_tick:
+                off_tick, off_pitch = heapq.heappop(pending)
+                event(off_tick, bytes([0x80, off_pitch, 0]))
+            event(on_tick, bytes([0x90, int(pitch), max(1, min(127, int(velocity)))]))
+            heapq.heappush(
+                pending, (on_tick + max(1, round(duration * division)), int(pitch))
+            )
+            written += 1
+        while pending:
+            off_tick, off_pitch = heapq.heappop(pending)
+            event(off_tick, bytes([0x80, off_pitch, 0]))
+        event(last_tick, b"\xff\x2f\x00")
+
+        track_end = f.tell()
+        f.seek(track_start - 4)
+        f.write(struct.pack(">I", track_end - track_start))
+    return written
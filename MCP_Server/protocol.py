@@ -0,0 +1,153 @@
+"""
+Wire format between the MCP server and the Remote Script.
+
+A connection starts in the legacy protocol: bare JSON objects, one request
+and one response at a time. The client then sends a ``hello`` command listing
+the encodings and compression it supports. If the Remote Script accepts, both
+sides switch to length-prefixed frames::
+
+    !I payload length | B flags | payload
+
+``flags`` records how the payload was encoded (JSON or msgpack) and whether
+it is zlib-compressed, so each frame is self-describing. A Remote Script that
+predates the handshake answers ``hello`` with an error and the connection
+stays on the legacy protocol.
+"""
+
+import base64
+import hashlib
+import json
+import struct
+import zlib
+from typing import Any
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # msgpack is optional
+    msgpack = None
+
+PROTOCOL_VERSION = 2
+
+FRAME_HEADER = struct.Struct("!IB")
+FLAG_MSGPACK = 0x01
+FLAG_ZLIB = 0x02
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+
+DEFAULT_COMPRESS_THRESHOLD = 64 * 1024
+
+# pitch, start_time, duration, velocity, mute
+NOTE_STRUCT = struct.Struct("<BddBB")
+
+
+def available_encodings() -> list[str]:
+    """Encodings this process can speak, most compact first"""
+    return ["msgpack", "json"] if msgpack is not None else ["json"]
+
+
+def encode_frame(
+    message: Any, encoding: str = "json", compress_threshold: int = 0
+) -> bytes:
+    """Serialize a message into one frame, compressing it above the threshold"""
+    flags = 0
+    if encoding == "msgpack":
+        payload = msgpack.packb(message, use_bin_type=True)
+        flags |= FLAG_MSGPACK
+    else:
+        payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    if compress_threshold and len(payload) >= compress_threshold:
+        compressed = zlib.compress(payload, 1)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= FLAG_ZLIB
+    return FRAME_HEADER.pack(len(payload), flags) + payload
+
+
+def decode_payload(payload: bytes, flags: int) -> Any:
+    """Decode a frame payload according to its header flags"""
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    if flags & FLAG_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Received a msgpack frame but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload.decode("utf-8"))
+
+
+def _midi_value(value: Any, name: str, index: int) -> int:
+    if not 0 <= value <= 127:
+        raise ValueError(f"Note {index}: {name} {value} is outside 0-127")
+    return value
+
+
+def pack_notes(notes: list[dict[str, Any]]) -> bytes:
+    """
+    Pack note dicts into the fixed-size binary layout understood by the Remote Script.
+
+    Velocities are rounded to the byte the layout stores; a pitch or velocity
+    outside 0-127 raises ValueError naming the note.
+    """
+    buffer = bytearray(NOTE_STRUCT.size * len(notes))
+    for offset, note in enumerate(notes):
+        NOTE_STRUCT.pack_into(
+            buffer,
+            offset * NOTE_STRUCT.size,
+            _midi_value(int(note.get("pitch", 60)), "pitch", offset),
+            float(note.get("start_time", 0.0)),
+            float(note.get("duration", 0.25)),
+            _midi_value(round(float(note.get("velocity", 100))), "velocity", offset),
+            bool(note.get("mute", False)),
+        )
+    return bytes(buffer)
+
+
+def unpack_notes(data: bytes | str) -> list[tuple]:
+    """Inverse of pack_notes; accepts raw bytes or their base64 text form"""
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    return [
+        (pitch, start, duration, velocity, bool(mute))
+        for pitch, start, duration, velocity, mute in NOTE_STRUCT.iter_unpack(data)
+    ]
+
+
+def notes_digest(notes: list[Any]) -> str:
+    """
+    Order-independent fingerprint of a clip's notes (dicts or Live tuples).
+
+    The Remote Script computes the same digest for clips in Live, so notes
+    only need to be sent when they actually differ.
+    """
+    rows = []
+    for note in notes:
+        if isinstance(note, dict):
+            note = (
+                note.get("pitch", 60),
+                note.get("start_time", 0.0),
+                note.get("duration", 0.25),
+                note.get("velocity", 100),
+                note.get("mute", False),
+            )
+        pitch, start, duration, velocity, mute = note
+        rows.append(
+            (
+                int(pitch),
+                round(float(start), 6),
+                round(float(duration), 6),
+                round(float(velocity)),
+                bool(mute),
+            )
+        )
+    packed = b"".join(NOTE_STRUCT.pack(*row) for row in sorted(rows))
+    return hashlib.sha1(packed).hexdigest()[:16]
+
+
+def notes_param(notes: list[dict[str, Any]], encoding: str) -> bytes | str:
+    """Packed notes as a command parameter: raw bytes for msgpack, base64 for JSON"""
+    return packed_param(pack_notes(notes), encoding)
+
+
+def packed_param(packed: bytes, encoding: str) -> bytes | str:
+    """Already packed notes as a command parameter, as for notes_param"""
+    if encoding == "msgpack":
+        return packed
+    return base64.b64encode(packed).decode("ascii")
@@ -1,203 +1,61 @@
 # ableton_mcp_server.py
 from mcp.server.fastmcp import FastMCP, Context
-import socket
+import anyio
+import argparse
+import contextvars
+import functools
+import inspect
 import json
 import logging
-from dataclasses import dataclass
+import os
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Any
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+from .automation import (
+    check_points,
+    decimate,
+    default_tolerance,
+    max_error,
+    sample_points,
 )
+from .connection import AbletonConnection, Endpoint
+from .formatting import DEFAULT_SUMMARY_CHARS, format_browser_tree, format_result
+from .instances import (
+    DEFAULT_INSTANCE,
+    InstanceRegistry,
+    current_instance,
+    parse_instances,
+)
+from .journal import journal
+from .logs import configure_logging
+from .midi import iter_note_chunks, scan_midi_file, write_midi_file
+from .protocol import notes_param, packed_param, unpack_notes
+from .sessions import scheduler
+from .spec import devices_to_resolve, plan_operations, summarize_operations
+from .stats import bridge_stats
+from .tracing import tracer
+
+# Configure logging (level from ABLETON_MCP_LOG_LEVEL, written off the calling thread)
+configure_logging()
 logger = logging.getLogger("AbletonMCPServer")
 
 
-@dataclass
-class AbletonConnection:
-    host: str
-    port: int
-    sock: socket.socket | None = None
-
-    def connect(self) -> bool:
-        """Connect to the Ableton Remote Script socket server"""
-        if self.sock:
-            return True
-
-        try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.connect((self.host, self.port))
-            logger.info(f"Connected to Ableton at {self.host}:{self.port}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to connect to Ableton: {str(e)}")
-            self.sock = None
-            return False
-
-    def disconnect(self):
-        """Disconnect from the Ableton Remote Script"""
-        if self.sock:
-            try:
-                self.sock.close()
-            except Exception as e:
-                logger.error(f"Error disconnecting from Ableton: {str(e)}")
-            finally:
-                self.sock = None
-
-    def receive_full_response(self, sock, buffer_size=8192):
-        """Receive the complete response, potentially in multiple chunks"""
-        chunks = []
-        sock.settimeout(15.0)  # Increased timeout for operations that might take longer
-
-        try:
-            while True:
-                try:
-                    chunk = sock.recv(buffer_size)
-                    if not chunk:
-                        if not chunks:
-                            raise Exception(
-                                "Connection closed before receiving any data"
-                            )
-                        break
-
-                    chunks.append(chunk)
-
-                    # Check if we've received a complete JSON object
-                    try:
-                        data = b"".join(chunks)
-                        json.loads(data.decode("utf-8"))
-                        logger.info(f"Received complete response ({len(data)} bytes)")
-                        return data
-                    except json.JSONDecodeError:
-                        # Incomplete JSON, continue receiving
-                        continue
-                except socket.timeout:
-                    logger.warning("Socket timeout during chunked receive")
-                    break
-                except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
-                    logger.error(f"Socket connection error during receive: {str(e)}")
-                    raise
-        except Exception as e:
-            logger.error(f"Error during receive: {str(e)}")
-            raise
-
-        # If we get here, we either timed out or broke out of the loop
-        if chunks:
-            data = b"".join(chunks)
-            logger.info(f"Returning data after receive completion ({len(data)} bytes)")
-            try:
-                json.loads(data.decode("utf-8"))
-                return data
-            except json.JSONDecodeError:
-                raise Exception("Incomplete JSON response received")
-        else:
-            raise Exception("No data received")
-
-    def send_command(
-        self, command_type: str, params: dict[str, Any] | None = None
-    ) -> dict[str, Any]:
-        """Send a command to Ableton and return the response"""
-        if not self.sock and not self.connect():
-            raise ConnectionError("Not connected to Ableton")
-
-        command = {"type": command_type, "params": params or {}}
-
-        # Check if this is a state-modifying command
-        is_modifying_command = command_type in [
-            "create_midi_track",
-            "create_audio_track",
-            "set_track_name",
-            "create_clip",
-            "add_notes_to_clip",
-            "set_clip_name",
-            "set_tempo",
-            "fire_clip",
-            "stop_clip",
-            "set_device_parameter",
-            "start_playback",
-            "stop_playback",
-            "load_instrument_or_effect",
-        ]
-
-        try:
-            logger.info(f"Sending command: {command_type} with params: {params}")
-
-            # Send the command
-            if not self.sock:
-                raise Exception("Not connected to Ableton")
-            self.sock.sendall(json.dumps(command).encode("utf-8"))
-            logger.info("Command sent, waiting for response...")
-
-            # For state-modifying commands, add a small delay to give Ableton time to process
-            if is_modifying_command:
-                import time
-
-                time.sleep(0.1)  # 100ms delay
-
-            # Set timeout based on command type
-            timeout = 15.0 if is_modifying_command else 10.0
-            self.sock.settimeout(timeout)
-
-            # Receive the response
-            response_data = self.receive_full_response(self.sock)
-            logger.info(f"Received {len(response_data)} bytes of data")
-
-            # Parse the response
-            response = json.loads(response_data.decode("utf-8"))
-            logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
-
-            if response.get("status") == "error":
-                logger.error(f"Ableton error: {response.get('message')}")
-                raise Exception(response.get("message", "Unknown error from Ableton"))
-
-            # For state-modifying commands, add another small delay after receiving response
-            if is_modifying_command:
-                import time
-
-                time.sleep(0.1)  # 100ms delay
-
-            return response.get("result", {})
-        except socket.timeout:
-            logger.error("Socket timeout while waiting for response from Ableton")
-            self.sock = None
-            raise Exception("Timeout waiting for Ableton response")
-        except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
-            logger.error(f"Socket connection error: {str(e)}")
-            self.sock = None
-            raise Exception(f"Connection to Ableton lost: {str(e)}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response from Ableton: {str(e)}")
-            if "response_data" in locals() and response_data:
-                logger.error(f"Raw response (first 200 bytes): {response_data[:200]}")
-            self.sock = None
-            raise Exception(f"Invalid response from Ableton: {str(e)}")
-        except Exception as e:
-            logger.error(f"Error communicating with Ableton: {str(e)}")
-            self.sock = None
-            raise Exception(f"Communication error with Ableton: {str(e)}")
-
-
 @asynccontextmanager
 async def server_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
     """Manage server startup and shutdown lifecycle"""
     try:
         logger.info("AbletonMCP server starting up")
 
-        try:
-            ableton = get_ableton_connection()
-            logger.info("Successfully connected to Ableton on startup")
-        except Exception as e:
-            logger.warning(f"Could not connect to Ableton on startup: {str(e)}")
-            logger.warning("Make sure the Ableton Remote Script is running")
+        # Connect in the background so the MCP handshake is answered right away;
+        # tools wait for the connection through get_ableton_connection()
+        _registry.start()
 
         yield {}
     finally:
-        global _ableton_connection
-        if _ableton_connection:
-            logger.info("Disconnecting from Ableton on shutdown")
-            _ableton_connection.disconnect()
-            _ableton_connection = None
+        # Over SSE the lifespan runs once per session; the shared connections
+        # stay up for the next session and are closed when the server exits
+        if not _shared_connections:
+            _registry.stop()
         logger.info("AbletonMCP server shut down")
 
 
@@ -208,111 +66,232 @@ mcp = FastMCP(
     lifespan=server_lifespan,
 )
 
-# Global connection for resources
-_ableton_connection = None
+# Background managers that own the persistent connection to each instance
+_registry = InstanceRegistry()
+
+# True while serving many sessions over SSE, which share the connections
+_shared_connections = False
 
+_INSTANCE_PARAMETER = inspect.Parameter(
+    "instance",
+    inspect.Parameter.KEYWORD_ONLY,
+    default=None,
+    annotation=str | None,
+)
+_INSTANCE_DOC = (
+    "- instance: Name of the Ableton instance to use (see list_instances); "
+    "defaults to the first one"
+)
 
-def get_ableton_connection():
-    """Get or create a persistent Ableton connection"""
-    global _ableton_connection
 
-    if _ableton_connection is not None:
-        try:
-            # Test the connection with a simple ping
-            # We'll try to send an empty message, which should fail if the connection is dead
-            # but won't affect Ableton if it's alive
-            _ableton_connection.sock.settimeout(1.0)
-            _ableton_connection.sock.sendall(b"")
-            return _ableton_connection
-        except Exception as e:
-            logger.warning(f"Existing connection is no longer valid: {str(e)}")
-            try:
-                _ableton_connection.disconnect()
-            except:
-                pass
-            _ableton_connection = None
-
-    # Connection doesn't exist or is invalid, create a new one
-    if _ableton_connection is None:
-        # Try to connect up to 3 times with a short delay between attempts
-        max_attempts = 3
-        for attempt in range(1, max_attempts + 1):
+def get_ableton_connection(
+    timeout: float = 5.0, instance: str | None = None
+) -> AbletonConnection:
+    """
+    Get the persistent connection to an Ableton instance.
+
+    Without an instance name, uses the one selected by the current tool call,
+    or the default. Waits up to timeout seconds while the first connection
+    (or a reconnect) is in progress, and raises AbletonUnavailableError
+    immediately while that instance's circuit breaker is open.
+    """
+    return _registry.get_connection(instance, timeout)
+
+
+def _session_key(fn_kwargs: dict[str, Any]) -> Any:
+    """The MCP session a tool call belongs to, for fair scheduling"""
+    for value in fn_kwargs.values():
+        if isinstance(value, Context):
             try:
-                logger.info(
-                    f"Connecting to Ableton (attempt {attempt}/{max_attempts})..."
-                )
-                _ableton_connection = AbletonConnection(host="localhost", port=9877)
-                if _ableton_connection.connect():
-                    logger.info("Created new persistent connection to Ableton")
+                return value.session
+            except ValueError:
+                break  # Called outside a request, e.g. from benchmarks
+    return "local"
+
 
-                    # Validate connection with a simple command
+def ableton_tool(*args, per_instance: bool = True, **kwargs):
+    """
+    Register a tool with mcp.tool(), running each call inside a trace span.
+
+    Calls wait for a slot from the session scheduler, then run in a worker
+    thread so a slow command never blocks the event loop serving the other
+    sessions. The span starts the trace that every command sent during the
+    call joins. Unless per_instance is False, the tool also gets an optional
+    "instance" argument that selects the Ableton instance for the call.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*fn_args, **fn_kwargs):
+            instance = fn_kwargs.pop("instance", None) if per_instance else None
+            span_args = {"instance": instance} if per_instance else {}
+            with tracer.span(f"tool:{fn.__name__}", cat="tool", **span_args):
+                async with scheduler.slot(_session_key(fn_kwargs)):
+                    token = current_instance.set(instance or None)
                     try:
-                        # Get session info as a test
-                        _ableton_connection.send_command("get_session_info")
-                        logger.info("Connection validated successfully")
-                        return _ableton_connection
-                    except Exception as e:
-                        logger.error(f"Connection validation failed: {str(e)}")
-                        _ableton_connection.disconnect()
-                        _ableton_connection = None
-                        # Continue to next attempt
-                else:
-                    _ableton_connection = None
-            except Exception as e:
-                logger.error(f"Connection attempt {attempt} failed: {str(e)}")
-                if _ableton_connection:
-                    _ableton_connection.disconnect()
-                    _ableton_connection = None
-
-            # Wait before trying again, but only if we have more attempts left
-            if attempt < max_attempts:
-                import time
-
-                time.sleep(1.0)
-
-        # If we get here, all connection attempts failed
-        if _ableton_connection is None:
-            logger.error("Failed to connect to Ableton after multiple attempts")
-            raise Exception(
-                "Could not connect to Ableton. Make sure the Remote Script is running."
+                        # The worker runs in a copy of this context, so it
+                        # sees the instance and joins the trace
+                        call = functools.partial(
+                            contextvars.copy_context().run, fn, *fn_args, **fn_kwargs
+                        )
+                    finally:
+                        current_instance.reset(token)
+                    return await anyio.to_thread.run_sync(call)
+
+        if per_instance:
+            signature = inspect.signature(fn)
+            wrapper.__signature__ = signature.replace(
+                parameters=[*signature.parameters.values(), _INSTANCE_PARAMETER]
             )
+            wrapper.__doc__ = inspect.cleandoc(fn.__doc__ or "") + "\n" + _INSTANCE_DOC
+        return mcp.tool(*args, **kwargs)(wrapper)
 
-    return _ableton_connection
+    return decorator
 
 
 # Core Tool endpoints
 
 
-@mcp.tool()
-def get_session_info(ctx: Context) -> str:
-    """Get detailed information about the current Ableton session"""
+@ableton_tool()
+def get_connection_status(ctx: Context) -> str:
+    """Get the state of the connection to Ableton (connected, connecting or circuit_open)"""
+    return json.dumps(_registry.manager().status())
+
+
+@ableton_tool(per_instance=False)
+def list_instances(ctx: Context) -> str:
+    """List the configured Ableton instances with their address and connection state"""
+    return json.dumps(
+        {
+            "default": _registry.default,
+            "instances": _registry.status(),
+        }
+    )
+
+
+@ableton_tool(per_instance=False)
+def get_all_session_info(
+    ctx: Context,
+    instances: list[str] | None = None,
+    output_format: str = "json",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
+    """
+    Get session info from several Ableton instances at once, queried in parallel.
+
+    Parameters:
+    - instances: Names of the instances to query (default: all configured instances)
+    - output_format: 'json' (compact, default), 'pretty' (indented JSON), 'table' (one row per instance) or 'summary' (table cut off at max_chars)
+    - max_chars: Size budget for the 'summary' format
+
+    Unreachable instances report an "error" instead of failing the whole call.
+    """
+    try:
+        results = _registry.fan_out("get_session_info", names=instances)
+        if output_format in ("table", "summary"):
+            rows = [{"instance": name, **result} for name, result in results.items()]
+            return format_result(rows, output_format, max_chars)
+        return format_result(results, output_format, max_chars)
+    except Exception as e:
+        logger.error(f"Error getting session info from all instances: {str(e)}")
+        return f"Error getting session info from all instances: {str(e)}"
+
+
+def _bridge_stats(reset: bool = False) -> dict[str, Any]:
+    """Collect client-side and Remote Script latency statistics"""
+    manager = _registry.manager()
+    stats: dict[str, Any] = {
+        "connection": manager.status(),
+        "client": bridge_stats.snapshot(),
+        "sessions": scheduler.stats(),
+    }
+    if manager.is_connected():
+        ableton = get_ableton_connection()
+        stats["bytes_sent"] = ableton.bytes_sent
+        stats["bytes_received"] = ableton.bytes_received
+        try:
+            stats["remote_script"] = ableton.send_command(
+                "get_bridge_stats", {"reset": reset}
+            )
+        except Exception as e:
+            stats["remote_script"] = {"error": str(e)}
+    if reset:
+        bridge_stats.reset()
+    return stats
+
+
+@ableton_tool()
+def get_bridge_stats(ctx: Context, reset: bool = False) -> str:
+    """
+    Get per-command latency percentiles (p50/p95/p99) for each phase of the bridge.
+
+    Client phases: encode, send, wait, receive, decode, total, plus transport
+    (wait time not spent inside the Remote Script). Remote Script phases:
+    decode, queue_wait (until Live's main thread picks the task up), execute
+    and serialize.
+
+    Parameters:
+    - reset: Clear the histograms after reading them
+    """
+    return format_result(_bridge_stats(reset))
+
+
+@mcp.resource("ableton://bridge/stats")
+async def bridge_stats_resource() -> str:
+    """Per-command latency percentiles for the MCP server and the Remote Script"""
+    # Asking the Remote Script is a blocking round trip; keep it off the
+    # event loop like a tool call
+    call = functools.partial(contextvars.copy_context().run, _bridge_stats)
+    return format_result(await anyio.to_thread.run_sync(call))
+
+
+@ableton_tool()
+def get_session_info(
+    ctx: Context,
+    output_format: str = "json",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
+    """
+    Get detailed information about the current Ableton session
+
+    Parameters:
+    - output_format: 'json' (compact, default), 'pretty' (indented JSON), 'table' (tab-separated columns) or 'summary' (table cut off at max_chars)
+    - max_chars: Size budget for the 'summary' format
+    """
     try:
         ableton = get_ableton_connection()
         result = ableton.send_command("get_session_info")
-        return json.dumps(result, indent=2)
+        return format_result(result, output_format, max_chars)
     except Exception as e:
         logger.error(f"Error getting session info from Ableton: {str(e)}")
         return f"Error getting session info: {str(e)}"
 
 
-@mcp.tool()
-def get_track_info(ctx: Context, track_index: int) -> str:
+@ableton_tool()
+def get_track_info(
+    ctx: Context,
+    track_index: int,
+    output_format: str = "json",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
     """
     Get detailed information about a specific track in Ableton.
 
     Parameters:
     - track_index: The index of the track to get information about
+    - output_format: 'json' (compact, default), 'pretty' (indented JSON), 'table' (tab-separated columns) or 'summary' (table cut off at max_chars)
+    - max_chars: Size budget for the 'summary' format
     """
     try:
         ableton = get_ableton_connection()
         result = ableton.send_command("get_track_info", {"track_index": track_index})
-        return json.dumps(result, indent=2)
+        return format_result(result, output_format, max_chars)
     except Exception as e:
         logger.error(f"Error getting track info from Ableton: {str(e)}")
         return f"Error getting track info: {str(e)}"
 
 
-@mcp.tool()
+@ableton_tool()
 def create_midi_track(ctx: Context, index: int = -1) -> str:
     """
     Create a new MIDI track in the Ableton session.
@@ -329,7 +308,7 @@ def create_midi_track(ctx: Context, index: int = -1) -> str:
         return f"Error creating MIDI track: {str(e)}"
 
 
-@mcp.tool()
+@ableton_tool()
 def set_track_name(ctx: Context, track_index: int, name: str) -> str:
     """
     Set the name of a track.
@@ -349,7 +328,7 @@ def set_track_name(ctx: Context, track_index: int, name: str) -> str:
         return f"Error setting track name: {str(e)}"
 
 
-@mcp.tool()
+@ableton_tool()
 def create_clip(
     ctx: Context, track_index: int, clip_index: int, length: float = 4.0
 ) -> str:
@@ -373,7 +352,7 @@ def create_clip(
         return f"Error creating clip: {str(e)}"
 
 
-@mcp.tool()
+@ableton_tool()
 def add_notes_to_clip(
     ctx: Context,
     track_index: int,
@@ -390,17 +369,19 @@ def add_notes_to_clip(
     """
     try:
         ableton = get_ableton_connection()
-        result = ableton.send_command(
-            "add_notes_to_clip",
-            {"track_index": track_index, "clip_index": clip_index, "notes": notes},
-        )
+        params: dict[str, Any] = {"track_index": track_index, "clip_index": clip_index}
+        if "packed_notes" in ableton.features:
+            params["notes_packed"] = notes_param(notes, ableton.encoding)
+        else:
+            params["notes"] = notes
+        result = ableton.send_command("add_notes_to_clip", params)
         return f"Added {len(notes)} notes to clip at track {track_index}, slot {clip_index}"
     except Exception as e:
         logger.error(f"Error adding notes to clip: {str(e)}")
         return f"Error adding notes to clip: {str(e)}"
 
 
-@mcp.tool()
+@ableton_tool()
 def set_clip_name(ctx: Context, track_index: int, clip_index: int, name: str) -> str:
     """
     Set the name of a clip.
@@ -422,7 +403,7 @@ def set_clip_name(ctx: Context, track_index: int, clip_index: int, name: str) ->
         return f"Error setting clip name: {str(e)}"
 
 
-@mcp.tool()
+@ableton_tool()
 def set_tempo(ctx: Context, tempo: float) -> str:
     """
     Set the tempo of the Ableton session.
@@ -439,7 +420,7 @@ def set_tempo(ctx: Context, tempo: float) -> str:
         return f"Error setting tempo: {str(e)}"
 
 
-@mcp.tool()
+@ableton_tool()
 def load_instrument_or_effect(ctx: Context, track_index: int, uri: str) -> str:
     """
     Load an instrument or effect onto a track using its URI.
@@ -469,7 +450,7 @@ def load_instrument_or_effect(ctx: Context, track_index: int, uri: str) -> str:
         return f"Error loading instrument by URI: {str(e)}"
 
 
-@mcp.tool()
+@ableton_tool()
 def fire_clip(ctx: Context, track_index: int, clip_index: int) -> str:
     """
     Start playing a clip.
@@ -489,7 +470,7 @@ def fire_clip(ctx: Context, track_index: int, clip_index: int) -> str:
         return f"Error firing clip: {str(e)}"
 
 
-@mcp.tool()
+@ableton_tool()
 def stop_clip(ctx: Context, track_index: int, clip_index: int) -> str:
     """
     Stop playing a clip.
@@ -509,7 +490,7 @@ def stop_clip(ctx: Context, track_index: int, clip_index: int) -> str:
         return f"Error stopping clip: {str(e)}"
 
 
-@mcp.tool()
+@ableton_tool()
 def start_playback(ctx: Context) -> str:
     """Start playing the Ableton session."""
     try:
@@ -521,7 +502,7 @@ def start_playback(ctx: Context) -> str:
         return f"Error starting playback: {str(e)}"
 
 
-@mcp.tool()
+@ableton_tool()
 def stop_playback(ctx: Context) -> str:
     """Stop Ableton Live's playback."""
     try:
@@ -533,7 +514,578 @@ def stop_playback(ctx: Context) -> str:
         raise Exception(f"Failed to stop playback: {str(e)}")
 
 
-@mcp.tool()
+@ableton_tool()
+def query_arrangement(
+    ctx: Context,
+    track_indices: list[int] | None = None,
+    start_bar: float | None = None,
+    end_bar: float | None = None,
+    start_beat: float | None = None,
+    end_beat: float | None = None,
+    output_format: str = "json",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
+    """
+    Find the arrangement-view clips that overlap a time range.
+
+    Returns the clips under "clips" as columns {"track_index": [...], "name": [...], "start_time": [...], "end_time": [...], "is_midi": [...], "muted": [...]} with times in beats. Use get_arrangement_clips to read the clips' notes.
+
+    Parameters:
+    - track_indices: Tracks to search (default: all)
+    - start_bar, end_bar: Bars as shown in Live, both included (e.g. 33 and 48)
+    - start_beat, end_beat: The range in beats instead, end excluded
+    - output_format: 'json' (compact, default), 'pretty' (indented JSON), 'table' (tab-separated columns) or 'summary' (table cut off at max_chars)
+    - max_chars: Size budget for the 'summary' format
+    Leaving out the start or end searches from the beginning or to the end of the arrangement.
+    """
+    try:
+        ableton = get_ableton_connection()
+        params: dict[str, Any] = {}
+        for key, value in [
+            ("track_indices", track_indices),
+            ("start_bar", start_bar),
+            ("end_bar", end_bar),
+            ("start_beat", start_beat),
+            ("end_beat", end_beat),
+        ]:
+            if value is not None:
+                params[key] = value
+        result = ableton.send_command("query_arrangement", params)
+        return format_result(result, output_format, max_chars)
+    except Exception as e:
+        logger.error(f"Error querying arrangement: {str(e)}")
+        return f"Error querying arrangement: {str(e)}"
+
+
+@ableton_tool()
+def get_arrangement_clips(
+    ctx: Context,
+    clips: list[dict[str, Any]],
+    include_notes: bool = True,
+    output_format: str = "json",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
+    """
+    Read several arrangement-view clips, with their notes, in one call.
+
+    Parameters:
+    - clips: The clips to read, each as {"track_index": 0, "start_time": 128.0} (start times in beats, as query_arrangement reports them)
+    - include_notes: Include each MIDI clip's notes as [pitch, start, duration, velocity, mute]
+    - output_format: 'json' (compact, default), 'pretty' (indented JSON), 'table' (tab-separated columns) or 'summary' (table cut off at max_chars)
+    - max_chars: Size budget for the 'summary' format
+    """
+    try:
+        ableton = get_ableton_connection()
+        result = ableton.send_command(
+            "get_arrangement_clips", {"clips": clips, "notes": include_notes}
+        )
+        return format_result(result, output_format, max_chars)
+    except Exception as e:
+        logger.error(f"Error getting arrangement clips: {str(e)}")
+        return f"Error getting arrangement clips: {str(e)}"
+
+
+@ableton_tool()
+def write_automation(
+    ctx: Context,
+    track_index: int,
+    parameter: str,
+    values: list[float] | None = None,
+    step: float = 0.25,
+    start: float = 0.0,
+    points: list[list[float]] | None = None,
+    clip_index: int | None = None,
+    arrangement_start_time: float | None = None,
+    device_index: int | None = None,
+    tolerance: float | None = None,
+    clear: bool = True,
+) -> str:
+    """
+    Draw automation for a device or mixer parameter into a clip from a sampled curve.
+
+    The curve is reduced to the fewest breakpoints whose straight lines stay within tolerance of every sample before it is written, so dense curves (LFOs, fades, filter sweeps) are cheap to send.
+
+    Parameters:
+    - track_index: The index of the track
+    - parameter: With device_index, the parameter's name or index (e.g. "Filter Freq" or "3"); without it, a mixer parameter: "volume", "panning", "send_a", "send_b", ...
+    - values: Parameter values sampled every step beats from start (beats from the clip start)
+    - step, start: Spacing and first time of values, in beats
+    - points: [[time, value], ...] instead of values, with increasing times
+    - clip_index: The session clip slot to write into
+    - arrangement_start_time: Or the start (in beats) of the arrangement clip to write into
+    - device_index: The device on the track, for device parameters
+    - tolerance: Largest allowed deviation in parameter units (default: 0.1% of the curve's range)
+    - clear: Replace the parameter's existing envelope in the clip (otherwise add to it)
+    """
+    try:
+        ableton = get_ableton_connection()
+        if points is not None:
+            curve = check_points(points)
+        elif values is not None:
+            curve = sample_points(values, start, step)
+        else:
+            return "Error writing automation: give values or points"
+        if not curve:
+            return "Error writing automation: the curve is empty"
+        if clip_index is not None:
+            clip: dict[str, Any] = {"slot": clip_index}
+        elif arrangement_start_time is not None:
+            clip = {"start_time": arrangement_start_time}
+        else:
+            return "Error writing automation: give clip_index or arrangement_start_time"
+        if device_index is None:
+            target: dict[str, Any] = {"mixer": parameter}
+        elif parameter.isdigit():
+            target = {"device_index": device_index, "parameter_index": int(parameter)}
+        else:
+            target = {"device_index": device_index, "name": parameter}
+
+        if tolerance is None:
+            tolerance = default_tolerance(curve)
+        breakpoints = decimate(curve, tolerance)
+        result = ableton.send_command(
+            "write_automation",
+            {
+                "track_index": track_index,
+                "clip": clip,
+                "parameter": target,
+                "breakpoints": [list(point) for point in breakpoints],
+                "clear": clear,
+            },
+        )
+        message = (
+            f"Wrote {result['parameter']} automation to clip '{result['clip']}': "
+            f"{len(curve)} samples as {len(breakpoints)} breakpoints "
+            f"(max error {max_error(curve, breakpoints):.4g})"
+        )
+        landed = result.get("landed", len(breakpoints))
+        if landed < len(breakpoints):
+            message += (
+                f"; warning: reading the envelope back found only {landed} of "
+                f"them (max deviation {result['max_deviation']:.4g})"
+            )
+        return message
+    except Exception as e:
+        logger.error(f"Error writing automation: {str(e)}")
+        return f"Error writing automation: {str(e)}"
+
+
+# Notes per add_notes_to_clip / get_clip_notes command when moving MIDI files;
+# each write also waits out the settle delay, so chunks are large (~350 KB packed)
+MIDI_CHUNK_NOTES = 16384
+
+
+@ableton_tool()
+def import_midi_file(
+    ctx: Context, path: str, track_index: int, clip_index: int = 0
+) -> str:
+    """
+    Import a Standard MIDI File (.mid) into session clips.
+
+    The file is read as a stream and its notes are sent in packed chunks, so large files don't need to fit in one command. Each MIDI track with notes becomes one clip, long enough for its notes (rounded up to a bar). The first goes into track_index; in multi-track files each further track gets a new MIDI track, inserted after it and named after the MIDI track.
+
+    Parameters:
+    - path: Path of the .mid file on this machine
+    - track_index: The MIDI track for the (first) clip
+    - clip_index: The clip slot to create the clips in (must be empty)
+    """
+    try:
+        ableton = get_ableton_connection()
+        midi = scan_midi_file(os.path.expanduser(path))
+        note_tracks = midi.note_tracks
+        if not note_tracks:
+            return f"Error importing MIDI file: {path} has no notes"
+        session = ableton.send_command("get_session_info")
+        bar = (
+            session.get("signature_numerator", 4)
+            * 4.0
+            / session.get("signature_denominator", 4)
+        )
+        packed = "packed_notes" in ableton.features
+
+        imported = []
+        for n, midi_track in enumerate(note_tracks):
+            target = track_index + n
+            if n:
+                ableton.send_command("create_midi_track", {"index": target})
+                if midi_track.name:
+                    ableton.send_command(
+                        "set_track_name",
+                        {"track_index": target, "name": midi_track.name},
+                    )
+            bars = max(1, -(-midi_track.end_beat // bar))
+            ableton.send_command(
+                "create_clip",
+                {"track_index": target, "clip_index": clip_index, "length": bars * bar},
+            )
+            name = midi_track.name or os.path.splitext(os.path.basename(path))[0]
+            ableton.send_command(
+                "set_clip_name",
+                {"track_index": target, "clip_index": clip_index, "name": name},
+            )
+            for count, chunk in iter_note_chunks(midi, midi_track, MIDI_CHUNK_NOTES):
+                params: dict[str, Any] = {
+                    "track_index": target,
+                    "clip_index": clip_index,
+                }
+                if packed:
+                    params["notes_packed"] = packed_param(chunk, ableton.encoding)
+                else:
+                    params["notes"] = [list(note) for note in unpack_notes(chunk)]
+                ableton.send_command("add_notes_to_clip", params)
+            imported.append(
+                f"track {target}: '{name}', {midi_track.note_count} notes, "
+                f"{bars * bar:g} beats"
+            )
+        return f"Imported {path} into slot {clip_index}:\n" + "\n".join(imported)
+    except Exception as e:
+        logger.error(f"Error importing MIDI file: {str(e)}")
+        return f"Error importing MIDI file: {str(e)}"
+
+
+@ableton_tool()
+def export_clip_midi(ctx: Context, track_index: int, clip_index: int, path: str) -> str:
+    """
+    Export a session MIDI clip as a Standard MIDI File (.mid), with the set's tempo and time signature.
+
+    Notes are fetched and written a chunk at a time. Muted notes are left out.
+
+    Parameters:
+    - track_index: The index of the track containing the clip
+    - clip_index: The index of the clip slot containing the clip
+    - path: Path of the .mid file to write on this machine (overwritten if it exists)
+    """
+    try:
+        ableton = get_ableton_connection()
+        session = ableton.send_command("get_session_info")
+        packed = "bytes" if ableton.encoding == "msgpack" else "base64"
+        clip = {"track_index": track_index, "clip_index": clip_index}
+        params = dict(clip, limit=MIDI_CHUNK_NOTES, packed=packed)
+        # The first page also names the clip, for the file's track name
+        first = ableton.send_command("get_clip_notes", params)
+
+        def notes():
+            page = first
+            while True:
+                yield from unpack_notes(page["notes_packed"])
+                if page["next"] is None:
+                    return
+                page = ableton.send_command(
+                    "get_clip_notes",
+                    dict(params, start=page["next"], span=page["span"]),
+                )
+
+        written = write_midi_file(
+            os.path.expanduser(path),
+            notes(),
+            tempo=session.get("tempo", 120.0),
+            signature=(
+                session.get("signature_numerator", 4),
+                session.get("signature_denominator", 4),
+            ),
+            name=first.get("name", ""),
+        )
+        return f"Exported {written} notes from track {track_index}, slot {clip_index} to {path}"
+    except Exception as e:
+        logger.error(f"Error exporting clip MIDI: {str(e)}")
+        return f"Error exporting clip MIDI: {str(e)}"
+
+
+@ableton_tool()
+def get_mixer_state(
+    ctx: Context,
+    track_indices: list[int] | None = None,
+    include_returns: bool = True,
+    include_master: bool = True,
+    output_format: str = "json",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
+    """
+    Get volume, panning, mute, solo, arm and send levels of many tracks at once.
+
+    Values come back as columns: {"tracks": {"index": [...], "name": [...], "volume": [...], "panning": [...], "mute": [...], "solo": [...], "arm": [...], "sends": [[send A per track], [send B per track]]}, "returns": {...}, "master": {"volume": v, "panning": p}}. Volume and sends are Live's 0-1 fader values (0.85 is 0 dB); panning is -1 to 1.
+
+    Parameters:
+    - track_indices: Tracks to include (default: all)
+    - include_returns: Include the return tracks
+    - include_master: Include the master track
+    - output_format: 'json' (compact, default), 'pretty' (indented JSON), 'table' (one row per track, one column per send) or 'summary' (table cut off at max_chars)
+    - max_chars: Size budget for the 'summary' format
+    """
+    try:
+        ableton = get_ableton_connection()
+        params: dict[str, Any] = {
+            "returns": include_returns,
+            "master": include_master,
+        }
+        if track_indices is not None:
+            params["track_indices"] = track_indices
+        result = ableton.send_command("get_mixer_state", params)
+        return format_result(result, output_format, max_chars)
+    except Exception as e:
+        logger.error(f"Error getting mixer state: {str(e)}")
+        return f"Error getting mixer state: {str(e)}"
+
+
+@ableton_tool()
+def set_mixer_state(ctx: Context, state: dict[str, Any]) -> str:
+    """
+    Set the mixer of many tracks, return tracks and the master in one step.
+
+    Takes the format get_mixer_state returns; include only the columns to change, e.g. {"tracks": {"index": [0, 1, 2], "volume": [0.7, 0.8, 0.6], "mute": [false, false, true]}, "returns": {"index": [0], "volume": [0.5]}, "master": {"volume": 0.85}}. Sends are one list per send: "sends": [[send A for each track], [send B for each track]]. Use null to leave a cell unchanged. Nothing is changed if any value is invalid.
+
+    Parameters:
+    - state: The columns to write
+    """
+    try:
+        ableton = get_ableton_connection()
+        result = ableton.send_command("set_mixer_state", {"state": state})
+        return f"Wrote {result['written']} mixer values ({result['changed']} changed)"
+    except Exception as e:
+        logger.error(f"Error setting mixer state: {str(e)}")
+        return f"Error setting mixer state: {str(e)}"
+
+
+@ableton_tool()
+def get_scenes(
+    ctx: Context,
+    output_format: str = "json",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
+    """
+    Get the name and number of clips of every scene in the session.
+
+    Parameters:
+    - output_format: 'json' (compact, default), 'pretty' (indented JSON), 'table' (tab-separated columns) or 'summary' (table cut off at max_chars)
+    - max_chars: Size budget for the 'summary' format
+    """
+    try:
+        ableton = get_ableton_connection()
+        result = ableton.send_command("get_scenes")
+        return format_result(result, output_format, max_chars)
+    except Exception as e:
+        logger.error(f"Error getting scenes: {str(e)}")
+        return f"Error getting scenes: {str(e)}"
+
+
+@ableton_tool()
+def fire_scene(ctx: Context, scene_index: int) -> str:
+    """
+    Launch a scene: every clip in its row starts together.
+
+    Parameters:
+    - scene_index: The index of the scene to launch
+    """
+    try:
+        ableton = get_ableton_connection()
+        ableton.send_command("fire_scene", {"scene_index": scene_index})
+        return f"Launched scene {scene_index}"
+    except Exception as e:
+        logger.error(f"Error firing scene: {str(e)}")
+        return f"Error firing scene: {str(e)}"
+
+
+@ableton_tool()
+def stop_scene(ctx: Context, scene_index: int) -> str:
+    """
+    Stop the clips playing in one scene row, leaving other clips playing.
+
+    Parameters:
+    - scene_index: The index of the scene to stop
+    """
+    try:
+        ableton = get_ableton_connection()
+        result = ableton.send_command("stop_scene", {"scene_index": scene_index})
+        return f"Stopped {result['stopped']} clips in scene {scene_index}"
+    except Exception as e:
+        logger.error(f"Error stopping scene: {str(e)}")
+        return f"Error stopping scene: {str(e)}"
+
+
+@ableton_tool()
+def create_scene(ctx: Context, index: int = -1, name: str | None = None) -> str:
+    """
+    Create a new empty scene.
+
+    Parameters:
+    - index: The index to insert the scene at (-1 = end of list)
+    - name: Optional name for the scene
+    """
+    try:
+        ableton = get_ableton_connection()
+        params: dict[str, Any] = {"index": index}
+        if name is not None:
+            params["name"] = name
+        result = ableton.send_command("create_scene", params)
+        return f"Created scene {result['index']}: {result['name']}"
+    except Exception as e:
+        logger.error(f"Error creating scene: {str(e)}")
+        return f"Error creating scene: {str(e)}"
+
+
+@ableton_tool()
+def duplicate_scene(ctx: Context, scene_index: int) -> str:
+    """
+    Duplicate a scene and all of its clips into a new scene right below it.
+
+    Parameters:
+    - scene_index: The index of the scene to duplicate
+    """
+    try:
+        ableton = get_ableton_connection()
+        result = ableton.send_command("duplicate_scene", {"scene_index": scene_index})
+        return (
+            f"Duplicated scene {scene_index} as scene {result['index']} "
+            f"({result['clip_count']} clips)"
+        )
+    except Exception as e:
+        logger.error(f"Error duplicating scene: {str(e)}")
+        return f"Error duplicating scene: {str(e)}"
+
+
+@ableton_tool()
+def capture_scene(ctx: Context) -> str:
+    """Capture the clips playing now into a new scene below the selected one."""
+    try:
+        ableton = get_ableton_connection()
+        result = ableton.send_command("capture_scene")
+        return (
+            f"Captured {result['clip_count']} playing clips as scene {result['index']}"
+        )
+    except Exception as e:
+        logger.error(f"Error capturing scene: {str(e)}")
+        return f"Error capturing scene: {str(e)}"
+
+
+@ableton_tool()
+def edit_clip_grid(
+    ctx: Context,
+    action: str,
+    first_track: int,
+    last_track: int,
+    first_slot: int,
+    last_slot: int,
+    length: float = 4.0,
+    name: str | None = None,
+) -> str:
+    """
+    Create, name or delete the clips in a rectangle of tracks and slots in one step.
+
+    Parameters:
+    - action: "create" (empty MIDI clips in every empty slot), "name" (rename existing clips) or "clear" (delete every clip)
+    - first_track, last_track: The range of track indices, both included
+    - first_slot, last_slot: The range of clip slot (scene) indices, both included
+    - length: The length of created clips in beats
+    - name: Name for the clips; may contain {track}, {slot}, {track_name} and {scene_name}, e.g. "{track_name} {slot}"
+    """
+    try:
+        ableton = get_ableton_connection()
+        params: dict[str, Any] = {
+            "action": action,
+            "tracks": [first_track, last_track],
+            "slots": [first_slot, last_slot],
+            "length": length,
+        }
+        if name is not None:
+            params["name"] = name
+        result = ableton.send_command("edit_clip_grid", params)
+        return format_result(result)
+    except Exception as e:
+        logger.error(f"Error editing clip grid: {str(e)}")
+        return f"Error editing clip grid: {str(e)}"
+
+
+@ableton_tool()
+def schedule_launch(
+    ctx: Context,
+    actions: list[dict[str, Any]],
+    beat: float | None = None,
+    bar: float | None = None,
+) -> str:
+    """
+    Launch clips or start/stop the transport together at an exact song position.
+
+    The Remote Script keeps the launch and runs every action in the same
+    tick when the song reaches it, so timing doesn't depend on how long the
+    request takes to arrive. Clip actions aimed at a launch quantization
+    boundary start exactly on it.
+
+    Parameters:
+    - actions: e.g. [{"action": "fire_clip", "track_index": 0, "clip_index": 1}]; actions are fire_clip, stop_clip, fire_scene and stop_scene (with "scene_index"), stop_all_clips, start_playback and stop_playback
+    - beat: Song position in beats (quarter notes from the start of the song)
+    - bar: Bar number as shown in Live (1 is the first bar); used instead of beat
+    Without beat or bar, the actions run at the next launch quantization boundary (or the next bar when quantization is off).
+    While the transport is stopped the song position doesn't move: start_playback and stop_playback given no beat or bar then run straight away (a later beat or bar is refused), and clip actions wait until playback reaches their beat.
+    """
+    try:
+        ableton = get_ableton_connection()
+        if "launch_scheduler" not in ableton.features:
+            return (
+                "Error scheduling launch: the Remote Script does not support "
+                "it; please update it"
+            )
+        params: dict[str, Any] = {"actions": actions}
+        if bar is not None:
+            params["bar"] = bar
+        elif beat is not None:
+            params["beat"] = beat
+        result = ableton.send_command("schedule_launch", params)
+        message = (
+            f"Scheduled launch {result['id']} ({len(actions)} actions) at beat "
+            f"{result['beat']:g}; the song is at beat {result['current_beat']:.2f}"
+        )
+        if result.get("waiting_for_transport"):
+            message += (
+                "; the transport is stopped, so it runs once playback reaches "
+                "that beat"
+            )
+        return message
+    except Exception as e:
+        logger.error(f"Error scheduling launch: {str(e)}")
+        return f"Error scheduling launch: {str(e)}"
+
+
+@ableton_tool()
+def get_scheduled_launches(
+    ctx: Context,
+    output_format: str = "json",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
+    """
+    Get the launches waiting for their song position, and the most recent ones that ran.
+
+    Parameters:
+    - output_format: 'json' (compact, default), 'pretty' (indented JSON), 'table' (tab-separated columns) or 'summary' (table cut off at max_chars)
+    - max_chars: Size budget for the 'summary' format
+    """
+    try:
+        ableton = get_ableton_connection()
+        result = ableton.send_command("get_scheduled_launches")
+        return format_result(result, output_format, max_chars)
+    except Exception as e:
+        logger.error(f"Error getting scheduled launches: {str(e)}")
+        return f"Error getting scheduled launches: {str(e)}"
+
+
+@ableton_tool()
+def cancel_scheduled_launches(ctx: Context, launch_id: int | None = None) -> str:
+    """
+    Cancel a scheduled launch before it runs.
+
+    Parameters:
+    - launch_id: The ID returned by schedule_launch; cancels every waiting launch when omitted
+    """
+    try:
+        ableton = get_ableton_connection()
+        params = {} if launch_id is None else {"launch_id": launch_id}
+        result = ableton.send_command("cancel_launches", params)
+        return f"Cancelled {result['cancelled']} scheduled launches"
+    except Exception as e:
+        logger.error(f"Error cancelling scheduled launches: {str(e)}")
+        return f"Error cancelling scheduled launches: {str(e)}"
+
+
+@ableton_tool()
 def delete_track(ctx: Context, track_index: int) -> str:
     """Delete the track at the specified index.
     Use get_session_info to find the correct index first.
@@ -547,7 +1099,7 @@ def delete_track(ctx: Context, track_index: int) -> str:
         raise Exception(f"Failed to delete track {track_index}: {str(e)}")
 
 
-@mcp.tool()
+@ableton_tool()
 def delete_clip(ctx: Context, track_index: int, clip_index: int) -> str:
     """Delete the clip at the specified track and clip index (slot index).
     Use get_track_info to find the correct indices first.
@@ -569,13 +1121,20 @@ def delete_clip(ctx: Context, track_index: int, clip_index: int) -> str:
         )
 
 
-@mcp.tool()
-def get_browser_tree(ctx: Context, category_type: str = "all") -> str:
+@ableton_tool()
+def get_browser_tree(
+    ctx: Context,
+    category_type: str = "all",
+    output_format: str = "tree",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
     """
     Get a hierarchical tree of browser categories from Ableton.
 
     Parameters:
     - category_type: Type of categories to get ('all', 'instruments', 'sounds', 'drums', 'audio_effects', 'midi_effects')
+    - output_format: 'tree' (indented outline, default), 'summary' (outline cut off at max_chars), 'json', 'pretty' or 'table'
+    - max_chars: Size budget for the 'summary' format
     """
     try:
         ableton = get_ableton_connection()
@@ -591,39 +1150,7 @@ def get_browser_tree(ctx: Context, category_type: str = "all") -> str:
                 f"Available browser categories: {', '.join(available_cats)}"
             )
 
-        # Format the tree in a more readable way
-        total_folders = result.get("total_folders", 0)
-        formatted_output = (
-            f"Browser tree for '{category_type}' (showing {total_folders} folders):\n\n"
-        )
-
-        def format_tree(item, indent=0):
-            output = ""
-            if item:
-                prefix = "  " * indent
-                name = item.get("name", "Unknown")
-                path = item.get("path", "")
-                has_more = item.get("has_more", False)
-
-                # Add this item
-                output += f"{prefix}• {name}"
-                if path:
-                    output += f" (path: {path})"
-                if has_more:
-                    output += " [...]"
-                output += "\n"
-
-                # Add children
-                for child in item.get("children", []):
-                    output += format_tree(child, indent + 1)
-            return output
-
-        # Format each category
-        for category in result.get("categories", []):
-            formatted_output += format_tree(category)
-            formatted_output += "\n"
-
-        return formatted_output
+        return format_browser_tree(result, category_type, output_format, max_chars)
     except Exception as e:
         error_msg = str(e)
         if "Browser is not available" in error_msg:
@@ -637,14 +1164,21 @@ def get_browser_tree(ctx: Context, category_type: str = "all") -> str:
             return f"Error getting browser tree: {error_msg}"
 
 
-@mcp.tool()
-def get_browser_items_at_path(ctx: Context, path: str) -> str:
+@ableton_tool()
+def get_browser_items_at_path(
+    ctx: Context,
+    path: str,
+    output_format: str = "json",
+    max_chars: int = DEFAULT_SUMMARY_CHARS,
+) -> str:
     """
     Get browser items at a specific path in Ableton's browser.
 
     Parameters:
     - path: Path in the format "category/folder/subfolder"
             where category is one of the available browser categories in Ableton
+    - output_format: 'json' (compact, default), 'pretty' (indented JSON), 'table' (tab-separated columns) or 'summary' (table cut off at max_chars)
+    - max_chars: Size budget for the 'summary' format
     """
     try:
         ableton = get_ableton_connection()
@@ -659,7 +1193,7 @@ def get_browser_items_at_path(ctx: Context, path: str) -> str:
                 f"Available browser categories: {', '.join(available_cats)}"
             )
 
-        return json.dumps(result, indent=2)
+        return format_result(result, output_format, max_chars)
     except Exception as e:
         error_msg = str(e)
         if "Browser is not available" in error_msg:
@@ -679,7 +1213,72 @@ def get_browser_items_at_path(ctx: Context, path: str) -> str:
             return f"Error getting browser items at path: {error_msg}"
 
 
-@mcp.tool()
+@ableton_tool()
+def apply_session_spec(
+    ctx: Context, spec: dict[str, Any], dry_run: bool = False
+) -> str:
+    """
+    Make the session match a declarative description of tracks, devices, clips and notes.
+
+    Only the differences are applied, in one batch, so re-applying an edited
+    spec is cheap and applying the same spec twice changes nothing.
+
+    Parameters:
+    - spec: {"tempo": 120, "tracks": [{"name": "Bass", "devices": [browser URIs or paths], "clips": [{"slot": 0, "name": "Line", "length": 4, "notes": [note dicts as in add_notes_to_clip]}]}]}. Tracks are matched by name (or by "index" when given) and created when missing; anything the spec doesn't mention is left alone
+    - dry_run: Only report the planned operations
+    """
+    try:
+        ableton = get_ableton_connection()
+        if "session_spec" not in ableton.features:
+            return (
+                "Error applying session spec: the Remote Script does not "
+                "support it; please update it"
+            )
+        snapshot = ableton.send_command(
+            "get_session_snapshot", {"resolve": devices_to_resolve(spec)}
+        )
+        operations = plan_operations(spec, snapshot, ableton.encoding)
+        summary: dict[str, Any] = {
+            "operations": len(operations),
+            "plan": summarize_operations(operations),
+            "dry_run": dry_run,
+        }
+        if operations and not dry_run:
+            result = ableton.send_command(
+                "apply_operations", {"operations": operations}
+            )
+            summary["applied"] = result["applied"]
+        return json.dumps(summary)
+    except Exception as e:
+        logger.error(f"Error applying session spec: {str(e)}")
+        return f"Error applying session spec: {str(e)}"
+
+
+@ableton_tool()
+def load_device_chain(ctx: Context, track_index: int, items: list[str]) -> str:
+    """
+    Load several instruments, effects or presets onto a track in one step.
+
+    Parameters:
+    - track_index: The index of the track to load onto
+    - items: Browser URIs (e.g. 'query:Synths#Operator') or paths (e.g. 'audio_effects/Reverb'), loaded in order; a folder loads its first loadable item
+    """
+    try:
+        ableton = get_ableton_connection()
+        # Browser URIs always have a scheme ("query:..."); anything else is a path
+        specs = [{"uri": item} if ":" in item else {"path": item} for item in items]
+        result = ableton.send_command(
+            "load_device_chain", {"track_index": track_index, "items": specs}
+        )
+        loaded = ", ".join(item["name"] for item in result["loaded"])
+        devices = ", ".join(device["name"] for device in result["devices"])
+        return f"Loaded {loaded} on track {track_index}. Devices on track: {devices}"
+    except Exception as e:
+        logger.error(f"Error loading device chain: {str(e)}")
+        return f"Error loading device chain: {str(e)}"
+
+
+@ableton_tool()
 def load_drum_kit(ctx: Context, track_index: int, rack_uri: str, kit_path: str) -> str:
     """
     Load a drum rack and then load a specific drum kit into it.
@@ -692,6 +1291,19 @@ def load_drum_kit(ctx: Context, track_index: int, rack_uri: str, kit_path: str)
     try:
         ableton = get_ableton_connection()
 
+        if "device_chain" in ableton.features:
+            # Resolved and loaded by the Remote Script in one main-thread task
+            result = ableton.send_command(
+                "load_device_chain",
+                {
+                    "track_index": track_index,
+                    "items": [{"uri": rack_uri}, {"path": kit_path}],
+                },
+            )
+            kit_name = result["loaded"][-1]["name"]
+            return f"Loaded drum rack and kit '{kit_name}' on track {track_index}"
+
+        # Older Remote Scripts: one round trip per step
         # Step 1: Load the drum rack
         result = ableton.send_command(
             "load_browser_item", {"track_index": track_index, "item_uri": rack_uri}
@@ -730,7 +1342,108 @@ def load_drum_kit(ctx: Context, track_index: int, rack_uri: str, kit_path: str)
 # Main execution
 def main():
     """Run the MCP server"""
-    mcp.run()
+    global _shared_connections
+    endpoint = Endpoint.from_env()
+    parser = argparse.ArgumentParser(description="Ableton Live MCP server")
+    parser.add_argument(
+        "--ableton-host",
+        default=endpoint.host,
+        help="Remote Script TCP host (env ABLETON_MCP_HOST)",
+    )
+    parser.add_argument(
+        "--ableton-port",
+        type=int,
+        default=endpoint.port,
+        help="Remote Script TCP port (env ABLETON_MCP_PORT)",
+    )
+    parser.add_argument(
+        "--ableton-socket",
+        default=endpoint.socket_path or "",
+        help="Remote Script Unix socket path, tried before TCP; empty disables it "
+        "(env ABLETON_MCP_SOCKET)",
+    )
+    parser.add_argument(
+        "--instances",
+        default=os.environ.get("ABLETON_MCP_INSTANCES", ""),
+        help="Named Ableton instances as name=host:port,...; overrides the "
+        "--ableton-* options (env ABLETON_MCP_INSTANCES)",
+    )
+    parser.add_argument(
+        "--trace-file",
+        default=tracer.path or "",
+        help="Append request trace spans to this JSONL file "
+        "(env ABLETON_MCP_TRACE_FILE)",
+    )
+    parser.add_argument(
+        "--journal",
+        default=journal.path or "",
+        help="Append every command and response to this JSONL file for replay "
+        "(env ABLETON_MCP_JOURNAL)",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "sse"],
+        default=os.environ.get("ABLETON_MCP_TRANSPORT", "stdio"),
+        help="stdio for a single client, or sse to serve many MCP sessions over "
+        "HTTP (env ABLETON_MCP_TRANSPORT)",
+    )
+    parser.add_argument(
+        "--host",
+        default=os.environ.get("ABLETON_MCP_HTTP_HOST", "127.0.0.1"),
+        help="Address to listen on with --transport sse (env ABLETON_MCP_HTTP_HOST)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.environ.get("ABLETON_MCP_HTTP_PORT", 8000)),
+        help="Port to listen on with --transport sse (env ABLETON_MCP_HTTP_PORT)",
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=scheduler.max_concurrent,
+        help="Tool calls running at once across all sessions "
+        "(env ABLETON_MCP_MAX_CONCURRENT)",
+    )
+    parser.add_argument(
+        "--session-concurrency",
+        type=int,
+        default=scheduler.per_session,
+        help="Tool calls running at once per session; further calls queue "
+        "(env ABLETON_MCP_SESSION_CONCURRENCY)",
+    )
+    args = parser.parse_args()
+
+    scheduler.configure(args.max_concurrent, args.session_concurrency)
+    if (args.trace_file or None) != tracer.path:
+        tracer.configure(args.trace_file or None)
+    if (args.journal or None) != journal.path:
+        journal.configure(args.journal or None)
+
+    if args.instances:
+        _registry.configure(parse_instances(args.instances))
+    else:
+        _registry.configure(
+            {
+                DEFAULT_INSTANCE: Endpoint(
+                    host=args.ableton_host,
+                    port=args.ableton_port,
+                    socket_path=args.ableton_socket or None,
+                )
+            }
+        )
+
+    if args.transport == "sse":
+        _shared_connections = True
+        mcp.settings.host = args.host
+        mcp.settings.port = args.port
+        logger.info(f"Serving MCP sessions at http://{args.host}:{args.port}/sse")
+        try:
+            mcp.run(transport="sse")
+        finally:
+            _registry.stop()
+    else:
+        mcp.run()
 
 
 if __name__ == "__main__":
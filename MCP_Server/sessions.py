@@ -0,0 +1,129 @@
+"""
+Per-session concurrency limits and fair queuing for tool calls.
+
+Over the SSE transport one server handles many MCP sessions, all sharing the
+connection to each Ableton instance. Every tool call first takes a slot from
+the FairScheduler: at most ``max_concurrent`` calls run at once, at most
+``per_session`` of them from the same session, and when calls are waiting the
+next slot goes to the session that was served least recently. One agent
+issuing a burst of calls therefore delays every other agent by at most a
+call or two instead of its whole backlog.
+
+Limits come from ABLETON_MCP_MAX_CONCURRENT (default 16) and
+ABLETON_MCP_SESSION_CONCURRENCY (default 4), or the matching CLI options.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Hashable
+
+from .stats import LatencyHistogram
+
+DEFAULT_MAX_CONCURRENT = 16
+DEFAULT_SESSION_CONCURRENCY = 4
+
+
+class FairScheduler:
+    """Admits tool calls round-robin across sessions within concurrency limits"""
+
+    def __init__(self, max_concurrent: int | None = None, per_session: int | None = None):
+        self.configure(max_concurrent, per_session)
+        self._running: dict[Hashable, int] = {}
+        # Sessions with waiting calls, least recently served first
+        self._waiting: OrderedDict[Hashable, deque[asyncio.Future]] = OrderedDict()
+        self._active = 0
+        self.queue_wait = LatencyHistogram()
+
+    def configure(self, max_concurrent: int | None = None, per_session: int | None = None):
+        self.max_concurrent = max_concurrent or int(
+            os.environ.get("ABLETON_MCP_MAX_CONCURRENT", DEFAULT_MAX_CONCURRENT)
+        )
+        self.per_session = per_session or int(
+            os.environ.get(
+                "ABLETON_MCP_SESSION_CONCURRENCY", DEFAULT_SESSION_CONCURRENCY
+            )
+        )
+
+    @asynccontextmanager
+    async def slot(self, session: Hashable) -> AsyncIterator[None]:
+        """Wait for this session's turn, and hold a slot for the block"""
+        start = time.perf_counter()
+        if self._waiting or not self._admissible(session):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiting.setdefault(session, deque()).append(waiter)
+            self._dispatch()
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted just as the caller gave up; pass the slot on
+                    self._release(session)
+                else:
+                    self._discard(session, waiter)
+                raise
+        else:
+            self._acquire(session)
+        self.queue_wait.record(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release(session)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "per_session": self.per_session,
+            "running": self._active,
+            "waiting": sum(len(waiters) for waiters in self._waiting.values()),
+            "sessions": len(self._running.keys() | self._waiting.keys()),
+            "queue_wait": self.queue_wait.summary(),
+        }
+
+    def _admissible(self, session: Hashable) -> bool:
+        return (
+            self._active < self.max_concurrent
+            and self._running.get(session, 0) < self.per_session
+        )
+
+    def _acquire(self, session: Hashable):
+        self._active += 1
+        self._running[session] = self._running.get(session, 0) + 1
+
+    def _release(self, session: Hashable):
+        self._active -= 1
+        self._running[session] -= 1
+        if not self._running[session]:
+            del self._running[session]
+        self._dispatch()
+
+    def _discard(self, session: Hashable, waiter: asyncio.Future):
+        waiters = self._waiting.get(session)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._waiting[session]
+
+    def _dispatch(self):
+        """Grant free slots, visiting waiting sessions in round-robin order"""
+        while self._waiting and self._active < self.max_concurrent:
+            for session, waiters in self._waiting.items():
+                if self._running.get(session, 0) < self.per_session:
+                    break
+            else:
+                return  # Every waiting session is at its own limit
+            waiter = waiters.popleft()
+            if waiters:
+                # Back of the line until the other sessions had a turn
+                self._waiting.move_to_end(session)
+            else:
+                del self._waiting[session]
+            if waiter.done():
+                continue  # Cancelled, not yet discarded by its caller
+            self._acquire(session)
+            waiter.set_result(None)
+
+
+scheduler = FairScheduler()
@@ -0,0 +1,173 @@
+"""
+Declarative session specs, reconciled against Live by diffing.
+
+A spec describes the tracks, devices, clips and notes a set should contain::
+
+    {
+        "tempo": 96,
+        "tracks": [
+            {
+                "name": "Drums",
+                "devices": ["drums/Drum Rack", "drums/Kits/808 Core Kit"],
+                "clips": [
+                    {"slot": 0, "name": "Beat", "length": 4, "notes": [...]}
+                ]
+            }
+        ]
+    }
+
+plan_operations() compares it with a session snapshot from the Remote Script,
+which also reports the device name each browser item loads as, and returns
+only the operations needed to get there. The Remote Script then runs them as
+one batch in a single main-thread task. Applying the same spec twice plans
+nothing.
+
+Tracks are matched by name, or by position when the spec gives an "index";
+unmatched tracks are created as MIDI tracks at the end of the set. Tracks,
+clips and devices the spec doesn't mention are left alone.
+"""
+
+from typing import Any
+
+from .protocol import notes_digest, notes_param
+
+
+def _device_spec(item: str) -> dict[str, str]:
+    # Browser URIs always have a scheme ("query:..."); anything else is a path
+    return {"uri": item} if ":" in item else {"path": item}
+
+
+def _match_tracks(
+    spec_tracks: list[dict[str, Any]], current: list[dict[str, Any]]
+) -> list[int | None]:
+    """Index of the existing track each spec track maps to, or None to create it"""
+    used: set[int] = set()
+    matches: list[int | None] = []
+    for track in spec_tracks:
+        if "index" in track:
+            index = track["index"]
+            if not 0 <= index < len(current):
+                raise ValueError(f"Track index {index} out of range")
+            matches.append(index)
+            used.add(index)
+            continue
+        matches.append(None)
+    for position, track in enumerate(spec_tracks):
+        if matches[position] is not None or "name" not in track:
+            continue
+        for existing in current:
+            if existing["index"] not in used and existing["name"] == track["name"]:
+                matches[position] = existing["index"]
+                used.add(existing["index"])
+                break
+    return matches
+
+
+def _clip_operations(
+    track_index: int,
+    spec_clip: dict[str, Any],
+    existing: dict[str, Any] | None,
+    encoding: str,
+) -> list[dict[str, Any]]:
+    slot = spec_clip["slot"]
+    default_length = existing["length"] if existing else 4.0
+    length = float(spec_clip.get("length", default_length))
+    notes = spec_clip.get("notes")
+    target = {"track_index": track_index, "clip_index": slot}
+    operations: list[dict[str, Any]] = []
+
+    if existing is not None and abs(existing["length"] - length) > 1e-9:
+        # Moves the loop and end marker; notes and name stay with the clip
+        operations.append({"op": "resize_clip", **target, "length": length})
+    if existing is None:
+        operations.append({"op": "create_clip", **target, "length": length})
+    if "name" in spec_clip and (
+        existing is None or existing["name"] != spec_clip["name"]
+    ):
+        operations.append(
+            {"op": "set_clip_name", **target, "name": spec_clip["name"]}
+        )
+    if notes is not None:
+        if existing is None:
+            changed = bool(notes)
+        else:
+            changed = existing.get("notes_digest") != notes_digest(notes)
+        if changed:
+            operations.append(
+                {
+                    "op": "replace_notes",
+                    **target,
+                    "notes_packed": notes_param(notes, encoding),
+                }
+            )
+    return operations
+
+
+def plan_operations(
+    spec: dict[str, Any], snapshot: dict[str, Any], encoding: str = "json"
+) -> list[dict[str, Any]]:
+    """The operations that turn the snapshotted session into the spec"""
+    operations: list[dict[str, Any]] = []
+    if "tempo" in spec and abs(snapshot["tempo"] - float(spec["tempo"])) > 1e-6:
+        operations.append({"op": "set_tempo", "tempo": float(spec["tempo"])})
+
+    current = snapshot["tracks"]
+    spec_tracks = spec.get("tracks", [])
+    next_index = len(current)
+    for spec_track, match in zip(spec_tracks, _match_tracks(spec_tracks, current)):
+        if match is None:
+            track_index = next_index
+            next_index += 1
+            existing: dict[str, Any] = {"name": None, "devices": [], "clips": []}
+            operations.append({"op": "create_midi_track", "index": -1})
+        else:
+            track_index = match
+            existing = current[match]
+
+        if "name" in spec_track and spec_track["name"] != existing["name"]:
+            operations.append(
+                {
+                    "op": "set_track_name",
+                    "track_index": track_index,
+                    "name": spec_track["name"],
+                }
+            )
+
+        devices = spec_track.get("devices", [])
+        resolved = snapshot.get("resolved", {})
+        if any(resolved.get(item) not in existing["devices"] for item in devices):
+            # The Remote Script loads only the ones that are really missing
+            operations.append(
+                {
+                    "op": "ensure_devices",
+                    "track_index": track_index,
+                    "items": [_device_spec(item) for item in devices],
+                }
+            )
+
+        clips = {clip["slot"]: clip for clip in existing["clips"]}
+        for spec_clip in spec_track.get("clips", []):
+            operations.extend(
+                _clip_operations(
+                    track_index, spec_clip, clips.get(spec_clip["slot"]), encoding
+                )
+            )
+    return operations
+
+
+def devices_to_resolve(spec: dict[str, Any]) -> list[str]:
+    """Browser items named in a spec, for the snapshot to report device names of"""
+    items: list[str] = []
+    for track in spec.get("tracks", []):
+        for item in track.get("devices", []):
+            if item not in items:
+                items.append(item)
+    return items
+
+
+def summarize_operations(operations: list[dict[str, Any]]) -> dict[str, int]:
+    """Count of each kind of operation in a plan"""
+    counts: dict[str, int] = {}
+    for operation in operations:
+        counts[operation["op"]] = counts.get(operation["op"], 0) + 1
+    return counts
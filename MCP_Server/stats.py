@@ -0,0 +1,108 @@
+"""Per-command latency histograms for the socket bridge."""
+
+import math
+import threading
+from typing import Any
+
+# Phases reported back by the Remote Script in each response. The client adds
+# its own encode, send, wait, receive, decode and total phases, plus
+# "transport": the part of the wait not accounted for by the remote phases.
+REMOTE_PHASES = ("queue_wait", "execute")
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram.
+
+    Eight buckets per doubling from 1 us gives percentiles within ~9% while
+    recording stays O(1) and memory stays at a few dozen sparse buckets.
+    """
+
+    MIN_SECONDS = 1e-6
+    BUCKETS_PER_OCTAVE = 8
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        if seconds <= self.MIN_SECONDS:
+            index = 0
+        else:
+            index = 1 + int(
+                math.log2(seconds / self.MIN_SECONDS) * self.BUCKETS_PER_OCTAVE
+            )
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Approximate q-th percentile (0-100) in seconds"""
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                upper = self.MIN_SECONDS * 2 ** (index / self.BUCKETS_PER_OCTAVE)
+                return min(upper, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class BridgeStats:
+    """Histograms keyed by command type and phase"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[str, dict[str, LatencyHistogram]] = {}
+
+    def record(self, command: str, phase: str, seconds: float):
+        with self._lock:
+            phases = self._histograms.get(command)
+            if phases is None:
+                phases = self._histograms[command] = {}
+            histogram = phases.get(phase)
+            if histogram is None:
+                histogram = phases[phase] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def histogram(self, command: str, phase: str) -> LatencyHistogram | None:
+        return self._histograms.get(command, {}).get(phase)
+
+    def summary(self, command: str, phase: str) -> dict[str, Any] | None:
+        """One histogram's summary, safe to call while other threads record"""
+        with self._lock:
+            histogram = self._histograms.get(command, {}).get(phase)
+            return histogram.summary() if histogram is not None else None
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, Any]]]:
+        with self._lock:
+            return {
+                command: {phase: h.summary() for phase, h in phases.items()}
+                for command, phases in sorted(self._histograms.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+# Process-wide statistics shared by all connections
+bridge_stats = BridgeStats()
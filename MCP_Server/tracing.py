@@ -0,0 +1,199 @@
+"""
+Request tracing across the MCP server and the Remote Script.
+
+Every command envelope carries a ``trace_id`` (shared by all commands a tool
+call sends) and the ``span_id`` of the send_command span. When a trace file
+is configured (``ABLETON_MCP_TRACE_FILE`` or ``--trace-file``), spans are
+appended to it as JSON lines, one Chrome trace event per line, and the Remote
+Script returns its own spans in each response so both sides land on one
+timeline. Convert the file for chrome://tracing or Perfetto with::
+
+    ableton-mcp-trace trace.jsonl -o trace.json
+"""
+
+import argparse
+import atexit
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+_current_trace: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "ableton_trace_id", default=None
+)
+_current_span: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "ableton_span_id", default=None
+)
+
+
+def new_id() -> str:
+    return os.urandom(8).hex()
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+
+
+class Tracer:
+    """Creates spans and appends them to a JSONL file of Chrome trace events"""
+
+    def __init__(self, path: str | None = None):
+        self._lock = threading.Lock()
+        self._file = None
+        self._pid = os.getpid()
+        self._named: set[tuple[int, int | None]] = set()
+        self.path = None
+        if path:
+            self.configure(path)
+
+    @property
+    def enabled(self) -> bool:
+        return self._file is not None
+
+    def configure(self, path: str | None):
+        """Start (or stop, with None) exporting spans to path"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.path = path
+            if path:
+                self._file = open(path, "a", buffering=1 << 16)
+                self._named.clear()
+        if path:
+            self._name_process(self._pid, "ableton-mcp server")
+
+    def close(self):
+        self.configure(None)
+
+    @contextmanager
+    def span(self, name: str, cat: str = "mcp", **args: Any) -> Iterator[Span]:
+        """
+        Open a span in the current trace, starting a new trace if there is none.
+
+        IDs are always maintained so envelopes can carry them; events are only
+        written when exporting is enabled.
+        """
+        trace_id = _current_trace.get()
+        trace_token = None
+        if trace_id is None:
+            trace_id = new_id()
+            trace_token = _current_trace.set(trace_id)
+        span = Span(trace_id, new_id(), _current_span.get())
+        span_token = _current_span.set(span.span_id)
+        start = time.time()
+        try:
+            yield span
+        finally:
+            _current_span.reset(span_token)
+            if trace_token is not None:
+                _current_trace.reset(trace_token)
+            if self._file is not None:
+                self.emit(
+                    {
+                        "name": name,
+                        "cat": cat,
+                        "ph": "X",
+                        "ts": start * 1e6,
+                        "dur": (time.time() - start) * 1e6,
+                        "pid": self._pid,
+                        "tid": threading.get_ident(),
+                        "args": dict(
+                            args,
+                            trace_id=span.trace_id,
+                            span_id=span.span_id,
+                            parent_id=span.parent_id,
+                        ),
+                    },
+                    flush=trace_token is not None,
+                )
+
+    @contextmanager
+    def join(self, trace_id: str | None, parent_id: str | None = None) -> Iterator[None]:
+        """Continue a trace started in another process, e.g. a bridge client's"""
+        if trace_id is None:
+            yield
+            return
+        trace_token = _current_trace.set(trace_id)
+        span_token = _current_span.set(parent_id)
+        try:
+            yield
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+
+    def emit(self, event: dict[str, Any], flush: bool = False):
+        """Append one trace event"""
+        line = json.dumps(event, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            if flush:
+                self._file.flush()
+
+    def emit_remote(self, events: list[dict[str, Any]], process_name: str):
+        """Append spans reported by the Remote Script, labelling its process once"""
+        for event in events:
+            self._name_process(event.get("pid", 0), process_name)
+            if event.get("tid") == 0:
+                self._name_thread(event.get("pid", 0), 0, "Live main thread")
+            self.emit(event)
+
+    def _name_process(self, pid: int, name: str):
+        if (pid, None) in self._named:
+            return
+        self._named.add((pid, None))
+        self.emit({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}})
+
+    def _name_thread(self, pid: int, tid: int, name: str):
+        if (pid, tid) in self._named:
+            return
+        self._named.add((pid, tid))
+        self.emit(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+        )
+
+
+tracer = Tracer(os.environ.get("ABLETON_MCP_TRACE_FILE") or None)
+atexit.register(tracer.close)
+
+
+def to_chrome_trace(jsonl_path: str) -> dict[str, Any]:
+    """Load a JSONL trace file into the Chrome trace JSON object format"""
+    events = []
+    with open(jsonl_path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                events.append(json.loads(line))
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert an ableton-mcp JSONL trace for chrome://tracing or Perfetto"
+    )
+    parser.add_argument("trace_file")
+    parser.add_argument("-o", "--output", default="trace.json")
+    args = parser.parse_args()
+    with open(args.output, "w") as f:
+        json.dump(to_chrome_trace(args.trace_file), f)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
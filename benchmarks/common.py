@@ -0,0 +1,111 @@
+"""Helpers shared by the benchmarks that drive the MCP server against FakeLive."""
+
+import logging
+import math
+import platform
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from MCP_Server import server
+from MCP_Server.connection import Endpoint
+
+from .fake_live import FakeLive
+
+
+class ToolError(Exception):
+    """A tool returned one of its "Error ..." strings"""
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Exact nearest-rank summary of latency samples given in seconds"""
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+
+    def rank(q: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 4),
+        "p50_ms": round(rank(0.50) * 1000, 4),
+        "p95_ms": round(rank(0.95) * 1000, 4),
+        "p99_ms": round(rank(0.99) * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def environment() -> dict[str, Any]:
+    """Where and on what revision a result was produced"""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=False,
+        ).stdout.strip()
+    except OSError:
+        revision = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "revision": revision or None,
+    }
+
+
+def quiet_logging():
+    """Keep per-connection INFO lines out of benchmark output"""
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+@contextmanager
+def server_against(*lives: FakeLive, cache_ttl: float = 0.0) -> Iterator[Any]:
+    """
+    Point the MCP server at one or more FakeLive instances.
+
+    With several, they are registered as instances "live0", "live1", ...
+    The response cache is off by default so repeated reads measure the bridge.
+    """
+    endpoints = {
+        ("default" if len(lives) == 1 else f"live{i}"): Endpoint(
+            "localhost", live.port, live.socket_path or None
+        )
+        for i, live in enumerate(lives)
+    }
+    registry = server._registry
+    registry.configure(endpoints, cache_ttl=cache_ttl)
+    registry.start()
+    try:
+        for name in endpoints:
+            registry.get_connection(name, timeout=10.0)
+        yield server
+    finally:
+        registry.stop()
+
+
+async def call_tool(name: str, arguments: dict[str, Any] | None = None) -> str:
+    """Call a tool through FastMCP exactly as an MCP client request would"""
+    contents = await server.mcp.call_tool(name, arguments or {})
+    text = "".join(getattr(content, "text", "") for content in contents)
+    if text.startswith("Error"):
+        raise ToolError(text)
+    return text
+
+
+async def time_tool(
+    name: str, arguments: dict[str, Any] | None = None, iterations: int = 50, warmup: int = 3
+) -> dict[str, float]:
+    """Latency summary of repeated calls to one tool"""
+    for _ in range(warmup):
+        await call_tool(name, arguments)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call_tool(name, arguments)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
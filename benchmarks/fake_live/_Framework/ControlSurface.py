@@ -0,0 +1,44 @@
+"""Stand-in for ``_Framework.ControlSurface`` backed by the fake Live Object Model."""
+
+import threading
+
+
+class ControlSurface(object):
+    """
+    Minimal ControlSurface: exposes song()/application(), logging, and
+    schedule_message() driven by the owning FakeLive's main-thread ticks.
+    """
+
+    def __init__(self, c_instance):
+        self._c_instance = c_instance
+        c_instance.register_surface(self)
+
+    def song(self):
+        return self._c_instance.song
+
+    def application(self):
+        return self._c_instance.application
+
+    def log_message(self, *messages):
+        self._c_instance.log_message(" ".join(str(m) for m in messages))
+
+    def show_message(self, message):
+        self._c_instance.show_message(message)
+
+    def schedule_message(self, delay_in_ticks, callback, parameter=None):
+        # Live asserts when asked to schedule from its own main thread
+        if threading.current_thread() is self._c_instance.main_thread:
+            raise AssertionError("schedule_message called on the main thread")
+        if parameter is not None:
+            original = callback
+
+            def callback():
+                original(parameter)
+
+        self._c_instance.schedule(delay_in_ticks, callback)
+
+    def update_display(self):
+        pass
+
+    def disconnect(self):
+        self._c_instance.unregister_surface(self)
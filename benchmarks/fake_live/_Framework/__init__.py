@@ -0,0 +1 @@
+"""Stand-in for Live's _Framework package (only what the Remote Script imports)."""
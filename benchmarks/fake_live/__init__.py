@@ -0,0 +1,3 @@
+"""Headless stand-in for Ableton Live for running the Remote Script offline."""
+
+from .harness import FakeLive
@@ -0,0 +1,52 @@
+"""
+Serve the Remote Script on top of the fake Live until interrupted.
+
+    python -m benchmarks.fake_live --tracks 64 --port 9877
+
+Point the MCP server (or a benchmark) at the printed port and socket.
+"""
+
+import argparse
+import time
+
+from .harness import FakeLive
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a headless fake Ableton Live")
+    parser.add_argument("--tracks", type=int, default=8)
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--devices", type=int, default=2)
+    parser.add_argument("--returns", type=int, default=2)
+    parser.add_argument("--browser-depth", type=int, default=3)
+    parser.add_argument("--browser-breadth", type=int, default=5)
+    parser.add_argument("--tick-interval", type=float, default=0.005)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument(
+        "--socket", default=None, help="Unix socket path; empty disables it"
+    )
+    args = parser.parse_args()
+
+    with FakeLive(
+        tracks=args.tracks,
+        slots=args.slots,
+        devices=args.devices,
+        returns=args.returns,
+        browser_depth=args.browser_depth,
+        browser_breadth=args.browser_breadth,
+        tick_interval=args.tick_interval,
+        port=args.port,
+        socket_path=args.socket,
+    ) as live:
+        print(f"Fake Live listening on port {live.port}")
+        if live.socket_path:
+            print(f"Unix socket: {live.socket_path}")
+        try:
+            while True:
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Run the unmodified AbletonMCP Remote Script on top of the fake Live Object Model.
+
+    with FakeLive(tracks=32, browser_depth=4, port=0) as live:
+        conn = AbletonConnection("localhost", live.port, socket_path=live.socket_path)
+        conn.send_command("get_session_info")
+
+FakeLive owns a "main thread" that ticks at tick_interval seconds, running
+callbacks passed to schedule_message() (whose delay is counted in ticks, as in
+Live), advancing the playhead while playing, and calling update_display() on
+the surface each tick.
+"""
+
+import heapq
+import importlib.util
+import itertools
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(HERE))
+REMOTE_SCRIPT = os.path.join(REPO_ROOT, "AbletonMCP_Remote_Script", "__init__.py")
+
+if HERE not in sys.path:
+    # Makes ``_Framework`` importable exactly as inside Live
+    sys.path.insert(0, HERE)
+
+from .lom import Application, Song  # noqa: E402
+
+_instance_ids = itertools.count()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+class CInstance(object):
+    """The c_instance object Live hands to create_instance()"""
+
+    def __init__(self, live):
+        self._live = live
+        self.song = live.song
+        self.application = live.application
+        self.messages = []
+
+    @property
+    def main_thread(self):
+        return self._live.main_thread
+
+    def register_surface(self, surface):
+        self._live.surfaces.append(surface)
+
+    def unregister_surface(self, surface):
+        if surface in self._live.surfaces:
+            self._live.surfaces.remove(surface)
+
+    def log_message(self, message):
+        self._live.log_lines += 1
+        if self._live.keep_log:
+            self.messages.append(message)
+
+    def show_message(self, message):
+        self.messages.append(message)
+
+    def schedule(self, delay_in_ticks, callback):
+        self._live.schedule(delay_in_ticks, callback)
+
+
+class FakeLive(object):
+    """A headless Live: song, browser, main-thread tick loop and a loaded Remote Script"""
+
+    def __init__(
+        self,
+        tracks=8,
+        slots=8,
+        devices=2,
+        returns=2,
+        browser_depth=3,
+        browser_breadth=5,
+        tick_interval=0.005,
+        port=None,
+        socket_path=None,
+        keep_log=False,
+        env=None,
+    ):
+        self.song = Song(tracks, slots, devices, returns)
+        self.application = Application(self.song, browser_depth, browser_breadth)
+        self.tick_interval = tick_interval
+        self.port = port or free_port()
+        if socket_path is None and hasattr(socket, "AF_UNIX"):
+            socket_path = os.path.join(
+                tempfile.gettempdir(),
+                "fake-live-{0}-{1}.sock".format(os.getpid(), next(_instance_ids)),
+            )
+        self.socket_path = socket_path or ""
+        self.keep_log = keep_log
+        self.env = dict(env or {})
+        self.surfaces = []
+        self.log_lines = 0
+        self.ticks = 0
+        self.script = None
+        self.module = None
+        self.main_thread = None
+        self._queue = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._running = False
+        self._last_tick = time.perf_counter()
+        self._started = threading.Event()
+
+    # Main thread
+
+    def schedule(self, delay_in_ticks, callback):
+        with self._lock:
+            heapq.heappush(
+                self._queue,
+                (self.ticks + max(1, delay_in_ticks), next(self._sequence), callback),
+            )
+
+    def _tick(self):
+        self.ticks += 1
+        now = time.perf_counter()
+        self.song.advance(now - self._last_tick)
+        self._last_tick = now
+        due = []
+        with self._lock:
+            while self._queue and self._queue[0][0] <= self.ticks:
+                due.append(heapq.heappop(self._queue)[2])
+        for callback in due:
+            try:
+                callback()
+            except Exception as e:
+                self.log_lines += 1
+                if self.keep_log:
+                    self.c_instance.messages.append("Tick error: " + str(e))
+        for surface in list(self.surfaces):
+            surface.update_display()
+
+    def _main_loop(self):
+        self._start_script()
+        self._started.set()
+        next_tick = self._last_tick = time.perf_counter()
+        while self._running:
+            self._tick()
+            next_tick += self.tick_interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    # Remote Script lifecycle
+
+    def _load_module(self):
+        """Load a fresh copy of the Remote Script so each FakeLive gets its own config"""
+        overrides = dict(self.env)
+        overrides["ABLETON_MCP_PORT"] = str(self.port)
+        overrides["ABLETON_MCP_SOCKET"] = self.socket_path
+        saved = {key: os.environ.get(key) for key in overrides}
+        os.environ.update(overrides)
+        try:
+            name = "AbletonMCP_fake_{0}".format(next(_instance_ids))
+            spec = importlib.util.spec_from_file_location(name, REMOTE_SCRIPT)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            return module
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    def _start_script(self):
+        self.c_instance = CInstance(self)
+        self.module = self._load_module()
+        self.script = self.module.create_instance(self.c_instance)
+
+    def start(self):
+        self._running = True
+        self.main_thread = threading.Thread(
+            target=self._main_loop, name="fake-live-main", daemon=True
+        )
+        self.main_thread.start()
+        self._started.wait(10.0)
+        return self
+
+    def stop(self):
+        if self.script is not None:
+            self.script.disconnect()
+            self.script = None
+        self._running = False
+        if self.main_thread is not None:
+            self.main_thread.join(2.0)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # Introspection for benchmarks
+
+    def thread_count(self):
+        return threading.active_count()
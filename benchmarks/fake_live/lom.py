@@ -0,0 +1,457 @@
+"""
+Pure-Python stand-ins for the parts of Live's Object Model the Remote Script uses.
+
+Only behaviour the Remote Script depends on is modelled; values are plain
+attributes and listeners are called synchronously when a modelled property
+changes.
+"""
+
+import bisect
+import math
+
+
+class _Listenable(object):
+    """Adds Live-style add_<prop>_listener/remove_<prop>_listener methods"""
+
+    def __init__(self):
+        self._listeners = {}
+
+    def __getattr__(self, name):
+        for action in ("add", "remove"):
+            prefix = action + "_"
+            if name.startswith(prefix) and name.endswith("_listener"):
+                prop = name[len(prefix) : -len("_listener")]
+                return lambda callback: self._change_listener(action, prop, callback)
+        raise AttributeError(name)
+
+    def _change_listener(self, action, prop, callback):
+        listeners = self.__dict__.setdefault("_listeners", {}).setdefault(prop, [])
+        if action == "add":
+            listeners.append(callback)
+        elif callback in listeners:
+            listeners.remove(callback)
+
+    def _notify(self, prop):
+        for callback in list(self.__dict__.get("_listeners", {}).get(prop, ())):
+            callback()
+
+
+class DeviceParameter(_Listenable):
+    def __init__(self, name, value=0.0, min=0.0, max=1.0, is_quantized=False):
+        _Listenable.__init__(self)
+        self.name = name
+        self.original_name = name
+        self._value = value
+        self.min = min
+        self.max = max
+        self.is_quantized = is_quantized
+        self.is_enabled = True
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        if value < self.min or value > self.max:
+            raise ValueError("Invalid value")
+        self._value = value
+        self._notify("value")
+
+
+class MixerDevice(object):
+    def __init__(self, sends=0):
+        self.volume = DeviceParameter("Track Volume", 0.85)
+        self.panning = DeviceParameter("Track Panning", 0.0, -1.0, 1.0)
+        self.sends = [DeviceParameter("Send " + chr(65 + i)) for i in range(sends)]
+
+
+class Device(object):
+    def __init__(self, name, class_name=None, device_type="audio_effect", parameters=8):
+        self.name = name
+        self.class_name = class_name or name.replace(" ", "")
+        self.class_display_name = name
+        self.type = device_type
+        self.can_have_drum_pads = device_type == "drum_machine"
+        self.can_have_chains = device_type in ("drum_machine", "rack")
+        self.parameters = [DeviceParameter("Device On", 1.0)] + [
+            DeviceParameter("Param {0}".format(i)) for i in range(1, parameters)
+        ]
+
+
+class AutomationEnvelope(object):
+    """Breakpoints joined by straight lines; a step is two breakpoints"""
+
+    def __init__(self, parameter):
+        self.parameter = parameter
+        self.breakpoints = []
+
+    def insert_step(self, time, duration, value):
+        bisect.insort(self.breakpoints, (time, value))
+        if duration > 0:
+            bisect.insort(self.breakpoints, (time + duration, value))
+
+    def value_at_time(self, time):
+        points = self.breakpoints
+        if not points:
+            return self.parameter.value
+        if time <= points[0][0]:
+            return points[0][1]
+        if time >= points[-1][0]:
+            return points[-1][1]
+        # The last breakpoint at or before time, and the one after it
+        index = bisect.bisect_right(points, (time, math.inf)) - 1
+        (t0, v0), (t1, v1) = points[index], points[index + 1]
+        return v0 + (v1 - v0) * (time - t0) / (t1 - t0) if t1 > t0 else v1
+
+
+class Clip(_Listenable):
+    def __init__(self, length=4.0, name="", is_midi_clip=True, start_time=0.0):
+        _Listenable.__init__(self)
+        self.name = name
+        self.loop_start = 0.0
+        self.loop_end = length
+        self.start_marker = 0.0
+        self.end_marker = length
+        self.is_midi_clip = is_midi_clip
+        self.is_audio_clip = not is_midi_clip
+        self.is_playing = False
+        self.is_recording = False
+        self.is_triggered = False
+        self.looping = True
+        self.start_time = start_time
+        self.end_time = start_time + length
+        self._notes = []
+        self._envelopes = {}
+
+    @property
+    def length(self):
+        return self.loop_end - self.loop_start
+
+    def set_notes(self, notes):
+        self._notes.extend(tuple(note) for note in notes)
+
+    def get_notes(self, from_time, from_pitch, time_span, pitch_span):
+        return tuple(
+            note
+            for note in self._notes
+            if from_time <= note[1] < from_time + time_span
+            and from_pitch <= note[0] < from_pitch + pitch_span
+        )
+
+    def remove_notes(self, from_time, from_pitch, time_span, pitch_span):
+        doomed = set(self.get_notes(from_time, from_pitch, time_span, pitch_span))
+        self._notes = [note for note in self._notes if note not in doomed]
+
+    def automation_envelope(self, parameter):
+        return self._envelopes.get(id(parameter))
+
+    def create_automation_envelope(self, parameter):
+        envelope = AutomationEnvelope(parameter)
+        self._envelopes[id(parameter)] = envelope
+        return envelope
+
+    def clear_envelope(self, parameter):
+        self._envelopes.pop(id(parameter), None)
+
+    def fire(self):
+        self.is_playing = True
+
+    def stop(self):
+        self.is_playing = False
+
+
+class ClipSlot(_Listenable):
+    def __init__(self, track):
+        _Listenable.__init__(self)
+        self._track = track
+        self.clip = None
+        self.is_playing = False
+        self.is_triggered = False
+        self.launch_beat = None
+
+    @property
+    def has_clip(self):
+        return self.clip is not None
+
+    @property
+    def has_stop_button(self):
+        return True
+
+    def create_clip(self, length):
+        if self.clip is not None:
+            raise RuntimeError("Clip slot already has a clip")
+        if length <= 0:
+            raise RuntimeError("Invalid clip length")
+        self.clip = Clip(length, is_midi_clip=self._track.has_midi_input)
+        self._notify("has_clip")
+
+    def delete_clip(self):
+        self.clip = None
+        self._notify("has_clip")
+
+    def fire(self):
+        if self.clip is not None:
+            self.clip.fire()
+            self.is_playing = True
+            song = self._track.song
+            if song is not None:
+                # Where Live's audio thread would start it, for benchmarks
+                self.launch_beat = song.launch_beat()
+
+    def stop(self):
+        if self.clip is not None:
+            self.clip.stop()
+        self.is_playing = False
+
+
+class Track(_Listenable):
+    def __init__(self, name, slots=8, devices=(), is_midi=True, sends=0):
+        _Listenable.__init__(self)
+        self.name = name
+        self.has_midi_input = is_midi
+        self.has_audio_input = not is_midi
+        self.mute = False
+        self.solo = False
+        self.arm = False
+        self.can_be_armed = True
+        self.mixer_device = MixerDevice(sends)
+        self.clip_slots = [ClipSlot(self) for _ in range(slots)]
+        self.devices = list(devices)
+        self.arrangement_clips = []
+        self.song = None
+
+    def add_arrangement_clip(self, clip):
+        self.arrangement_clips.append(clip)
+        self._notify("arrangement_clips")
+
+    def stop_all_clips(self):
+        for slot in self.clip_slots:
+            slot.stop()
+
+
+class Scene(_Listenable):
+    def __init__(self, song, name=""):
+        _Listenable.__init__(self)
+        self._song = song
+        self.name = name
+        self.tempo = -1.0
+        self.is_triggered = False
+
+    @property
+    def _index(self):
+        return self._song.scenes.index(self)
+
+    def fire(self):
+        index = self._index
+        for track in self._song.tracks:
+            if index < len(track.clip_slots):
+                track.clip_slots[index].fire()
+
+
+class SongView(object):
+    def __init__(self, song):
+        self.selected_track = song.tracks[0] if song.tracks else None
+        self.selected_scene = song.scenes[0] if song.scenes else None
+        self.highlighted_clip_slot = None
+
+
+class Song(_Listenable):
+    def __init__(self, tracks=8, slots=8, devices=2, returns=2):
+        _Listenable.__init__(self)
+        self._slots = slots
+        self._returns = returns
+        self.tempo = 120.0
+        self.signature_numerator = 4
+        self.signature_denominator = 4
+        self.is_playing = False
+        self._current_song_time = 0.0
+        self.clip_trigger_quantization = 4  # Live's q_bar
+        self.tracks = [
+            Track(
+                "{0}-MIDI".format(i + 1),
+                slots,
+                [Device("Device {0}".format(d)) for d in range(devices)],
+                sends=returns,
+            )
+            for i in range(tracks)
+        ]
+        for track in self.tracks:
+            track.song = self
+        self.return_tracks = [
+            Track("{0}-Return".format(chr(65 + i)), 0, is_midi=False)
+            for i in range(returns)
+        ]
+        self.master_track = Track("Master", 0, is_midi=False)
+        self.scenes = [Scene(self) for _ in range(slots)]
+        self.view = SongView(self)
+
+    # Transport
+
+    @property
+    def current_song_time(self):
+        return self._current_song_time
+
+    @current_song_time.setter
+    def current_song_time(self, value):
+        self._current_song_time = value
+        self._notify("current_song_time")
+
+    def advance(self, seconds):
+        """Move the playhead as Live's audio thread would while playing"""
+        if self.is_playing:
+            self.current_song_time = self._current_song_time + seconds * self.tempo / 60.0
+
+    def launch_beat(self):
+        """Beat at which a clip fired now starts, given the launch quantization"""
+        bars = {1: 8, 2: 4, 3: 2, 4: 1}
+        beats = {5: 2.0, 7: 1.0, 9: 0.5, 11: 0.25, 13: 0.125}
+        value = self.clip_trigger_quantization
+        if value in bars:
+            step = bars[value] * self.signature_numerator * 4.0 / self.signature_denominator
+        else:
+            step = beats.get(value, 0.0)
+        if not step or not self.is_playing:
+            return self._current_song_time
+        return math.ceil(self._current_song_time / step - 1e-9) * step
+
+    def start_playing(self):
+        self.is_playing = True
+        self._notify("is_playing")
+
+    def stop_playing(self):
+        self.is_playing = False
+        self._notify("is_playing")
+
+    def stop_all_clips(self, quantized=True):
+        for track in self.tracks:
+            track.stop_all_clips()
+
+    # Tracks
+
+    def _insert_track(self, index, track):
+        if index == -1:
+            index = len(self.tracks)
+        if index < 0 or index > len(self.tracks):
+            raise IndexError("Track index out of range")
+        self.tracks.insert(index, track)
+        track.song = self
+        self._notify("tracks")
+        return track
+
+    def create_midi_track(self, index=-1):
+        name = "{0}-MIDI".format(len(self.tracks) + 1)
+        return self._insert_track(
+            index, Track(name, len(self.scenes), sends=self._returns)
+        )
+
+    def create_audio_track(self, index=-1):
+        name = "{0}-Audio".format(len(self.tracks) + 1)
+        return self._insert_track(
+            index, Track(name, len(self.scenes), is_midi=False, sends=self._returns)
+        )
+
+    def delete_track(self, index):
+        del self.tracks[index]
+        self._notify("tracks")
+
+    # Scenes
+
+    def create_scene(self, index=-1):
+        scene = Scene(self)
+        if index == -1:
+            index = len(self.scenes)
+        self.scenes.insert(index, scene)
+        for track in self.tracks:
+            track.clip_slots.insert(index, ClipSlot(track))
+        self._notify("scenes")
+        return scene
+
+    def delete_scene(self, index):
+        del self.scenes[index]
+        for track in self.tracks:
+            del track.clip_slots[index]
+        self._notify("scenes")
+
+    def duplicate_scene(self, index):
+        self.create_scene(index + 1)
+        self.scenes[index + 1].name = self.scenes[index].name
+        for track in self.tracks:
+            source = track.clip_slots[index].clip
+            if source is not None:
+                copy = Clip(source.length, source.name, source.is_midi_clip)
+                copy.set_notes(source._notes)
+                track.clip_slots[index + 1].clip = copy
+
+    def capture_and_insert_scene(self):
+        index = self.scenes.index(self.view.selected_scene) + 1
+        self.create_scene(index)
+        for track in self.tracks:
+            for slot in track.clip_slots:
+                if slot.is_playing and slot.clip is not None:
+                    copy = Clip(slot.clip.length, slot.clip.name, slot.clip.is_midi_clip)
+                    copy.set_notes(slot.clip._notes)
+                    track.clip_slots[index].clip = copy
+                    break
+
+
+class BrowserItem(object):
+    def __init__(self, name, uri, children=(), is_device=False, is_loadable=True):
+        self.name = name
+        self.uri = uri
+        self.children = list(children)
+        self.is_folder = bool(self.children)
+        self.is_device = is_device
+        self.is_loadable = is_loadable and not self.children
+
+
+def build_browser_category(name, depth, breadth):
+    """Build a category tree with breadth children per folder, depth levels deep"""
+
+    def build(prefix, level):
+        if level == depth:
+            return [
+                BrowserItem(
+                    "{0} {1}".format(name, i),
+                    "query:{0}#{1}:{2}".format(name, prefix, i),
+                    is_device=True,
+                )
+                for i in range(breadth)
+            ]
+        return [
+            BrowserItem(
+                "Folder {0}".format(i),
+                "query:{0}#{1}:{2}".format(name, prefix, i),
+                build("{0}:{1}".format(prefix, i), level + 1),
+                is_loadable=False,
+            )
+            for i in range(breadth)
+        ]
+
+    return BrowserItem(name, "query:" + name, build("", 1), is_loadable=False)
+
+
+class Browser(object):
+    def __init__(self, song, depth=3, breadth=5):
+        self._song = song
+        self.instruments = build_browser_category("Instruments", depth, breadth)
+        self.sounds = build_browser_category("Sounds", depth, breadth)
+        self.drums = build_browser_category("Drums", depth, breadth)
+        self.audio_effects = build_browser_category("Audio Effects", depth, breadth)
+        self.midi_effects = build_browser_category("MIDI Effects", depth, breadth)
+        self.user_library = build_browser_category("User Library", depth, breadth)
+
+    def load_item(self, item):
+        track = self._song.view.selected_track
+        if track is None:
+            raise RuntimeError("No track selected")
+        device_type = "drum_machine" if "Drum" in item.name else "instrument"
+        track.devices.append(Device(item.name, device_type=device_type))
+
+
+class Application(object):
+    def __init__(self, song, browser_depth=3, browser_breadth=5):
+        self.browser = Browser(song, browser_depth, browser_breadth)
+
+    def get_major_version(self):
+        return 12
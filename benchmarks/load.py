@@ -0,0 +1,366 @@
+"""
+Multi-client load generator and soak test for the socket bridge.
+
+Opens N client connections, each in its own thread, and issues a weighted
+mix of commands at a target rate. Every report interval it prints
+throughput, latency percentiles and errors, together with the thread count
+and resident memory of the process running the Remote Script, so leaks show
+up as growth over a long run.
+
+    python -m benchmarks.load --clients 16 --duration 60
+    python -m benchmarks.load --clients 4 --rate 20 --duration 14400 --output soak.json
+    python -m benchmarks.load --port 9877 --pid $(pgrep -f Live)   # an existing instance
+
+By default a fake Live is started in a subprocess so its threads and memory
+are measured separately from the load generator.
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any
+
+from MCP_Server.connection import AbletonConnection
+from MCP_Server.stats import LatencyHistogram
+
+from .common import environment, quiet_logging
+from .fake_live.harness import REPO_ROOT, free_port
+
+# Command templates available to --mix
+COMMANDS: dict[str, dict[str, Any]] = {
+    "ping": {},
+    "get_session_info": {},
+    "get_track_info": {"track_index": 0},
+    "get_browser_items_at_path": {"path": "instruments"},
+    "set_tempo": {"tempo": 120.0},
+    "set_track_name": {"track_index": 0, "name": "Load"},
+    "start_playback": {},
+    "stop_playback": {},
+}
+
+DEFAULT_MIX = "get_session_info=6,get_track_info=3,ping=2,set_tempo=1"
+
+
+def parse_mix(text: str) -> list[tuple[str, int]]:
+    """Parse "command=weight,..." into (command, weight) pairs"""
+    mix = []
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in COMMANDS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown command '{name}' (choose from {', '.join(COMMANDS)})"
+            )
+        mix.append((name, int(weight or 1)))
+    return mix
+
+
+def process_stats(pid: int | None) -> dict[str, Any]:
+    """Thread count and resident memory of a process, from /proc (Linux only)"""
+    if pid is None:
+        return {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return {}
+    return {
+        "threads": int(fields["Threads"]),
+        "rss_mb": round(int(fields["VmRSS"].split()[0]) / 1024, 1),
+    }
+
+
+class LoadRecorder:
+    """Latency and error counts for the current interval and the whole run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = LatencyHistogram()
+        self.interval = LatencyHistogram()
+        self.errors = 0
+        self.interval_errors = 0
+        self.error_samples: list[str] = []
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.total.record(seconds)
+            self.interval.record(seconds)
+
+    def error(self, message: str):
+        with self._lock:
+            self.errors += 1
+            self.interval_errors += 1
+            if len(self.error_samples) < 10:
+                self.error_samples.append(message)
+
+    def rotate(self) -> tuple[LatencyHistogram, int]:
+        """Return and reset the current interval"""
+        with self._lock:
+            interval, errors = self.interval, self.interval_errors
+            self.interval = LatencyHistogram()
+            self.interval_errors = 0
+        return interval, errors
+
+
+def client_loop(
+    host: str,
+    port: int,
+    socket_path: str | None,
+    mix: list[tuple[str, int]],
+    rate: float,
+    reconnect_every: int,
+    recorder: LoadRecorder,
+    stop: threading.Event,
+    seed: int,
+):
+    """One client connection issuing commands until stop is set"""
+    rng = random.Random(seed)
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    connection = AbletonConnection(host, port, socket_path=socket_path)
+    sent = 0
+    next_send = time.perf_counter()
+    while not stop.is_set():
+        if rate > 0:
+            delay = next_send - time.perf_counter()
+            if delay > 0 and stop.wait(delay):
+                break
+            next_send += 1.0 / rate
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            connection.send_command(name, dict(COMMANDS[name]))
+            recorder.record(time.perf_counter() - start)
+        except Exception as e:
+            recorder.error(f"{name}: {e}")
+        sent += 1
+        if reconnect_every and sent % reconnect_every == 0:
+            connection.disconnect()
+    connection.disconnect()
+
+
+def start_fake_live(tracks: int) -> tuple[subprocess.Popen, int, str | None]:
+    """Run benchmarks.fake_live in a subprocess and wait until it accepts connections"""
+    port = free_port()
+    socket_path = None
+    if hasattr(socket, "AF_UNIX"):
+        socket_path = os.path.join(
+            tempfile.gettempdir(), f"ableton-mcp-load-{os.getpid()}.sock"
+        )
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.fake_live",
+            "--tracks",
+            str(tracks),
+            "--port",
+            str(port),
+            "--socket",
+            socket_path or "",
+        ],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 15.0
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("localhost", port), timeout=0.2).close()
+            return process, port, socket_path
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Fake Live did not start")
+
+
+def remote_threads(host: str, port: int, socket_path: str | None) -> int | None:
+    """Client handler threads the Remote Script reports, not counting this query's own"""
+    connection = AbletonConnection(host, port, socket_path=socket_path)
+    try:
+        return connection.send_command("get_bridge_stats")["client_threads"] - 1
+    except Exception:
+        return None
+    finally:
+        connection.disconnect()
+
+
+def run(options) -> dict[str, Any]:
+    process = None
+    host, port, socket_path, pid = (
+        options.host,
+        options.port,
+        options.socket or None,
+        options.pid,
+    )
+    if port is None:
+        process, port, socket_path = start_fake_live(options.tracks)
+        pid = process.pid
+
+    recorder = LoadRecorder()
+    stop = threading.Event()
+    intervals = []
+    baseline = process_stats(pid)
+    try:
+        threads = [
+            threading.Thread(
+                target=client_loop,
+                args=(
+                    host,
+                    port,
+                    socket_path,
+                    options.mix,
+                    options.rate,
+                    options.reconnect_every,
+                    recorder,
+                    stop,
+                    seed,
+                ),
+                name=f"load-client-{seed}",
+                daemon=True,
+            )
+            for seed in range(options.clients)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        deadline = started + options.duration
+        while time.perf_counter() < deadline:
+            time.sleep(min(options.report_interval, deadline - time.perf_counter()))
+            histogram, errors = recorder.rotate()
+            elapsed = time.perf_counter() - started
+            summary = histogram.summary()
+            interval = {
+                "elapsed_s": round(elapsed, 1),
+                "throughput_per_s": round(
+                    histogram.count / options.report_interval, 1
+                ),
+                "errors": errors,
+                "p50_ms": summary["p50_ms"],
+                "p95_ms": summary["p95_ms"],
+                "p99_ms": summary["p99_ms"],
+                "remote_client_threads": remote_threads(host, port, socket_path),
+                **{f"remote_{k}": v for k, v in process_stats(pid).items()},
+            }
+            intervals.append(interval)
+            print(
+                "t={elapsed_s}s ops/s={throughput_per_s} errors={errors} "
+                "p50={p50_ms}ms p95={p95_ms}ms p99={p99_ms}ms "
+                "threads={threads} rss={rss}MB".format(
+                    threads=interval.get("remote_threads", "?"),
+                    rss=interval.get("remote_rss_mb", "?"),
+                    **interval,
+                ),
+                file=sys.stderr,
+            )
+
+        stop.set()
+        for thread in threads:
+            thread.join(5.0)
+        elapsed = time.perf_counter() - started
+        # Give the Remote Script a moment to reap the closed connections
+        time.sleep(0.5)
+        final = process_stats(pid)
+        final_client_threads = remote_threads(host, port, socket_path)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(5.0)
+            if socket_path and os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+    total = recorder.total
+    ops = total.count + recorder.errors
+    return {
+        "benchmark": "load",
+        "environment": environment(),
+        "options": {
+            "clients": options.clients,
+            "rate_per_client": options.rate,
+            "duration_s": options.duration,
+            "mix": dict(options.mix),
+            "reconnect_every": options.reconnect_every,
+        },
+        "throughput_per_s": round(total.count / elapsed, 1),
+        "commands": total.count,
+        "errors": recorder.errors,
+        "error_rate": round(recorder.errors / ops, 6) if ops else 0.0,
+        "error_samples": recorder.error_samples,
+        "latency": total.summary(),
+        "remote": {
+            "start": baseline,
+            "end": final,
+            "thread_growth": (
+                final["threads"] - baseline["threads"]
+                if "threads" in final and "threads" in baseline
+                else None
+            ),
+            "rss_growth_mb": (
+                round(final["rss_mb"] - baseline["rss_mb"], 1)
+                if "rss_mb" in final and "rss_mb" in baseline
+                else None
+            ),
+            "client_threads_after_run": final_client_threads,
+        },
+        "intervals": intervals,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="Commands per second per client (0: as fast as possible)",
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix(DEFAULT_MIX),
+        help=f"Weighted command mix (default {DEFAULT_MIX})",
+    )
+    parser.add_argument(
+        "--reconnect-every",
+        type=int,
+        default=0,
+        help="Reconnect each client after this many commands (0: never)",
+    )
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument("--tracks", type=int, default=16, help="Fake Live tracks")
+    parser.add_argument(
+        "--host", default="localhost", help="Remote Script host (with --port)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Load an already running Remote Script instead of starting a fake Live",
+    )
+    parser.add_argument("--socket", help="Unix socket of the running Remote Script")
+    parser.add_argument(
+        "--pid", type=int, help="Process to sample threads and memory from (Linux)"
+    )
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    options = parser.parse_args()
+
+    quiet_logging()
+    result = run(options)
+    text = json.dumps(result, indent=2)
+    if options.output:
+        with open(options.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Cold-start benchmark for the ableton-mcp server.
+
+Spawns the server over stdio the way an MCP client does and measures the time
+from process start to the end of the ``initialize`` handshake and to the first
+``tools/list`` response. No Ableton instance is needed; startup must not wait
+for one.
+
+    python -m benchmarks.startup --runs 10 --output startup.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+
+async def measure_once(command: str, args: list[str], errlog) -> dict[str, float]:
+    """Spawn one server process and time the handshake and first tool list"""
+    params = StdioServerParameters(command=command, args=args)
+    start = time.perf_counter()
+    async with stdio_client(params, errlog=errlog) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            initialized = time.perf_counter()
+            tools = await session.list_tools()
+            listed = time.perf_counter()
+    return {
+        "initialize_ms": (initialized - start) * 1000,
+        "first_tool_list_ms": (listed - start) * 1000,
+        "tool_count": len(tools.tools),
+    }
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "min": round(ordered[0], 2),
+        "median": round(statistics.median(ordered), 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+async def run(runs: int, command: str, args: list[str], errlog) -> dict:
+    samples = [await measure_once(command, args, errlog) for _ in range(runs)]
+    return {
+        "benchmark": "startup",
+        "runs": runs,
+        "command": " ".join([command, *args]),
+        "tool_count": samples[-1]["tool_count"],
+        "initialize_ms": summarize([s["initialize_ms"] for s in samples]),
+        "first_tool_list_ms": summarize([s["first_tool_list_ms"] for s in samples]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--command",
+        default=sys.executable,
+        help="Server executable (default: this interpreter running MCP_Server.server)",
+    )
+    parser.add_argument("--args", nargs="*", default=["-m", "MCP_Server.server"])
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    parser.add_argument(
+        "--show-server-logs", action="store_true", help="Pass server stderr through"
+    )
+    options = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        errlog = sys.stderr if options.show_server_logs else devnull
+        result = asyncio.run(run(options.runs, options.command, options.args, errlog))
+    text = json.dumps(result, indent=2)
+    if options.output:
+        with open(options.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
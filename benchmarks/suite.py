@@ -0,0 +1,611 @@
+"""
+End-to-end benchmark suite: MCP server tools against the fake Live.
+
+Every measurement goes through ``FastMCP.call_tool`` and the real socket
+bridge, so it includes argument validation, formatting, the connection
+manager and the Remote Script's main-thread scheduling.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --output new.json --compare results.json
+
+Groups:
+
+- roundtrip: latency of every tool (and a raw ping) on a small session
+- notes: add_notes_to_clip with 10 to 100k notes
+- browser: tree, path and URI lookups over libraries of 1k to 200k items
+- session: session and track reads for 10 to 500 tracks
+- concurrency: concurrent tool calls, 1 to 16 in flight
+- instances: parallel session reads across 1 to 4 instances, and cached reads
+- arrangement: time-range queries and clip reads over 1k to 100k
+  arrangement clips
+- midi: import_midi_file and export_clip_midi of files with 10k to 100k notes
+- launch: start-time spread of four clips fired one by one or as one scheduled
+  launch, and the scheduled launch's distance from its target beat
+
+``--compare`` prints the change in p50 latency (or throughput) for every
+result present in both files and exits with status 1 when any regressed by
+more than ``--threshold``.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable
+
+from .common import (
+    call_tool,
+    environment,
+    percentiles,
+    quiet_logging,
+    server_against,
+    time_tool,
+)
+from .fake_live import FakeLive
+from .fake_live.lom import Clip
+
+Results = dict[str, dict[str, Any]]
+
+NOTE_COUNTS = [10, 100, 1_000, 10_000, 100_000]
+BROWSER_SIZES = [1_000, 10_000, 50_000, 200_000]
+TRACK_COUNTS = [10, 50, 100, 500]
+CONCURRENCY = [1, 4, 16]
+INSTANCE_COUNTS = [1, 2, 4]
+ARRANGEMENT_CLIPS = [1_000, 10_000, 100_000]
+MIDI_NOTE_COUNTS = [10_000, 100_000]
+
+QUICK_NOTE_COUNTS = [10, 1_000, 10_000]
+QUICK_BROWSER_SIZES = [1_000, 10_000]
+QUICK_TRACK_COUNTS = [10, 100]
+QUICK_ARRANGEMENT_CLIPS = [1_000, 10_000]
+QUICK_MIDI_NOTE_COUNTS = [10_000]
+
+BROWSER_CATEGORIES = 5
+BROWSER_DEPTH = 3
+
+
+def browser_item_count(breadth: int, depth: int = BROWSER_DEPTH) -> int:
+    """Items (folders and devices) in a fake browser of the given shape"""
+    return BROWSER_CATEGORIES * sum(breadth**level for level in range(1, depth + 1))
+
+
+def breadth_for(items: int, depth: int = BROWSER_DEPTH) -> int:
+    """Smallest folder breadth whose browser has at least items entries"""
+    breadth = 2
+    while browser_item_count(breadth, depth) < items:
+        breadth += 1
+    return breadth
+
+
+def make_notes(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "pitch": 36 + i % 48,
+            "start_time": i * 0.25,
+            "duration": 0.25,
+            "velocity": 100,
+        }
+        for i in range(count)
+    ]
+
+
+async def time_calls(
+    call: Callable[[int], Awaitable[Any]], iterations: int
+) -> dict[str, float]:
+    """Latency summary of call(i) for i in range(iterations)"""
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        await call(i)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+# Groups
+
+
+async def bench_roundtrip(options) -> Results:
+    results: Results = {}
+    reads = options.iterations
+    # Modifying commands include the bridge's settle delay, so fewer samples
+    writes = max(3, options.iterations // 10)
+
+    with FakeLive(tracks=8, slots=writes + 1, tick_interval=options.tick) as live:
+        with server_against(live) as srv:
+            ableton = srv.get_ableton_connection()
+            results["roundtrip/ping"] = await time_calls(
+                lambda i: asyncio.to_thread(ableton.ping), reads
+            )
+            for name, arguments in [
+                ("get_connection_status", {}),
+                ("get_session_info", {}),
+                ("get_track_info", {"track_index": 0}),
+                ("get_browser_tree", {"category_type": "instruments"}),
+                ("get_browser_items_at_path", {"path": "instruments"}),
+                ("get_mixer_state", {}),
+            ]:
+                results[f"roundtrip/{name}"] = await time_tool(name, arguments, reads)
+
+            await call_tool("create_clip", {"track_index": 0, "clip_index": 0})
+            for name, arguments in [
+                ("set_tempo", {"tempo": 121.0}),
+                ("set_track_name", {"track_index": 0, "name": "Bench"}),
+                ("set_clip_name", {"track_index": 0, "clip_index": 0, "name": "c"}),
+                ("fire_clip", {"track_index": 0, "clip_index": 0}),
+                ("stop_clip", {"track_index": 0, "clip_index": 0}),
+                ("start_playback", {}),
+                ("stop_playback", {}),
+                (
+                    "add_notes_to_clip",
+                    {"track_index": 0, "clip_index": 0, "notes": make_notes(4)},
+                ),
+                (
+                    "write_automation",
+                    {
+                        "track_index": 0,
+                        "clip_index": 0,
+                        "device_index": 0,
+                        "parameter": "1",
+                        "values": [
+                            0.5 + 0.4 * math.sin(i * math.pi / 128) for i in range(1024)
+                        ],
+                        "step": 1 / 64,
+                    },
+                ),
+                (
+                    "set_mixer_state",
+                    {"state": {"tracks": {"index": list(range(8)), "volume": [0.7] * 8}}},
+                ),
+            ]:
+                results[f"roundtrip/{name}"] = await time_tool(
+                    name, arguments, writes, warmup=1
+                )
+
+            # Create/delete pairs keep the session the same size
+            results["roundtrip/create_clip"] = await time_calls(
+                lambda i: call_tool(
+                    "create_clip", {"track_index": 1, "clip_index": i}
+                ),
+                writes,
+            )
+            results["roundtrip/delete_clip"] = await time_calls(
+                lambda i: call_tool(
+                    "delete_clip", {"track_index": 1, "clip_index": i}
+                ),
+                writes,
+            )
+            results["roundtrip/create_midi_track"] = await time_calls(
+                lambda i: call_tool("create_midi_track", {}), writes
+            )
+            results["roundtrip/delete_track"] = await time_calls(
+                lambda i: call_tool("delete_track", {"track_index": 8}), writes
+            )
+            # Alternating create/clear of a 6-track grid, one command each
+            grid = {"first_track": 2, "last_track": 7, "first_slot": 0}
+            results["roundtrip/edit_clip_grid"] = await time_calls(
+                lambda i: call_tool(
+                    "edit_clip_grid",
+                    {"action": "clear" if i % 2 else "create", "last_slot": writes, **grid},
+                ),
+                writes,
+            )
+    return results
+
+
+async def bench_notes(options) -> Results:
+    results: Results = {}
+    counts = QUICK_NOTE_COUNTS if options.quick else NOTE_COUNTS
+    iterations = 3 if options.quick else 5
+    with FakeLive(
+        tracks=len(counts), slots=iterations, tick_interval=options.tick
+    ) as live:
+        with server_against(live):
+            for track, count in enumerate(counts):
+                notes = make_notes(count)
+                for slot in range(iterations):
+                    await call_tool(
+                        "create_clip",
+                        {
+                            "track_index": track,
+                            "clip_index": slot,
+                            "length": notes[-1]["start_time"] + 1.0,
+                        },
+                    )
+                result = await time_calls(
+                    lambda i: call_tool(
+                        "add_notes_to_clip",
+                        {"track_index": track, "clip_index": i, "notes": notes},
+                    ),
+                    iterations,
+                )
+                result["notes_per_s"] = round(count / (result["p50_ms"] / 1000))
+                results[f"notes/add_notes_to_clip/{count}"] = result
+    return results
+
+
+async def bench_browser(options) -> Results:
+    results: Results = {}
+    sizes = QUICK_BROWSER_SIZES if options.quick else BROWSER_SIZES
+    iterations = max(3, options.iterations // 10)
+    for size in sizes:
+        breadth = breadth_for(size)
+        items = browser_item_count(breadth)
+        with FakeLive(
+            tracks=2,
+            browser_depth=BROWSER_DEPTH,
+            browser_breadth=breadth,
+            tick_interval=options.tick,
+        ) as live:
+            with server_against(live):
+                last = breadth - 1
+                deepest_uri = "query:Instruments#:{0}:{0}:{0}".format(last)
+                cases = [
+                    ("get_browser_tree", {"category_type": "instruments"}),
+                    ("get_browser_tree", {"category_type": "all"}),
+                    (
+                        "get_browser_items_at_path",
+                        {"path": f"instruments/Folder {last}/Folder {last}"},
+                    ),
+                    (
+                        "load_instrument_or_effect",
+                        {"track_index": 0, "uri": deepest_uri},
+                    ),
+                ]
+                for name, arguments in cases:
+                    suffix = arguments.get("category_type", "")
+                    key = f"browser/{name}{'/' + suffix if suffix else ''}/{size}"
+                    result = await time_tool(name, arguments, iterations, warmup=1)
+                    result["items"] = items
+                    results[key] = result
+    return results
+
+
+async def bench_session(options) -> Results:
+    results: Results = {}
+    counts = QUICK_TRACK_COUNTS if options.quick else TRACK_COUNTS
+    for count in counts:
+        with FakeLive(tracks=count, slots=8, tick_interval=options.tick) as live:
+            with server_against(live):
+                results[f"session/get_session_info/{count}"] = await time_tool(
+                    "get_session_info", {}, options.iterations
+                )
+                results[f"session/get_track_info/{count}"] = await time_tool(
+                    "get_track_info", {"track_index": count - 1}, options.iterations
+                )
+
+                # What an agent does to survey a session: one read per track
+                async def read_all(_):
+                    for index in range(count):
+                        await call_tool("get_track_info", {"track_index": index})
+
+                results[f"session/read_all_tracks/{count}"] = await time_calls(
+                    read_all, 3
+                )
+    return results
+
+
+async def bench_concurrency(options) -> Results:
+    results: Results = {}
+    calls = options.iterations * 2
+    with FakeLive(tracks=16, tick_interval=options.tick) as live:
+        with server_against(live):
+            for in_flight in CONCURRENCY:
+                samples: list[float] = []
+
+                async def timed_call():
+                    start = time.perf_counter()
+                    await call_tool("get_session_info", {})
+                    samples.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                for _ in range(0, calls, in_flight):
+                    await asyncio.gather(*(timed_call() for _ in range(in_flight)))
+                elapsed = time.perf_counter() - start
+                result = percentiles(samples)
+                result["throughput_per_s"] = round(len(samples) / elapsed, 1)
+                results[f"concurrency/get_session_info/{in_flight}"] = result
+    return results
+
+
+async def bench_instances(options) -> Results:
+    results: Results = {}
+    for count in INSTANCE_COUNTS:
+        lives = [FakeLive(tracks=16, tick_interval=options.tick) for _ in range(count)]
+        for live in lives:
+            live.start()
+        try:
+            with server_against(*lives):
+                results[f"instances/get_all_session_info/{count}"] = await time_tool(
+                    "get_all_session_info", {}, options.iterations
+                )
+        finally:
+            for live in lives:
+                live.stop()
+
+    with FakeLive(tracks=16, tick_interval=options.tick) as live:
+        with server_against(live, cache_ttl=60.0):
+            results["instances/get_session_info/cache_hit"] = await time_tool(
+                "get_session_info", {}, options.iterations
+            )
+            results["instances/get_browser_tree/cache_hit"] = await time_tool(
+                "get_browser_tree", {"category_type": "all"}, options.iterations
+            )
+    return results
+
+
+async def bench_arrangement(options) -> Results:
+    results: Results = {}
+    tracks = 16
+    sizes = QUICK_ARRANGEMENT_CLIPS if options.quick else ARRANGEMENT_CLIPS
+    for size in sizes:
+        per_track = size // tracks
+        with FakeLive(tracks=tracks, tick_interval=options.tick) as live:
+            for track in live.song.tracks:
+                for i in range(per_track):
+                    track.add_arrangement_clip(Clip(8.0, start_time=i * 16.0))
+            with server_against(live):
+                # Bars 33-48 of every track, then one clip's notes per track
+                results[f"arrangement/query_arrangement/{size}"] = await time_tool(
+                    "query_arrangement",
+                    {"start_bar": 33, "end_bar": 48},
+                    options.iterations,
+                    warmup=1,
+                )
+                clips = [
+                    {"track_index": index, "start_time": 128.0}
+                    for index in range(tracks)
+                ]
+                results[f"arrangement/get_arrangement_clips/{size}"] = await time_tool(
+                    "get_arrangement_clips", {"clips": clips}, options.iterations
+                )
+    return results
+
+
+def write_test_midi(path: str, count: int, division: int = 96):
+    """A one-track SMF of count sixteenth notes, in running status"""
+    step = division // 4
+    events = bytearray(b"\x00\x90")
+    for i in range(count):
+        pitch = 36 + (i * 7) % 48
+        if i:
+            events.append(step // 2)
+        events += bytes([pitch, 100, step // 2, pitch, 0])
+    events += b"\x00\xff\x2f\x00"
+    with open(path, "wb") as f:
+        f.write(b"MThd" + struct.pack(">IHHH", 6, 0, 1, division))
+        f.write(b"MTrk" + struct.pack(">I", len(events)) + events)
+
+
+async def bench_midi(options) -> Results:
+    results: Results = {}
+    counts = QUICK_MIDI_NOTE_COUNTS if options.quick else MIDI_NOTE_COUNTS
+    iterations = 3
+    with tempfile.TemporaryDirectory() as directory:
+        with FakeLive(
+            tracks=len(counts), slots=iterations, tick_interval=options.tick
+        ) as live:
+            with server_against(live):
+                for track, count in enumerate(counts):
+                    path = os.path.join(directory, f"{count}.mid")
+                    write_test_midi(path, count)
+                    result = await time_calls(
+                        lambda i: call_tool(
+                            "import_midi_file",
+                            {"path": path, "track_index": track, "clip_index": i},
+                        ),
+                        iterations,
+                    )
+                    result["notes_per_s"] = round(count / (result["p50_ms"] / 1000))
+                    results[f"midi/import_midi_file/{count}"] = result
+                    out = os.path.join(directory, f"{count}-out.mid")
+                    result = await time_calls(
+                        lambda i: call_tool(
+                            "export_clip_midi",
+                            {"track_index": track, "clip_index": i, "path": out},
+                        ),
+                        iterations,
+                    )
+                    result["notes_per_s"] = round(count / (result["p50_ms"] / 1000))
+                    results[f"midi/export_clip_midi/{count}"] = result
+    return results
+
+
+async def bench_launch(options) -> Results:
+    """How far apart four clips meant to start together actually start"""
+    results: Results = {}
+    rounds = 3 if options.quick else 10
+    tracks = 4
+    with FakeLive(tracks=tracks, tick_interval=options.tick) as live:
+        song = live.song
+        slots = [track.clip_slots[0] for track in song.tracks[:tracks]]
+        actions = [
+            {"action": "fire_clip", "track_index": track, "clip_index": 0}
+            for track in range(tracks)
+        ]
+        with server_against(live) as srv:
+            ableton = srv.get_ableton_connection()
+            for track in range(tracks):
+                await call_tool("create_clip", {"track_index": track, "clip_index": 0})
+            await call_tool("start_playback", {})
+            seconds_per_beat = 60.0 / song.tempo
+
+            async def launch(**position) -> float:
+                """Schedule the four clips and wait for them; returns the target beat"""
+                result = await asyncio.to_thread(
+                    ableton.send_command,
+                    "schedule_launch",
+                    {"actions": actions, **position},
+                )
+                wait = (result["beat"] - song.current_song_time) * seconds_per_beat
+                await asyncio.sleep(max(0.0, wait) + 2 * options.tick + 0.05)
+                return result["beat"]
+
+            def spread() -> float:
+                beats = [slot.launch_beat for slot in slots]
+                return (max(beats) - min(beats)) * seconds_per_beat
+
+            def error(target: float) -> float:
+                worst = max(abs(slot.launch_beat - target) for slot in slots)
+                return worst * seconds_per_beat
+
+            # Without launch quantization, as an agent would fire them
+            song.clip_trigger_quantization = 0
+            sequential, scheduled, unquantized = [], [], []
+            for _ in range(rounds):
+                for action in actions:
+                    await call_tool("fire_clip", action)
+                sequential.append(spread())
+                target = await launch(beat=song.current_song_time + 1.0)
+                scheduled.append(spread())
+                unquantized.append(error(target))
+            results["launch/fire_clip/spread"] = percentiles(sequential)
+            results["launch/schedule_launch/spread"] = percentiles(scheduled)
+            results["launch/schedule_launch/error"] = percentiles(unquantized)
+
+            # With bar quantization: the next bar, exactly
+            song.clip_trigger_quantization = 4
+            quantized = []
+            for _ in range(rounds):
+                quantized.append(error(await launch()))
+            results["launch/schedule_launch/error_quantized"] = percentiles(quantized)
+    return results
+
+
+GROUPS = {
+    "roundtrip": bench_roundtrip,
+    "notes": bench_notes,
+    "browser": bench_browser,
+    "session": bench_session,
+    "concurrency": bench_concurrency,
+    "instances": bench_instances,
+    "arrangement": bench_arrangement,
+    "midi": bench_midi,
+    "launch": bench_launch,
+}
+
+
+async def run(options) -> dict[str, Any]:
+    results: Results = {}
+    for group in options.groups:
+        started = time.perf_counter()
+        results.update(await GROUPS[group](options))
+        print(
+            f"{group}: done in {time.perf_counter() - started:.1f}s", file=sys.stderr
+        )
+    return {
+        "benchmark": "suite",
+        "environment": environment(),
+        "options": {
+            "groups": options.groups,
+            "quick": options.quick,
+            "iterations": options.iterations,
+            "tick_interval": options.tick,
+        },
+        "results": results,
+    }
+
+
+# Regression comparison
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float,
+    min_delta_ms: float = 0.05,
+) -> tuple[list[str], list[str]]:
+    """
+    Table lines and regressed keys for results present in both runs.
+
+    Throughput results compare throughput; everything else compares p50
+    latency, ignoring changes smaller than min_delta_ms.
+    """
+    lines = [f"{'result':<55} {'baseline':>12} {'current':>12} {'change':>8}"]
+    regressions = []
+    old_results = baseline.get("results", {})
+    for key, new in current.get("results", {}).items():
+        old = old_results.get(key)
+        if not old:
+            continue
+        if "throughput_per_s" in new and "throughput_per_s" in old:
+            before, after = old["throughput_per_s"], new["throughput_per_s"]
+            change = before / after - 1 if after else float("inf")
+            unit = "/s"
+            noise = False
+        elif "p50_ms" in new and "p50_ms" in old:
+            before, after = old["p50_ms"], new["p50_ms"]
+            change = after / before - 1 if before else 0.0
+            unit = "ms"
+            noise = abs(after - before) < min_delta_ms
+        else:
+            continue
+        flag = ""
+        if change > threshold and not noise:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        elif change < -threshold and not noise:
+            flag = "  improved"
+        lines.append(
+            f"{key:<55} {before:>10.3f}{unit:<2} {after:>10.3f}{unit:<2} "
+            f"{change:>+7.1%}{flag}"
+        )
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--groups",
+        nargs="+",
+        choices=list(GROUPS),
+        default=list(GROUPS),
+        help="Benchmark groups to run (default: all)",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Smaller sizes, for a fast smoke run"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=50, help="Samples per read benchmark"
+    )
+    parser.add_argument(
+        "--tick",
+        type=float,
+        default=0.005,
+        help="Fake Live main-thread tick interval in seconds",
+    )
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    parser.add_argument("--compare", help="Baseline JSON result to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Relative slowdown that counts as a regression (default 0.15)",
+    )
+    options = parser.parse_args()
+
+    quiet_logging()
+    result = asyncio.run(run(options))
+    text = json.dumps(result, indent=2)
+    if options.output:
+        with open(options.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)
+        lines, regressions = compare(baseline, result, options.threshold)
+        print("\n".join(lines), file=sys.stderr)
+        if regressions:
+            print(f"{len(regressions)} regression(s)", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import math
+
+import pytest
+
+from MCP_Server.automation import (
+    check_points,
+    decimate,
+    default_tolerance,
+    max_error,
+    sample_points,
+)
+
+
+def test_sample_points_spaces_values_by_step():
+    assert sample_points([0.0, 0.5, 1.0], start=4.0, step=0.25) == [
+        (4.0, 0.0),
+        (4.25, 0.5),
+        (4.5, 1.0),
+    ]
+
+
+def test_sample_points_rejects_non_positive_step():
+    with pytest.raises(ValueError):
+        sample_points([0.0, 1.0], start=0.0, step=0.0)
+
+
+def test_check_points_rejects_times_that_do_not_increase():
+    assert check_points([[0, 1], [1, 0]]) == [(0.0, 1.0), (1.0, 0.0)]
+    with pytest.raises(ValueError, match="must increase"):
+        check_points([[0, 1], [1, 0], [1, 0.5]])
+
+
+def test_decimate_keeps_short_curves_whole():
+    assert decimate([], 0.1) == []
+    assert decimate([(0.0, 0.0), (1.0, 1.0)], 0.1) == [(0.0, 0.0), (1.0, 1.0)]
+
+
+def test_decimate_reduces_a_line_to_its_ends():
+    points = sample_points([i / 100 for i in range(101)], start=0.0, step=0.25)
+    assert decimate(points, 1e-9) == [points[0], points[-1]]
+
+
+def test_decimate_keeps_corners():
+    points = sample_points([0, 1, 2, 3, 2, 1, 0, 0, 0], start=0.0, step=1.0)
+    assert decimate(points, 1e-9) == [(0.0, 0.0), (3.0, 3.0), (6.0, 0.0), (8.0, 0.0)]
+
+
+def test_decimate_stays_within_tolerance():
+    values = [0.5 + 0.4 * math.sin(i * math.pi / 512) for i in range(4096)]
+    points = sample_points(values, start=0.0, step=1 / 64)
+    tolerance = default_tolerance(points)
+    breakpoints = decimate(points, tolerance)
+    assert breakpoints[0] == points[0] and breakpoints[-1] == points[-1]
+    assert len(breakpoints) < len(points) // 4
+    assert max_error(points, breakpoints) <= tolerance
+
+
+def test_max_error_measures_vertical_distance():
+    points = [(0.0, 0.0), (1.0, 0.7), (2.0, 0.0)]
+    assert max_error(points, [(0.0, 0.0), (2.0, 0.0)]) == pytest.approx(0.7)
+    assert max_error(points, points) == 0.0
+
+
+def test_default_tolerance_scales_with_range():
+    assert default_tolerance([(0.0, 2.0), (1.0, 4.0)]) == pytest.approx(0.002)
+    assert default_tolerance([(0.0, 1.0), (1.0, 1.0)]) == 0.0
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from MCP_Server.formatting import format_result
+
+SCENES = {
+    "count": 2,
+    "scenes": [{"index": 0, "name": "Intro"}, {"index": 1, "name": "Drop"}],
+}
+
+
+def test_json_is_compact_and_pretty_is_indented():
+    assert format_result(SCENES) == json.dumps(SCENES, separators=(",", ":"))
+    assert json.loads(format_result(SCENES, "pretty")) == SCENES
+    assert "\n  " in format_result(SCENES, "pretty")
+
+
+def test_table_writes_scalars_then_one_table_per_list():
+    assert format_result(SCENES, "table") == (
+        "count\t2\n[scenes] 2 rows\nindex\tname\n0\tIntro\n1\tDrop\n"
+    )
+
+
+def test_table_renders_columns_as_rows():
+    mixer = {
+        "tracks": {
+            "index": [0, 1],
+            "name": ["Drums", "Bass"],
+            "mute": [False, True],
+            "sends": [[0.1, 0.2], [0.3, None]],
+        },
+        "master": {"volume": 0.85},
+    }
+    assert format_result(mixer, "table") == (
+        "master.volume\t0.85\n"
+        "[tracks] 2 rows\n"
+        "index\tname\tmute\tsends.0\tsends.1\n"
+        "0\tDrums\tfalse\t0.1\t0.3\n"
+        "1\tBass\ttrue\t0.2\t\n"
+    )
+
+
+def test_table_leaves_uneven_lists_as_values():
+    assert format_result({"a": [1, 2], "b": [3]}, "table") == "a\t[1,2]\nb\t[3]\n"
+
+
+def test_summary_stops_at_the_budget():
+    rows = {"clips": [{"index": i, "name": f"Clip {i}"} for i in range(100)]}
+    text = format_result(rows, "summary", max_chars=80)
+    assert text.endswith("[output truncated to 80 chars]\n")
+    assert "more rows truncated" in text
+    assert len(text) < 200
+
+
+def test_unknown_format_is_an_error():
+    with pytest.raises(ValueError, match="Unknown output format"):
+        format_result(SCENES, "xml")
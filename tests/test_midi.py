@@ -0,0 +1,64 @@
+import pytest
+
+from MCP_Server.midi import (
+    MidiFileError,
+    iter_note_chunks,
+    scan_midi_file,
+    write_midi_file,
+)
+from MCP_Server.protocol import unpack_notes
+
+NOTES = [
+    # pitch, start, duration, velocity, mute
+    (36, 0.0, 0.5, 100, False),
+    (40, 0.0, 1.0, 90, False),
+    (43, 0.0, 1.0, 80, False),
+    (38, 1.0, 0.25, 110, False),
+    (42, 1.5, 0.125, 64, True),
+    (36, 2.0, 2.0, 127, False),
+]
+
+
+def read_back(path, chunk_size=2):
+    midi = scan_midi_file(path)
+    (track,) = midi.note_tracks
+    notes = []
+    for count, packed in iter_note_chunks(midi, track, chunk_size):
+        chunk = unpack_notes(packed)
+        assert len(chunk) == count <= chunk_size
+        notes.extend(chunk)
+    return midi, track, notes
+
+
+def test_round_trip_keeps_unmuted_notes(tmp_path):
+    path = str(tmp_path / "clip.mid")
+    written = write_midi_file(path, NOTES, tempo=96.0, name="Beat")
+    assert written == 5
+
+    midi, track, notes = read_back(path)
+    assert midi.format == 0
+    assert midi.tempo == pytest.approx(96.0, abs=0.01)
+    assert track.name == "Beat"
+    assert track.note_count == 5
+    assert track.end_beat == 4.0
+    assert sorted(notes) == sorted(note for note in NOTES if not note[4])
+
+
+def test_round_trip_repeats_a_pitch_back_to_back(tmp_path):
+    path = str(tmp_path / "repeat.mid")
+    notes = [(60, beat * 0.5, 0.5, 100, False) for beat in range(8)]
+    write_midi_file(path, notes)
+    _, track, read = read_back(path, chunk_size=3)
+    assert track.note_count == 8
+    assert sorted(read) == notes
+
+
+def test_scan_rejects_files_that_are_not_midi(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"RIFF" + bytes(40))
+    with pytest.raises(MidiFileError):
+        scan_midi_file(str(path))
+    short = tmp_path / "short.mid"
+    short.write_bytes(b"MThd")
+    with pytest.raises(MidiFileError, match="too short"):
+        scan_midi_file(str(short))
@@ -0,0 +1,59 @@
+import pytest
+
+from MCP_Server.protocol import (
+    FLAG_ZLIB,
+    FRAME_HEADER,
+    decode_payload,
+    encode_frame,
+    notes_digest,
+    notes_param,
+    pack_notes,
+    unpack_notes,
+)
+
+
+def test_frames_round_trip_with_compression():
+    message = {"type": "get_clip_notes", "params": {"names": ["x" * 100] * 100}}
+    frame = encode_frame(message, compress_threshold=1024)
+    length, flags = FRAME_HEADER.unpack_from(frame)
+    assert flags & FLAG_ZLIB
+    assert length == len(frame) - FRAME_HEADER.size
+    assert decode_payload(frame[FRAME_HEADER.size :], flags) == message
+
+
+def test_packed_notes_round_trip_in_both_forms():
+    notes = [
+        {"pitch": 60, "start_time": 0.5, "duration": 0.25, "velocity": 99.9},
+        {"pitch": 127, "start_time": 1.0, "duration": 1.0, "velocity": 0, "mute": True},
+        {},
+    ]
+    expected = [
+        (60, 0.5, 0.25, 100, False),
+        (127, 1.0, 1.0, 0, True),
+        (60, 0.0, 0.25, 100, False),
+    ]
+    assert unpack_notes(pack_notes(notes)) == expected
+    assert unpack_notes(notes_param(notes, "json")) == expected
+
+
+@pytest.mark.parametrize(
+    "note, message",
+    [
+        ({"pitch": 128}, "Note 1: pitch 128 is outside 0-127"),
+        ({"pitch": -1}, "Note 1: pitch -1 is outside 0-127"),
+        ({"velocity": 127.6}, "Note 1: velocity 128 is outside 0-127"),
+    ],
+)
+def test_pack_notes_rejects_out_of_range_values(note, message):
+    with pytest.raises(ValueError, match=message):
+        pack_notes([{}, note])
+
+
+def test_notes_digest_ignores_order_and_form():
+    notes = [(60, 0.0, 0.25, 100, False), (64, 1.0, 0.5, 80, True)]
+    as_dicts = [
+        {"pitch": 64, "start_time": 1.0, "duration": 0.5, "velocity": 80, "mute": True},
+        {"pitch": 60, "start_time": 0.0, "duration": 0.25, "velocity": 100},
+    ]
+    assert notes_digest(as_dicts) == notes_digest(notes)
+    assert notes_digest(notes[:1]) != notes_digest(notes)
@@ -0,0 +1,133 @@
+import pytest
+
+from MCP_Server.protocol import notes_digest, unpack_notes
+from MCP_Server.spec import devices_to_resolve, plan_operations, summarize_operations
+
+NOTES = [
+    {"pitch": 36, "start_time": 0.0, "duration": 0.25, "velocity": 100},
+    {"pitch": 38, "start_time": 1.0, "duration": 0.25, "velocity": 90},
+]
+
+
+def snapshot(tracks=(), tempo=120.0, resolved=None):
+    return {"tempo": tempo, "tracks": list(tracks), "resolved": resolved or {}}
+
+
+def track(index, name, clips=(), devices=()):
+    return {
+        "index": index,
+        "name": name,
+        "is_midi_track": True,
+        "slot_count": 8,
+        "devices": list(devices),
+        "clips": list(clips),
+    }
+
+
+def clip(slot, name="", length=4.0, notes=NOTES):
+    return {
+        "slot": slot,
+        "name": name,
+        "length": length,
+        "note_count": len(notes),
+        "notes_digest": notes_digest(notes),
+    }
+
+
+def test_matching_session_plans_nothing():
+    spec = {
+        "tempo": 120,
+        "tracks": [
+            {"name": "Drums", "clips": [{"slot": 0, "name": "Beat", "notes": NOTES}]}
+        ],
+    }
+    current = snapshot([track(0, "Drums", [clip(0, "Beat")])])
+    assert plan_operations(spec, current) == []
+
+
+def test_missing_track_is_created_with_its_clips():
+    spec = {
+        "tempo": 96,
+        "tracks": [
+            {"name": "Bass", "clips": [{"slot": 1, "length": 8, "notes": NOTES}]}
+        ],
+    }
+    operations = plan_operations(spec, snapshot([track(0, "Drums")]))
+    assert [operation["op"] for operation in operations] == [
+        "set_tempo",
+        "create_midi_track",
+        "set_track_name",
+        "create_clip",
+        "replace_notes",
+    ]
+    assert operations[3] == {
+        "op": "create_clip",
+        "track_index": 1,
+        "clip_index": 1,
+        "length": 8.0,
+    }
+    packed = operations[4]["notes_packed"]
+    assert [note[0] for note in unpack_notes(packed)] == [36, 38]
+
+
+def test_length_change_resizes_the_clip_in_place():
+    # Deleting and recreating it would lose the name and notes the spec
+    # leaves out
+    spec = {"tracks": [{"index": 0, "clips": [{"slot": 0, "length": 8}]}]}
+    current = snapshot([track(0, "Drums", [clip(0, "Beat")])])
+    assert plan_operations(spec, current) == [
+        {"op": "resize_clip", "track_index": 0, "clip_index": 0, "length": 8.0}
+    ]
+
+
+def test_only_changed_notes_are_replaced():
+    current = snapshot([track(0, "Drums", [clip(0, "Beat")])])
+    same = [dict(note) for note in reversed(NOTES)]
+    spec = {"tracks": [{"name": "Drums", "clips": [{"slot": 0, "notes": same}]}]}
+    assert plan_operations(spec, current) == []
+
+    changed = NOTES + [{"pitch": 42, "start_time": 2.0}]
+    spec = {"tracks": [{"name": "Drums", "clips": [{"slot": 0, "notes": changed}]}]}
+    assert summarize_operations(plan_operations(spec, current)) == {
+        "replace_notes": 1
+    }
+
+
+def test_fractional_velocities_match_the_notes_live_stored():
+    stored = [(36, 0.0, 0.25, 100, False)]
+    current = snapshot([track(0, "Drums", [clip(0, notes=stored)])])
+    notes = [{"pitch": 36, "start_time": 0.0, "duration": 0.25, "velocity": 99.9}]
+    spec = {"tracks": [{"name": "Drums", "clips": [{"slot": 0, "notes": notes}]}]}
+    assert plan_operations(spec, current) == []
+
+
+def test_tracks_match_by_index_before_name():
+    current = snapshot([track(0, "Drums"), track(1, "Bass")])
+    spec = {"tracks": [{"index": 1, "name": "Drums"}, {"name": "Drums"}]}
+    assert plan_operations(spec, current) == [
+        {"op": "set_track_name", "track_index": 1, "name": "Drums"}
+    ]
+    with pytest.raises(ValueError, match="out of range"):
+        plan_operations({"tracks": [{"index": 2}]}, current)
+
+
+def test_devices_are_loaded_only_when_missing():
+    items = ["drums/Drum Rack", "query:Synths#Operator"]
+    twice = {"tracks": [{"devices": items}, {"devices": items}]}
+    assert devices_to_resolve(twice) == items
+    resolved = {"drums/Drum Rack": "Drum Rack", "query:Synths#Operator": "Operator"}
+    spec = {"tracks": [{"name": "Keys", "devices": items}]}
+
+    loaded = snapshot(
+        [track(0, "Keys", devices=["Drum Rack", "Operator"])], resolved=resolved
+    )
+    assert plan_operations(spec, loaded) == []
+
+    partial = snapshot([track(0, "Keys", devices=["Drum Rack"])], resolved=resolved)
+    assert plan_operations(spec, partial) == [
+        {
+            "op": "ensure_devices",
+            "track_index": 0,
+            "items": [{"path": "drums/Drum Rack"}, {"uri": "query:Synths#Operator"}],
+        }
+    ]